@@ -0,0 +1,293 @@
+"""
+Benchmark suite of the simulation pipeline.
+
+Generates structured and distorted grids of growing size, times every phase of the pipeline
+(grid loading, volume and surface element kernels, global assembly, factorization, first solve
+and steady per-step cost), records the peak memory of each phase and writes the results as JSON.
+With --baseline the results are compared against a stored file of the same FORMAT_VERSION
+and the run fails when a phase is slower (or uses more memory) than the baseline by more than the threshold.
+
+    python -m benchmarks.benchmark --max-nodes 10000 --output bench.json
+    python -m benchmarks.benchmark --baseline benchmarks/baseline.json --threshold 0.25
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+from datetime import datetime, timezone
+from tabulate import tabulate
+from typing import Callable, Dict, List, Optional, Tuple
+from mes.classes.Global import Global
+from mes.classes.CzytnikSiatki import read_mesh
+from mes.classes.SiatkaBinarna import write_binary_mesh, load_mesh
+from mes.classes.SiatkaTablicowa import ArrayMesh
+from mes.classes.GeneratorSiatki import generate_mesh, write_text_mesh
+from mes.macierz.MacierzH import MatrixH
+from mes.macierz.MacierzC import MacierzC
+from mes.macierz.WektorP import MacierzHBC, WektorP
+from mes.macierz.MacierzeLokalne import element_local_matrices
+from mes.macierz.ElementyWsadowe import batch_matrix_h, batch_matrix_c, batch_surface
+from mes.macierz.MacierzRzadka import MacierzRzadka
+from mes.symulacja.Symulacja import Simulation
+from mes.symulacja.KrokCzasowy import TimeStepper
+
+SIZES: Tuple[int, ...] = (100, 1_000, 10_000, 100_000, 1_000_000)  # Approximate numbers of nodes
+GRIDS: Dict[str, float] = {"structured": 0.0, "distorted": 0.4}     # Grid kind -> distortion
+# Version of the phase names and their meaning - files of another version are not compared
+# (2: batch_kernels times only the volume kernels, the surface kernel is the batch_surface phase)
+FORMAT_VERSION: int = 2
+
+
+def _measure(function: Callable, repeat: int = 1):
+    """Runs the function repeat times and returns the shortest time and the last result."""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def _kernel_cost(mesh: ArrayMesh, global_data: Global, no_int_nodes: int, sample: int) -> Dict[str, float]:
+    """
+    Times the per-element kernel classes on a sample of elements
+    (kernel_element builds all four of one element with a shared geometry).
+
+    Returns:
+        dict[str, float]: Mean time of one element [s] for each kernel
+    """
+    elements = [mesh.element(index) for index in range(min(sample, mesh.elements_number))]
+    g = global_data
+    kernels = {
+        "kernel_matrix_h": lambda element: MatrixH(element, no_int_nodes, g.conductivity),
+        "kernel_matrix_hbc": lambda element: MacierzHBC(element, no_int_nodes, g.alfa),
+        "kernel_vector_p": lambda element: WektorP(element, no_int_nodes, g.alfa, g.tot),
+        "kernel_matrix_c": lambda element: MacierzC(g.specificHeat, g.density, element),
+        "kernel_element": lambda element: element_local_matrices(element, no_int_nodes, g),
+    }
+    costs = {}
+    for name, kernel in kernels.items():
+        seconds, _ = _measure(lambda: [kernel(element) for element in elements])
+        costs[name] = seconds / len(elements)
+    return costs
+
+
+def run_case(kind: str, nodes: int, workdir: str, no_int_nodes: int = 2, steps: int = 10,
+             kernel_sample: int = 500, max_solve_nodes: int = 100_000, memory: bool = True,
+             workers: int = 1, solver: str = "skyline") -> Dict:
+    """
+    Benchmarks the whole pipeline on one generated grid.
+
+    Args:
+        kind (str): Grid kind (key of GRIDS)
+        nodes (int): Approximate number of nodes (a square grid is generated)
+        workdir (str): Directory for the generated input files
+        no_int_nodes (int): Number of integration nodes in each direction
+        steps (int): Number of time steps used for the steady per-step cost
+        kernel_sample (int): Number of elements on which the per-element kernels are timed
+        max_solve_nodes (int): Larger grids skip the factorization and the time steps
+        memory (bool): If True, the peak memory of every phase is measured in a second pass
+        workers (int): Processes computing the local matrices
+        solver (str): Solver backend of the system (skyline - the backend of the stored baseline)
+
+    Returns:
+        dict: Size of the grid, times of the phases [s] and peak memory of the phases [B]
+    """
+    side = max(2, int(round(np.sqrt(nodes))))
+    generated = generate_mesh(side, side, distortion=GRIDS[kind], seed=side)
+    text_path = os.path.join(workdir, f"{kind}_{side}.txt")
+    binary_path = os.path.join(workdir, f"{kind}_{side}.mesh")
+    write_text_mesh(text_path, generated)
+    write_binary_mesh(binary_path, generated)
+    repeat = 3 if side * side <= 10_000 else 1
+    solve = side * side <= max_solve_nodes
+
+    def pipeline(timed: Callable[[str, Callable], object]) -> None:
+        timed("mesh_load_text", lambda: read_mesh(text_path, use_cache=False))
+        mesh_data = timed("mesh_load_binary", lambda: load_mesh(binary_path))
+        mesh = timed("array_mesh", lambda: ArrayMesh.from_mesh_data(mesh_data))
+        with Simulation(mesh, Global.from_parameters(mesh_data.parameters), no_int_nodes,
+                        factorization=solver, workers=workers) as simulation:
+            g = simulation.global_data
+
+            coords = mesh.element_coordinates()
+            edges = mesh.boundary_edges()
+            timed("batch_kernels", lambda: (batch_matrix_h(coords, g.conductivity, no_int_nodes),
+                                            batch_matrix_c(coords, g.specificHeat, g.density, no_int_nodes)))
+            timed("batch_surface", lambda: batch_surface(coords, edges.elements, edges.walls, g.alfa, g.tot,
+                                                         no_int_nodes))
+            h_local, c_local, p_local = timed("local_matrices", simulation.local_matrices)
+
+            element_IDs = mesh.global_element_IDs
+            n = mesh.nodes_number
+            h_global, c_global, p_global = timed("global_assembly", lambda: (
+                MacierzRzadka.from_element_matrices(element_IDs, h_local, n),
+                MacierzRzadka.from_element_matrices(element_IDs, c_local, n),
+                np.bincount(mesh.element_indices().ravel(), weights=p_local.ravel(), minlength=n)))
+            if not solve:
+                return
+
+            c_dtau = c_global.copy()
+            c_dtau.scale(1 / g.simStepTime)
+            stepper = timed("factorization", lambda: TimeStepper(c_dtau, h_global, p_global, simulation.factorization))
+            t0 = np.full(n, float(g.initialTemp))
+            t1 = timed("first_solve", lambda: stepper.step(t0))
+
+            def steady_steps() -> np.ndarray:
+                solution = t1
+                for _ in range(steps):
+                    solution = stepper.step(solution)
+                return solution
+            timed("time_steps", steady_steps)
+
+    times: Dict[str, float] = {}
+
+    def timed_phase(name: str, function: Callable):
+        seconds, result = _measure(function, 1 if name == "time_steps" else repeat)
+        times[name] = seconds
+        return result
+
+    pipeline(timed_phase)
+    if "time_steps" in times:
+        times["per_step"] = times.pop("time_steps") / steps
+
+    mesh = ArrayMesh.from_mesh_data(load_mesh(binary_path))
+    times.update(_kernel_cost(mesh, Global.from_parameters(generated.parameters), no_int_nodes, kernel_sample))
+
+    peak_memory: Dict[str, int] = {}
+    if memory:
+        def traced_phase(name: str, function: Callable):
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            result = function()
+            peak_memory[name] = tracemalloc.get_traced_memory()[1] - before
+            return result
+
+        tracemalloc.start()
+        try:
+            pipeline(traced_phase)
+        finally:
+            tracemalloc.stop()
+        peak_memory.pop("time_steps", None)
+
+    return {"grid": kind, "nodes": side * side, "elements": (side - 1) ** 2,
+            "times": times, "peak_memory": peak_memory}
+
+
+def run_suite(sizes: List[int], kinds: List[str], **kwargs) -> Dict:
+    """
+    Runs run_case for every grid kind and size.
+
+    Returns:
+        dict: Description of the machine and the results of all cases (keyed by "<kind>_<nodes>")
+    """
+    cases = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for kind in kinds:
+            for nodes in sizes:
+                case = run_case(kind, nodes, workdir, **kwargs)
+                cases[f"{kind}_{case['nodes']}"] = case
+                print(f"{kind:>10} {case['nodes']:>9} nodes: " +
+                      ", ".join(f"{name} {seconds:.3g} s" for name, seconds in case["times"].items()),
+                      file=sys.stderr)
+    return {
+        "version": FORMAT_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "machine": {"python": platform.python_version(), "numpy": np.__version__,
+                    "platform": platform.platform(), "cpus": os.cpu_count()},
+        "cases": cases,
+    }
+
+
+def compare(results: Dict, baseline: Dict, threshold: float = 0.25, min_seconds: float = 5e-3,
+            min_bytes: int = 1 << 16) -> Tuple[List[List], List[str]]:
+    """
+    Compares the results with a baseline case by case and phase by phase.
+
+    Args:
+        results (dict): Output of run_suite
+        baseline (dict): Stored output of run_suite
+        threshold (float): Allowed relative increase (0.25 - 25% slower or larger)
+        min_seconds (float): Phases shorter than this in both runs are not compared (timer noise)
+        min_bytes (int): Phases allocating less than this in both runs are not compared
+
+    Returns:
+        tuple: Rows of the comparison table and descriptions of the regressions
+
+    Raises:
+        ValueError: When the files have different format versions (the phases are not comparable)
+    """
+    if baseline.get("version") != results.get("version"):
+        raise ValueError(f"Baseline format version {baseline.get('version')} differs from "
+                         f"{results.get('version')} - record the baseline again")
+    rows = []
+    regressions = []
+    for case_name, case in results["cases"].items():
+        base_case = baseline.get("cases", {}).get(case_name)
+        if base_case is None:
+            continue
+        for metric in ("times", "peak_memory"):
+            for phase, value in case[metric].items():
+                base_value = base_case.get(metric, {}).get(phase)
+                if not base_value:
+                    continue
+                ratio = value / base_value
+                noise = max(value, base_value) < (min_seconds if metric == "times" else min_bytes)
+                regressed = ratio > 1.0 + threshold and not noise
+                rows.append([case_name, phase, base_value, value, f"{ratio:.2f}", "REGRESSION" if regressed else ""])
+                if regressed:
+                    regressions.append(f"{case_name} {phase}: {base_value:.4g} -> {value:.4g} ({ratio:.2f}x)")
+    return rows, regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark of the MES simulation pipeline")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES), help="Approximate numbers of nodes")
+    parser.add_argument("--max-nodes", type=int, default=100_000, help="Skip sizes above this number of nodes")
+    parser.add_argument("--grids", nargs="+", choices=sorted(GRIDS), default=sorted(GRIDS))
+    parser.add_argument("--integration-nodes", type=int, default=2, choices=(2, 3, 4))
+    parser.add_argument("--steps", type=int, default=10, help="Time steps of the per-step measurement")
+    parser.add_argument("--kernel-sample", type=int, default=500, help="Elements timed with the kernel classes")
+    parser.add_argument("--max-solve-nodes", type=int, default=100_000,
+                        help="Larger grids skip the factorization and the time steps")
+    parser.add_argument("--workers", type=int, default=1, help="Processes computing the local matrices")
+    parser.add_argument("--solver", default="skyline", help="Solver backend of the system (or auto)")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the peak memory pass")
+    parser.add_argument("--output", help="Path of the JSON results (stdout by default)")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed relative regression")
+    parser.add_argument("--min-seconds", type=float, default=5e-3, help="Shorter phases are not compared")
+    args = parser.parse_args(argv)
+
+    sizes = [size for size in args.sizes if size <= args.max_nodes]
+    results = run_suite(sizes, args.grids, no_int_nodes=args.integration_nodes, steps=args.steps,
+                        kernel_sample=args.kernel_sample, max_solve_nodes=args.max_solve_nodes,
+                        memory=not args.no_memory, workers=args.workers, solver=args.solver)
+
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(text + "\n")
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        rows, regressions = compare(results, baseline, args.threshold, args.min_seconds)
+        print(tabulate(rows, headers=["Case", "Phase", "Baseline", "Current", "Ratio", ""], tablefmt="grid"),
+              file=sys.stderr)
+        if regressions:
+            print("Regressions:\n  " + "\n  ".join(regressions), file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
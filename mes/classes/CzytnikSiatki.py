@@ -0,0 +1,171 @@
+import hashlib
+import os
+import tempfile
+import zipfile
+import numpy as np
+from typing import Dict, NamedTuple, Optional
+
+CACHE_SUFFIX: str = ".npz"  # Sidecar with the parsed arrays is stored next to the input file
+
+
+class MeshData(NamedTuple):
+    """
+    Parsed content of an input file: simulation parameters and the grid as NumPy arrays.
+    """
+    parameters: Dict[str, str]   # Simulation parameters (e.g. "SimulationTime" -> "500")
+    node_ids: np.ndarray         # (n,) int32 identifiers of the nodes
+    coordinates: np.ndarray      # (n, 2) float64 coordinates x, y of the nodes
+    element_ids: np.ndarray      # (e,) int32 identifiers of the elements
+    connectivity: np.ndarray     # (e, 4) int32 node identifiers of each element
+    bc_mask: np.ndarray          # (n,) bool - True for nodes with a boundary condition
+
+
+def _parse_text(path: str) -> MeshData:
+    """
+    Reads the input file in a single pass. Lines of the *Node, *Element and *BC sections
+    are only collected and then converted to arrays in bulk.
+
+    Args:
+        path (str): Path to the input file
+
+    Returns:
+        MeshData: Parsed parameters and grid
+    """
+    parameters: Dict[str, str] = {}
+    sections: Dict[str, list] = {"node": [], "element": [], "bc": []}
+    section: Optional[str] = None
+
+    with open(path, "r") as file:
+        for line in file:
+            line = line.strip()
+            if not line:
+                continue
+
+            if line.startswith("*"):
+                if line.startswith("*Node"):
+                    section = "node"
+                elif line.startswith("*Element"):
+                    section = "element"
+                elif line.startswith("*BC"):
+                    section = "bc"
+                else:
+                    section = None
+                continue
+
+            if section is not None:
+                sections[section].append(line)
+                continue
+
+            # Simulation parameters - one or two words of the key followed by the value
+            parts = line.split()
+            if len(parts) < 3:
+                parameters[parts[0]] = parts[1] if len(parts) > 1 else ""
+            else:
+                parameters[parts[0] + " " + parts[1]] = parts[2]
+
+    def to_array(lines: list, dtype: type) -> np.ndarray:
+        return np.array(" ".join(lines).replace(",", " ").split(), dtype=dtype)
+
+    nodes = to_array(sections["node"], np.float64).reshape(-1, 3)
+    elements = to_array(sections["element"], np.int64).reshape(-1, 5)
+    bc_nodes = to_array(sections["bc"], np.int64)
+
+    node_ids = nodes[:, 0].astype(np.int32)
+    return MeshData(
+        parameters=parameters,
+        node_ids=node_ids,
+        coordinates=np.ascontiguousarray(nodes[:, 1:]),
+        element_ids=elements[:, 0].astype(np.int32),
+        connectivity=np.ascontiguousarray(elements[:, 1:], dtype=np.int32),
+        bc_mask=np.isin(node_ids, bc_nodes),
+    )
+
+
+def _file_hash(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _load_cache(cache_path: str, path: str) -> Optional[MeshData]:
+    """
+    Loads the sidecar if it describes the current content of the input file.
+    The modification time is checked first; only when it differs is the content hash compared,
+    and a sidecar whose hash still matches is rewritten with the new modification time
+    (so the file is not hashed again on every run after e.g. a touch or a checkout).
+    A missing, truncated or corrupt sidecar is treated as absent.
+    """
+    try:
+        with np.load(cache_path, allow_pickle=False) as cache:
+            source_hash = str(cache["source_hash"])
+            stale_mtime = int(cache["source_mtime"]) != os.stat(path).st_mtime_ns
+            if stale_mtime and source_hash != _file_hash(path):
+                return None
+            mesh = MeshData(
+                parameters=dict(zip(cache["parameter_keys"].tolist(), cache["parameter_values"].tolist())),
+                node_ids=cache["node_ids"],
+                coordinates=cache["coordinates"],
+                element_ids=cache["element_ids"],
+                connectivity=cache["connectivity"],
+                bc_mask=cache["bc_mask"],
+            )
+    except (OSError, KeyError, ValueError, EOFError, zipfile.BadZipFile):
+        return None
+
+    if stale_mtime:
+        _save_cache(cache_path, path, mesh, source_hash)
+    return mesh
+
+
+def _save_cache(cache_path: str, path: str, mesh: MeshData, source_hash: Optional[str] = None) -> None:
+    """
+    Writes the sidecar to a temporary file in the same directory and moves it over cache_path,
+    so a crash or a concurrent run never leaves a half-written sidecar behind.
+    """
+    temp_path = None
+    try:
+        descriptor, temp_path = tempfile.mkstemp(dir=os.path.dirname(cache_path) or ".",
+                                                 prefix=os.path.basename(cache_path) + ".", suffix=".tmp")
+        with os.fdopen(descriptor, "wb") as file:
+            np.savez(file,
+                     source_hash=np.array(source_hash or _file_hash(path)),
+                     source_mtime=np.array(os.stat(path).st_mtime_ns),
+                     parameter_keys=np.array(list(mesh.parameters.keys()), dtype=str),
+                     parameter_values=np.array(list(mesh.parameters.values()), dtype=str),
+                     node_ids=mesh.node_ids,
+                     coordinates=mesh.coordinates,
+                     element_ids=mesh.element_ids,
+                     connectivity=mesh.connectivity,
+                     bc_mask=mesh.bc_mask)
+        os.replace(temp_path, cache_path)
+    except OSError:
+        # The sidecar is only an optimization - a read-only directory is not an error
+        if temp_path is not None and os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def read_mesh(path: str, use_cache: bool = True) -> MeshData:
+    """
+    Reads the simulation parameters and the grid from an input file.
+    With use_cache the parsed arrays are stored in a .npz sidecar next to the file,
+    so repeated runs on the same (unchanged) file skip the text parsing.
+
+    Args:
+        path (str): Path to the input file
+        use_cache (bool): If True, the sidecar is used and refreshed when stale
+
+    Returns:
+        MeshData: Parameters and grid of the simulation
+    """
+    cache_path = path + CACHE_SUFFIX
+    if use_cache and os.path.exists(cache_path):
+        mesh = _load_cache(cache_path, path)
+        if mesh is not None:
+            return mesh
+
+    mesh = _parse_text(path)
+    if use_cache:
+        _save_cache(cache_path, path, mesh)
+    return mesh
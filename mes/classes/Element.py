@@ -5,7 +5,10 @@ class Element:
     """
     Class representing an element in the finite element method (FEM).
     Stores the element ID and a list of connected nodes.
+    Uses __slots__, so an element does not carry a per-instance __dict__.
     """
+
+    __slots__ = ("id", "connected_nodes")
     
     def __init__(self, id: int):
         """
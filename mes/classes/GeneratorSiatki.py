@@ -0,0 +1,97 @@
+import numpy as np
+from typing import Dict, Optional
+from mes.classes.CzytnikSiatki import MeshData
+
+# Parameters of the Test1_4_4 / Test2_4_4_MixGrid input files
+DEFAULT_PARAMETERS: Dict[str, str] = {
+    "SimulationTime": "500",
+    "SimulationStepTime": "50",
+    "Conductivity": "25",
+    "Alfa": "300",
+    "Tot": "1200",
+    "InitialTemp": "100",
+    "Density": "7800",
+    "SpecificHeat": "700",
+}
+
+
+def generate_mesh(nodes_x: int, nodes_y: int, width: float = 0.1, height: float = 0.1,
+                  distortion: float = 0.0, seed: int = 0,
+                  parameters: Optional[Dict[str, str]] = None) -> MeshData:
+    """
+    Generates a rectangular grid of 4-node elements with the node numbering of the data/*.txt files.
+    With distortion > 0 the interior nodes are moved randomly (as in Test2_4_4_MixGrid),
+    so the elements become general quadrilaterals.
+
+    Args:
+        nodes_x (int): Number of nodes along x (at least 2)
+        nodes_y (int): Number of nodes along y (at least 2)
+        width (float): Width of the domain [m]
+        height (float): Height of the domain [m]
+        distortion (float): Largest shift of an interior node as a fraction of half the
+                            element size, in [0, 1) so that the elements stay convex
+        seed (int): Seed of the random shifts
+        parameters (dict[str, str], optional): Simulation parameters (DEFAULT_PARAMETERS by default)
+
+    Returns:
+        MeshData: Generated grid with the boundary condition on all outer nodes
+
+    Raises:
+        ValueError: When the grid is too small or the distortion is out of range
+    """
+    if nodes_x < 2 or nodes_y < 2:
+        raise ValueError("Grid needs at least 2 nodes in each direction")
+    if not 0.0 <= distortion < 1.0:
+        raise ValueError("Distortion must be in [0, 1)")
+
+    x = np.linspace(0.0, width, nodes_x)
+    y = np.linspace(0.0, height, nodes_y)
+    coordinates = np.stack(np.meshgrid(x, y), axis=-1).reshape(-1, 2)
+
+    on_boundary = np.zeros((nodes_y, nodes_x), dtype=bool)
+    on_boundary[[0, -1], :] = True
+    on_boundary[:, [0, -1]] = True
+    on_boundary = on_boundary.ravel()
+
+    if distortion > 0.0:
+        rng = np.random.default_rng(seed)
+        step = np.array([width / (nodes_x - 1), height / (nodes_y - 1)])
+        shift = rng.uniform(-1.0, 1.0, size=coordinates.shape) * 0.5 * distortion * step
+        coordinates[~on_boundary] += shift[~on_boundary]
+
+    # Counterclockwise connectivity: bottom-left, bottom-right, top-right, top-left
+    first = (np.arange(nodes_y - 1)[:, None] * nodes_x + np.arange(nodes_x - 1)[None, :]).ravel() + 1
+    connectivity = np.stack([first, first + 1, first + 1 + nodes_x, first + nodes_x], axis=1)
+
+    node_ids = np.arange(1, nodes_x * nodes_y + 1, dtype=np.int32)
+    element_ids = np.arange(1, len(connectivity) + 1, dtype=np.int32)
+    mesh_parameters = dict(DEFAULT_PARAMETERS if parameters is None else parameters)
+    mesh_parameters["Nodes number"] = str(len(node_ids))
+    mesh_parameters["Elements number"] = str(len(element_ids))
+
+    return MeshData(parameters=mesh_parameters, node_ids=node_ids, coordinates=coordinates,
+                    element_ids=element_ids, connectivity=connectivity.astype(np.int32), bc_mask=on_boundary)
+
+
+def write_text_mesh(path: str, mesh: MeshData) -> None:
+    """
+    Writes the grid in the text format of the input files (data/*.txt).
+
+    Args:
+        path (str): Path of the output file
+        mesh (MeshData): Grid and parameters to store
+    """
+    with open(path, "w") as file:
+        for key, value in mesh.parameters.items():
+            file.write(f"{key} {value}\n")
+
+        file.write("*Node\n")
+        nodes = np.column_stack([mesh.node_ids, mesh.coordinates])
+        np.savetxt(file, nodes, fmt=["%7d", "%.9g", "%.9g"], delimiter=", ")
+
+        file.write("*Element, type=DC2D4\n")
+        elements = np.column_stack([mesh.element_ids, mesh.connectivity])
+        np.savetxt(file, elements, fmt="%d", delimiter=", ")
+
+        file.write("*BC\n")
+        file.write(", ".join(map(str, mesh.node_ids[mesh.bc_mask].tolist())) + "\n")
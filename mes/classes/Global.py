@@ -1,3 +1,12 @@
+from typing import Dict, Union
+
+
+def _number(value: Union[str, float]) -> Union[int, float]:
+    """Parses a parameter as int when it is a whole number and as float otherwise."""
+    number = float(value)
+    return int(number) if number.is_integer() and "." not in str(value) else number
+
+
 class Global:
     """
     Class storing global parameters of the finite element method (FEM) simulation.
@@ -32,6 +41,31 @@ class Global:
         self.nodesNo: int = nodesNo
         self.elementsNo: int = elementsNo
 
+    @classmethod
+    def from_parameters(cls, data: Dict[str, str]) -> 'Global':
+        """
+        Creates the global parameters from the values read from an input file.
+
+        Args:
+            data (dict[str, str]): Parameters of the input file (e.g. "SimulationTime" -> "500")
+
+        Returns:
+            Global: Global parameters of the simulation (missing values are 0;
+                    whole numbers are kept as int, fractional ones such as a step of 0.5 s as float)
+        """
+        return cls(
+            simTime=_number(data.get('SimulationTime', 0)),
+            simStepTime=_number(data.get('SimulationStepTime', 0)),
+            conductivity=_number(data.get('Conductivity', 0)),
+            alfa=_number(data.get('Alfa', 0)),
+            tot=_number(data.get('Tot', 0)),
+            initialTemp=_number(data.get('InitialTemp', 0)),
+            density=_number(data.get('Density', 0)),
+            specificHeat=_number(data.get('SpecificHeat', 0)),
+            nodesNo=int(data.get('Nodes number', 0)),
+            elementsNo=int(data.get('Elements number', 0))
+        )
+
     def print_values(self) -> None:
         """
         Displays all simulation global parameters.
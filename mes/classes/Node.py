@@ -2,7 +2,10 @@ class Node:
     """
     Class representing a node in the finite element method (FEM).
     Stores information about the node's position and boundary conditions.
+    Uses __slots__, so a node does not carry a per-instance __dict__.
     """
+
+    __slots__ = ("node_id", "x", "y", "BC")
     
     def __init__(self, node_id: int, x: float, y: float, bc: int = 0):
         """
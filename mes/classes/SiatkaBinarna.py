@@ -0,0 +1,157 @@
+import struct
+import sys
+import numpy as np
+from typing import Dict, Optional, Tuple
+from mes.classes.CzytnikSiatki import MeshData, read_mesh
+
+MAGIC: bytes = b"MESBIN01"
+VERSION: int = 1
+ALIGNMENT: int = 64  # Every block starts at a multiple of 64 bytes
+
+# magic, version, flags, nodes, elements, length of parameters, offsets of the six blocks
+HEADER = struct.Struct("<8sIIQQQQQQQQQ")
+FLAG_CONTIGUOUS_IDS: int = 1  # Node IDs are exactly 1..n, so ID - 1 is the index of the node
+
+
+def _align(offset: int) -> int:
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def write_binary_mesh(path: str, mesh: MeshData) -> None:
+    """
+    Writes the grid and the simulation parameters to the binary container.
+
+    Layout: header, node IDs (int32), coordinates (float64, n x 2), element IDs (int32),
+    connectivity (int32, e x 4), boundary conditions (uint8), parameters (UTF-8 "key=value" lines).
+
+    Args:
+        path (str): Path of the output file
+        mesh (MeshData): Grid and parameters to store
+    """
+    n_nodes = len(mesh.node_ids)
+    n_elements = len(mesh.element_ids)
+    parameters = "".join(f"{key}={value}\n" for key, value in mesh.parameters.items()).encode("utf-8")
+    flags = FLAG_CONTIGUOUS_IDS if np.array_equal(mesh.node_ids, np.arange(1, n_nodes + 1)) else 0
+
+    blocks = [np.ascontiguousarray(mesh.node_ids, dtype="<i4"),
+              np.ascontiguousarray(mesh.coordinates, dtype="<f8"),
+              np.ascontiguousarray(mesh.element_ids, dtype="<i4"),
+              np.ascontiguousarray(mesh.connectivity, dtype="<i4"),
+              np.ascontiguousarray(mesh.bc_mask, dtype=np.uint8)]
+
+    offsets = []
+    offset = _align(HEADER.size)
+    for block in blocks:
+        offsets.append(offset)
+        offset = _align(offset + block.nbytes)
+    offsets.append(offset)
+
+    with open(path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, flags, n_nodes, n_elements, len(parameters), *offsets))
+        for block, block_offset in zip(blocks, offsets):
+            file.seek(block_offset)
+            file.write(block.tobytes())
+        file.seek(offsets[-1])
+        file.write(parameters)
+
+
+def convert_text_to_binary(text_path: str, binary_path: Optional[str] = None) -> str:
+    """
+    Converts an input file in the text format (data/*.txt) to the binary container.
+
+    Args:
+        text_path (str): Path to the text input file
+        binary_path (str, optional): Path of the output file (text_path with the .mesh extension by default)
+
+    Returns:
+        str: Path of the written binary file
+    """
+    if binary_path is None:
+        binary_path = text_path.rsplit(".", 1)[0] + ".mesh"
+    write_binary_mesh(binary_path, read_mesh(text_path, use_cache=False))
+    return binary_path
+
+
+class BinaryMesh:
+    """
+    Class giving access to a binary grid file through memory mapping.
+    The arrays are views of the file - nothing is read until it is used,
+    so element ranges can be streamed from disk without copying the whole grid.
+    The container only maps the blocks; indexing and chunking are done by ArrayMesh (see to_mesh_data).
+    """
+
+    def __init__(self, path: str):
+        """
+        Opens the binary file and maps its blocks.
+
+        Args:
+            path (str): Path to the binary grid file
+
+        Raises:
+            ValueError: When the file is not a binary grid file of a supported version
+        """
+        self.path: str = path
+        with open(path, "rb") as file:
+            header = file.read(HEADER.size)
+        if len(header) < HEADER.size:
+            raise ValueError(f"{path} is not a binary grid file")
+
+        (magic, version, flags, n_nodes, n_elements, params_length,
+         off_node_ids, off_coords, off_elem_ids, off_conn, off_bc, off_params) = HEADER.unpack(header)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a binary grid file")
+        if version != VERSION:
+            raise ValueError(f"Unsupported version of the binary grid file: {version}")
+
+        self.nodes_number: int = n_nodes
+        self.elements_number: int = n_elements
+        self.contiguous_ids: bool = bool(flags & FLAG_CONTIGUOUS_IDS)
+
+        def block(dtype: str, offset: int, shape: Tuple[int, ...]) -> np.ndarray:
+            if 0 in shape:
+                return np.zeros(shape, dtype=dtype)
+            return np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=shape)
+
+        self.node_ids: np.ndarray = block("<i4", off_node_ids, (n_nodes,))
+        self.coordinates: np.ndarray = block("<f8", off_coords, (n_nodes, 2))
+        self.element_ids: np.ndarray = block("<i4", off_elem_ids, (n_elements,))
+        self.connectivity: np.ndarray = block("<i4", off_conn, (n_elements, 4))
+        self.bc_mask: np.ndarray = block("u1", off_bc, (n_nodes,)).view(np.bool_)
+
+        with open(path, "rb") as file:
+            file.seek(off_params)
+            text = file.read(params_length).decode("utf-8")
+        self.parameters: Dict[str, str] = dict(line.split("=", 1) for line in text.splitlines() if line)
+
+    def to_mesh_data(self) -> MeshData:
+        """
+        Returns the grid as MeshData whose arrays are views of the mapped file (no copy).
+        """
+        return MeshData(parameters=dict(self.parameters), node_ids=self.node_ids, coordinates=self.coordinates,
+                        element_ids=self.element_ids, connectivity=self.connectivity, bc_mask=self.bc_mask)
+
+
+def load_mesh(path: str) -> MeshData:
+    """
+    Loads a grid from a binary container (memory mapped) or from the text format.
+
+    Args:
+        path (str): Path to the input file of either format
+
+    Returns:
+        MeshData: Parameters and grid of the simulation
+    """
+    with open(path, "rb") as file:
+        is_binary = file.read(len(MAGIC)) == MAGIC
+    if is_binary:
+        return BinaryMesh(path).to_mesh_data()
+    return read_mesh(path)
+
+
+if __name__ == "__main__":
+    # Converter: python -m mes.classes.SiatkaBinarna input.txt [output.mesh]
+    if len(sys.argv) not in (2, 3):
+        print("Usage: python -m mes.classes.SiatkaBinarna input.txt [output.mesh]")
+        sys.exit(1)
+    output = convert_text_to_binary(sys.argv[1], sys.argv[2] if len(sys.argv) == 3 else None)
+    print(f"Binary grid written to {output}")
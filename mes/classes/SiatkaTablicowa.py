@@ -0,0 +1,285 @@
+import numpy as np
+from typing import Iterator, List, NamedTuple, Optional, Sequence, Tuple
+from mes.classes.Node import Node
+from mes.classes.Element import Element
+from mes.classes.CzytnikSiatki import MeshData
+from mes.macierz.UniversalElement import EDGE_NODES
+
+
+class BoundaryEdges(NamedTuple):
+    """
+    Walls of the elements with the convective boundary condition - one entry per wall,
+    sorted by element.
+    """
+    elements: np.ndarray   # (m,) zero-based index of the element owning the wall
+    walls: np.ndarray      # (m,) local number of the wall (0 - bottom, 1 - right, 2 - top, 3 - left)
+
+
+class ArrayMesh:
+    """
+    Class representing the MES grid as a structure of arrays.
+    Nodes are rows of contiguous coordinate and boundary-condition arrays and elements are rows
+    of a connectivity array, so a node costs about 20 bytes instead of a Python object,
+    and vectorized kernels get contiguous inputs. NodeView and ElementView give the
+    object interface of Node and Element for the existing code.
+
+    When the node IDs are exactly 1..n (the usual case), the given arrays are kept as they are
+    (e.g. views of a memory-mapped binary grid) and the zero-based node indices of an element range
+    are derived on demand, so the grid can be streamed in ranges without copying it.
+    """
+
+    def __init__(self, node_ids: Sequence[int], coordinates: np.ndarray, element_ids: Sequence[int],
+                 connectivity: np.ndarray, bc: np.ndarray):
+        """
+        Initialization of the grid from arrays (arrays of the right dtype are not copied).
+
+        Args:
+            node_ids (list[int]): Identifiers of the nodes (need not be contiguous)
+            coordinates (np.ndarray): (n, 2) coordinates x, y of the nodes
+            element_ids (list[int]): Identifiers of the elements
+            connectivity (np.ndarray): (e, 4) node identifiers of each element
+            bc (np.ndarray): (n,) boundary condition of each node (0 - none)
+
+        Raises:
+            ValueError: When an element refers to an unknown node
+        """
+        self.node_ids: np.ndarray = np.ascontiguousarray(node_ids, dtype=np.int32)
+        self.coordinates: np.ndarray = np.ascontiguousarray(coordinates, dtype=np.float64).reshape(-1, 2)
+        self.element_ids: np.ndarray = np.ascontiguousarray(element_ids, dtype=np.int32)
+        bc = np.asarray(bc)
+        # Boolean flags (e.g. the BC block of a binary grid) are reinterpreted, not converted
+        self.bc: np.ndarray = bc.view(np.int8) if bc.dtype == np.bool_ else np.ascontiguousarray(bc, dtype=np.int8)
+
+        connectivity = np.asarray(connectivity).reshape(-1, 4)
+        n = len(self.node_ids)
+        # Node IDs 1..n - the index of a node is its ID - 1, no mapping is needed
+        self.contiguous_ids: bool = bool(n == 0 or (self.node_ids[0] == 1 and self.node_ids[-1] == n and
+                                                    (np.diff(self.node_ids) == 1).all()))
+        self._connectivity: Optional[np.ndarray] = None
+        self._element_node_ids: Optional[np.ndarray] = None
+        self.id_to_index: Optional[np.ndarray] = None
+
+        if self.contiguous_ids:
+            if connectivity.size and (connectivity.min() < 1 or connectivity.max() > n):
+                raise ValueError("Element refers to a node that does not exist")
+            # One-based IDs kept without a copy (int32 views of a binary grid stay views)
+            self._element_node_ids = np.ascontiguousarray(connectivity, dtype=np.int32)
+        else:
+            # Mapping of non-contiguous node IDs to zero-based indices
+            self.id_to_index = np.full(int(self.node_ids.max(initial=0)) + 1, -1, dtype=np.int32)
+            self.id_to_index[self.node_ids] = np.arange(n, dtype=np.int32)
+            connectivity = connectivity.astype(np.int64)
+            if connectivity.size and (connectivity.min() < 0 or connectivity.max() >= len(self.id_to_index) or
+                                      (self.id_to_index[connectivity] < 0).any()):
+                raise ValueError("Element refers to a node that does not exist")
+            self._connectivity = np.ascontiguousarray(self.id_to_index[connectivity], dtype=np.int32)
+        self._boundary_edges: Optional[BoundaryEdges] = None
+
+    @classmethod
+    def from_mesh_data(cls, mesh: MeshData) -> 'ArrayMesh':
+        """
+        Creates the grid from the arrays returned by read_mesh / load_mesh
+        (the memory-mapped arrays of a binary grid are not copied).
+
+        Args:
+            mesh (MeshData): Parsed grid
+        """
+        return cls(mesh.node_ids, mesh.coordinates, mesh.element_ids, mesh.connectivity, mesh.bc_mask)
+
+    @property
+    def nodes_number(self) -> int:
+        return len(self.node_ids)
+
+    @property
+    def elements_number(self) -> int:
+        return len(self.element_ids)
+
+    @property
+    def connectivity(self) -> np.ndarray:
+        """(e, 4) zero-based node indices of each element (built on first use for contiguous IDs)."""
+        if self._connectivity is None:
+            self._connectivity = self.element_indices()
+        return self._connectivity
+
+    @property
+    def element_node_ids(self) -> np.ndarray:
+        """(e, 4) node identifiers of each element."""
+        if self._element_node_ids is None:
+            return self.node_ids[self._connectivity]
+        return self._element_node_ids
+
+    @property
+    def global_element_IDs(self) -> np.ndarray:
+        """
+        (e, 4) one-based node indices of each element - the element_IDs of the global matrices
+        (the connectivity itself, without a copy, for contiguous IDs).
+        """
+        if self.contiguous_ids:
+            return self._element_node_ids
+        return self._connectivity + 1
+
+    def element_indices(self, start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+        """
+        Returns the zero-based node indices of a range of elements.
+
+        Args:
+            start (int): Index of the first element
+            stop (int, optional): Index after the last element (all elements by default)
+
+        Returns:
+            np.ndarray: (stop - start, 4) int32 - a view, or a copy of the range only for contiguous IDs
+        """
+        if self._connectivity is not None:
+            return self._connectivity[start:stop]
+        return self._element_node_ids[start:stop] - np.int32(1)
+
+    def element_coordinates(self, start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+        """
+        Returns the coordinates of the nodes of a range of elements.
+
+        Args:
+            start (int): Index of the first element
+            stop (int, optional): Index after the last element (all elements by default)
+
+        Returns:
+            np.ndarray: Contiguous array of shape (stop - start, 4, 2)
+        """
+        return self.coordinates[self.element_indices(start, stop)]
+
+    def iter_element_chunks(self, chunk_size: int) -> Iterator[Tuple[int, int]]:
+        """
+        Splits the elements into ranges of at most chunk_size (the unit of streamed assembly).
+
+        Args:
+            chunk_size (int): Number of elements in one range
+
+        Yields:
+            tuple[int, int]: Index of the first element and index after the last element of the range
+        """
+        for start in range(0, self.elements_number, chunk_size):
+            yield start, min(start + chunk_size, self.elements_number)
+
+    def boundary_edges(self) -> BoundaryEdges:
+        """
+        Returns the index of the walls with the boundary condition (built once and cached).
+        A wall is on the boundary when exactly one element owns it, and it has the condition
+        when both of its nodes have it - interior elements never appear in the index.
+
+        Returns:
+            BoundaryEdges: Element and local wall number of every boundary wall
+        """
+        if self._boundary_edges is None:
+            edge_nodes = self.element_indices()[:, np.array(EDGE_NODES)].astype(np.int64)   # (e, 4, 2)
+            first = edge_nodes.min(axis=2)
+            second = edge_nodes.max(axis=2)
+            keys = (first * self.nodes_number + second).ravel()
+            _, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+
+            on_boundary = (counts[inverse] == 1).reshape(-1, 4)
+            with_bc = (self.bc[first] > 0) & (self.bc[first] == self.bc[second])
+            elements, walls = np.nonzero(on_boundary & with_bc)
+            self._boundary_edges = BoundaryEdges(elements.astype(np.int32), walls.astype(np.int8))
+        return self._boundary_edges
+
+    def boundary_walls(self, start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+        """
+        Returns the boundary condition of every wall of a range of elements.
+
+        Args:
+            start (int): Index of the first element
+            stop (int, optional): Index after the last element (all elements by default)
+
+        Returns:
+            np.ndarray: (stop - start, 4) int8 - 1 for walls with the boundary condition, 0 otherwise
+        """
+        stop = self.elements_number if stop is None else stop
+        edges = self.boundary_edges()
+        first, last = np.searchsorted(edges.elements, [start, stop])
+        walls = np.zeros((stop - start, 4), dtype=np.int8)
+        walls[edges.elements[first:last] - start, edges.walls[first:last]] = 1
+        return walls
+
+    def node(self, index: int) -> 'NodeView':
+        """Returns a view of the node with the given zero-based index."""
+        return NodeView(self, index)
+
+    def node_by_id(self, node_id: int) -> 'NodeView':
+        """Returns a view of the node with the given identifier."""
+        return NodeView(self, node_id - 1 if self.id_to_index is None else int(self.id_to_index[node_id]))
+
+    def element(self, index: int) -> 'ElementView':
+        """Returns a view of the element with the given zero-based index."""
+        return ElementView(self, index)
+
+    def nodes(self) -> Iterator['NodeView']:
+        for index in range(self.nodes_number):
+            yield NodeView(self, index)
+
+    def elements(self) -> Iterator['ElementView']:
+        for index in range(self.elements_number):
+            yield ElementView(self, index)
+
+
+class NodeView(Node):
+    """
+    Lightweight view of one node of an ArrayMesh with the interface of Node.
+    Reads (and writes) the arrays of the grid, so it holds no copy of the data.
+    """
+
+    __slots__ = ("_mesh", "_index")
+
+    def __init__(self, mesh: ArrayMesh, index: int):
+        self._mesh: ArrayMesh = mesh
+        self._index: int = index
+
+    @property
+    def node_id(self) -> int:
+        return int(self._mesh.node_ids[self._index])
+
+    @property
+    def x(self) -> float:
+        return float(self._mesh.coordinates[self._index, 0])
+
+    @x.setter
+    def x(self, value: float) -> None:
+        self._mesh.coordinates[self._index, 0] = value
+
+    @property
+    def y(self) -> float:
+        return float(self._mesh.coordinates[self._index, 1])
+
+    @y.setter
+    def y(self, value: float) -> None:
+        self._mesh.coordinates[self._index, 1] = value
+
+    @property
+    def BC(self) -> int:
+        return int(self._mesh.bc[self._index])
+
+    @BC.setter
+    def BC(self, value: int) -> None:
+        self._mesh.bc[self._index] = value
+
+
+class ElementView(Element):
+    """
+    Lightweight view of one element of an ArrayMesh with the interface of Element.
+    """
+
+    __slots__ = ("_mesh", "_index")
+
+    def __init__(self, mesh: ArrayMesh, index: int):
+        self._mesh: ArrayMesh = mesh
+        self._index: int = index
+
+    @property
+    def id(self) -> int:
+        return int(self._mesh.element_ids[self._index])
+
+    @property
+    def connected_nodes(self) -> List[NodeView]:
+        indices = self._mesh.element_indices(self._index, self._index + 1)[0]
+        return [NodeView(self._mesh, int(index)) for index in indices]
+
+    def addNode(self, node: Node) -> None:
+        raise TypeError("Nodes of an element view are defined by the connectivity of the grid")
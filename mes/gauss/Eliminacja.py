@@ -48,3 +48,4 @@ def gaussian_elimination(matrix_c_h_summed: List[List[float]], vectors_summed: L
     temp_solution = [row[-1] for row in augmented_matrix]
 
     return temp_solution
+
@@ -1,6 +1,68 @@
 from mes.gauss.GaussFunction import functionX, functionXY
 import math
-from typing import List
+from functools import lru_cache
+from typing import List, Tuple
+
+
+@lru_cache(maxsize=None)
+def gauss_legendre(no_nodes: int) -> Tuple[Tuple[float, ...], Tuple[float, ...]]:
+    """
+    Returns the nodes and weights of the Gauss-Legendre quadrature on the interval [-1, 1].
+    The result is cached per number of nodes, so the values are computed only once per process.
+
+    Args:
+        no_nodes (int): Number of integration nodes (1-5)
+
+    Returns:
+        tuple[tuple[float, ...], tuple[float, ...]]: Immutable nodes and weights
+
+    Raises:
+        ValueError: When the number of nodes is not supported (outside the range 1-5)
+    """
+    # Definitions of nodes and weights for different numbers of integration points
+    if no_nodes == 1:
+        # One-point integration
+        nodes = [0]  # Node in the center of the interval
+        weights = [2]  # Weight for the node
+
+    elif no_nodes == 2:
+        # Two-point integration
+        nodes = [-(1 / math.sqrt(3)), 1 / math.sqrt(3)]  # Symmetric nodes
+        weights = [1, 1]  # Equal weights for both nodes
+
+    elif no_nodes == 3:
+        # Three-point integration
+        nodes = [-(math.sqrt(3 / 5)), 0, math.sqrt(3 / 5)]  # Symmetric nodes + center
+        weights = [5 / 9, 8 / 9, 5 / 9]  # Weights for the nodes
+
+    elif no_nodes == 4:
+        # Four-point integration
+        nodes = [-(math.sqrt(3 / 7 + 2 / 7 * math.sqrt(6 / 5))),
+                 -(math.sqrt(3 / 7 - 2 / 7 * math.sqrt(6 / 5))),
+                 (math.sqrt(3 / 7 - 2 / 7 * math.sqrt(6 / 5))),
+                 (math.sqrt(3 / 7 + 2 / 7 * math.sqrt(6 / 5)))]
+        weights = [(18 - math.sqrt(30)) / 36, (18 + math.sqrt(30)) / 36,
+                   (18 + math.sqrt(30)) / 36, (18 - math.sqrt(30)) / 36]
+
+    elif no_nodes == 5:
+        # Five-point integration
+        nodes = [-math.sqrt(5 + 2 * math.sqrt(10 / 7)) / 3,
+                 -math.sqrt(5 - 2 * math.sqrt(10 / 7)) / 3,
+                 0,
+                 math.sqrt(5 - 2 * math.sqrt(10 / 7)) / 3,
+                 math.sqrt(5 + 2 * math.sqrt(10 / 7)) / 3]
+
+        weights = [(322 - 13 * math.sqrt(70)) / 900,
+                   (322 + 13 * math.sqrt(70)) / 900,
+                   128 / 225,
+                   (322 + 13 * math.sqrt(70)) / 900,
+                   (322 - 13 * math.sqrt(70)) / 900]
+
+    else:
+        raise ValueError("Unsupported number of nodes.")
+
+    return tuple(nodes), tuple(weights)
+
 
 class GaussianIntegral:
     """
@@ -19,50 +81,9 @@ class GaussianIntegral:
             ValueError: When the number of nodes is not supported (outside the range 1-5)
         """
         self.no_nodes: int = no_nodes
-        self.nodes: List[float] = []
-        self.weights: List[float] = []
-
-        # Definitions of nodes and weights for different numbers of integration points
-        if no_nodes == 1:
-            # One-point integration
-            self.nodes = [0]  # Node in the center of the interval
-            self.weights = [2]  # Weight for the node
-
-        elif no_nodes == 2:
-            # Two-point integration
-            self.nodes = [-(1 / math.sqrt(3)), 1 / math.sqrt(3)]  # Symmetric nodes
-            self.weights = [1, 1]  # Equal weights for both nodes
-
-        elif no_nodes == 3:
-            # Three-point integration
-            self.nodes = [-(math.sqrt(3 / 5)), 0, math.sqrt(3 / 5)]  # Symmetric nodes + center
-            self.weights = [5 / 9, 8 / 9, 5 / 9]  # Weights for the nodes
-
-        elif no_nodes == 4:
-            # Four-point integration
-            self.nodes = [-(math.sqrt(3 / 7 + 2 / 7 * math.sqrt(6 / 5))),
-                          -(math.sqrt(3 / 7 - 2 / 7 * math.sqrt(6 / 5))),
-                          (math.sqrt(3 / 7 - 2 / 7 * math.sqrt(6 / 5))),
-                          (math.sqrt(3 / 7 + 2 / 7 * math.sqrt(6 / 5)))]
-            self.weights = [(18 - math.sqrt(30)) / 36, (18 + math.sqrt(30)) / 36,
-                            (18 + math.sqrt(30)) / 36, (18 - math.sqrt(30)) / 36]
-
-        elif no_nodes == 5:
-            # Five-point integration
-            self.nodes = [-math.sqrt(5 + 2 * math.sqrt(10 / 7)) / 3,
-                          -math.sqrt(5 - 2 * math.sqrt(10 / 7)) / 3,
-                          0,
-                          math.sqrt(5 - 2 * math.sqrt(10 / 7)) / 3,
-                          math.sqrt(5 + 2 * math.sqrt(10 / 7)) / 3]
-
-            self.weights = [(322 - 13 * math.sqrt(70)) / 900,
-                            (322 + 13 * math.sqrt(70)) / 900,
-                            128 / 225,
-                            (322 + 13 * math.sqrt(70)) / 900,
-                            (322 - 13 * math.sqrt(70)) / 900]
-
-        else:
-            raise ValueError("Unsupported number of nodes.")
+        nodes, weights = gauss_legendre(no_nodes)
+        self.nodes: List[float] = list(nodes)
+        self.weights: List[float] = list(weights)
 
     def integrate1d(self) -> float:
         """
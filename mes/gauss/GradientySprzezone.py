@@ -0,0 +1,216 @@
+import warnings
+import numpy as np
+from typing import Dict, List, Optional, Sequence, Union
+from mes.macierz.MacierzRzadka import MacierzRzadka
+from mes.gauss.RozkladLDL import LDLFactorization
+from mes.gauss.PodstawienieBlokowe import BlockSubstitution
+
+
+class JacobiPreconditioner:
+    """
+    Diagonal (Jacobi) preconditioner: M = diag(A).
+    """
+
+    def __init__(self, matrix: MacierzRzadka):
+        self.inverse_diagonal: np.ndarray = 1 / matrix.diagonal()
+
+    def apply(self, residual: np.ndarray) -> np.ndarray:
+        return residual * self.inverse_diagonal
+
+
+class SSORPreconditioner:
+    """
+    Symmetric successive over-relaxation preconditioner:
+        M = ω/(2-ω) · (D/ω + L) (D/ω)⁻¹ (D/ω + U)
+    where L and U are the strictly lower and upper parts of the matrix.
+    For a symmetric matrix L = Uᵀ, so M = ω/(2-ω) · (I + Ũ)ᵀ (D/ω) (I + Ũ) with Ũ = (D/ω)⁻¹ U -
+    an LDLᵀ product whose unit factor is known without any factorization, so both sweeps
+    run block by block with NumPy (see BlockSubstitution).
+    """
+
+    def __init__(self, matrix: MacierzRzadka, omega: float = 1.0):
+        """
+        Args:
+            matrix (MacierzRzadka): Symmetric matrix of the system of equations
+            omega (float): Relaxation factor from the range (0, 2)
+
+        Raises:
+            ValueError: When omega is outside the range (0, 2)
+        """
+        if not 0 < omega < 2:
+            raise ValueError("Relaxation factor must be in the range (0, 2)")
+
+        self.omega: float = omega
+        self.scaled_diagonal: np.ndarray = matrix.diagonal() / omega
+
+        # Strictly upper part of every CSR row scaled by the row of D/ω - the unit factor Ũ
+        upper = matrix.indices > matrix.row_of_entry
+        rows = matrix.row_of_entry[upper]
+        indptr = np.zeros(matrix.no_rows + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=matrix.no_rows), out=indptr[1:])
+        values = matrix.data[upper] / self.scaled_diagonal[rows]
+        self.substitution: BlockSubstitution = BlockSubstitution(indptr, matrix.indices[upper], values)
+
+    def apply(self, residual: np.ndarray) -> np.ndarray:
+        return self.substitution.solve(residual, self.scaled_diagonal) * ((2 - self.omega) / self.omega)
+
+
+class IncompleteCholeskyPreconditioner:
+    """
+    Incomplete Cholesky preconditioner IC(0) in the LDLᵀ form -
+    the factor keeps the sparsity pattern of the matrix (no fill-in).
+    """
+
+    def __init__(self, matrix: MacierzRzadka):
+        self.factorization: LDLFactorization = LDLFactorization(matrix, incomplete=True)
+
+    def apply(self, residual: np.ndarray) -> np.ndarray:
+        return self.factorization.solve(residual)
+
+
+# Available preconditioners selected by name
+PRECONDITIONERS: Dict[str, type] = {
+    "jacobi": JacobiPreconditioner,
+    "ssor": SSORPreconditioner,
+    "ic": IncompleteCholeskyPreconditioner,
+}
+
+
+class PCGSolver:
+    """
+    Class implementing the preconditioned conjugate gradient method for symmetric
+    positive definite systems such as [C]/dτ + [H].
+    The solver remembers the last solution and uses it as the initial guess of the next
+    call, so in the time loop every step starts from the temperatures of the previous step.
+    """
+
+    def __init__(self, matrix: Union[List[List[float]], MacierzRzadka], preconditioner: Optional[str] = "jacobi",
+                 tolerance: float = 1e-10, max_iterations: Optional[int] = None, warm_start: bool = True,
+                 raise_on_failure: bool = True):
+        """
+        Initialization of the solver.
+
+        Args:
+            matrix (list[list[float]] | MacierzRzadka): Symmetric positive definite matrix
+            preconditioner (str, optional): "jacobi", "ssor", "ic" or None (no preconditioning)
+            tolerance (float): Required relative residual ||b - Ax|| / ||b||
+            max_iterations (int, optional): Limit of iterations (number of unknowns by default)
+            warm_start (bool): If True, the previous solution is the initial guess of the next solve
+            raise_on_failure (bool): If True, a solve that does not reach the tolerance within max_iterations
+                                     raises RuntimeError, otherwise it emits a RuntimeWarning
+
+        Raises:
+            ValueError: When the preconditioner name is unknown
+        """
+        if not isinstance(matrix, MacierzRzadka):
+            matrix = MacierzRzadka.from_dense(matrix)
+        if preconditioner is not None and preconditioner not in PRECONDITIONERS:
+            raise ValueError(f"Unknown preconditioner: {preconditioner}")
+
+        self.matrix: MacierzRzadka = matrix
+        self.preconditioner = PRECONDITIONERS[preconditioner](matrix) if preconditioner else None
+        self.tolerance: float = tolerance
+        self.max_iterations: int = max_iterations if max_iterations is not None else max(matrix.no_rows, 1)
+        self.warm_start: bool = warm_start
+        self.last_solution: Optional[np.ndarray] = None
+        self.raise_on_failure: bool = raise_on_failure
+
+        # Statistics of the last solve
+        self.iterations: int = 0
+        self.residual_norm: float = 0.0
+        self.converged: bool = False
+
+    def _precondition(self, residual: np.ndarray) -> np.ndarray:
+        if self.preconditioner is None:
+            return residual.copy()
+        return self.preconditioner.apply(residual)
+
+    def solve(self, vector: Sequence[float], initial_guess: Optional[Sequence[float]] = None) -> np.ndarray:
+        """
+        Solves the system of equations.
+
+        Args:
+            vector (list[float]): Free term vector, or array (n, k) of k right-hand sides
+            initial_guess (list[float], optional): Initial approximation of the solution; if omitted,
+                                                   the previous solution (warm start) or zeros are used
+
+        Returns:
+            np.ndarray: Solution vector (temperatures in nodes), or array (n, k) for k right-hand sides
+
+        Raises:
+            RuntimeError: When the tolerance is not reached within max_iterations (with raise_on_failure)
+        """
+        b = np.asarray(vector, dtype=np.float64)
+        if b.ndim == 2:
+            return self._solve_columns(b, initial_guess)
+
+        if initial_guess is not None:
+            x = np.array(initial_guess, dtype=np.float64)
+        elif self.warm_start and self.last_solution is not None and self.last_solution.shape == b.shape:
+            x = self.last_solution.copy()
+        else:
+            x = np.zeros_like(b)
+
+        b_norm = np.linalg.norm(b) or 1.0
+        r = b - self.matrix.multiply_by_vector(x)
+        self.residual_norm = np.linalg.norm(r) / b_norm
+        self.iterations = 0
+
+        if self.residual_norm > self.tolerance:
+            z = self._precondition(r)
+            p = z.copy()
+            rz = r @ z
+            while self.iterations < self.max_iterations:
+                ap = self.matrix.multiply_by_vector(p)
+                alpha = rz / (p @ ap)
+                x += alpha * p
+                r -= alpha * ap
+                self.iterations += 1
+
+                self.residual_norm = np.linalg.norm(r) / b_norm
+                if self.residual_norm <= self.tolerance:
+                    break
+
+                z = self._precondition(r)
+                rz_new = r @ z
+                p = z + (rz_new / rz) * p
+                rz = rz_new
+
+        self.converged = self.residual_norm <= self.tolerance
+        if not self.converged:
+            self._report_failure()
+        self.last_solution = x
+        return x.copy()
+
+    def _report_failure(self) -> None:
+        """Raises or warns that the last solve stopped at max_iterations above the tolerance."""
+        message = (f"Conjugate gradient did not converge: relative residual {self.residual_norm:.3e} "
+                   f"after {self.iterations} iterations (tolerance {self.tolerance:.1e})")
+        if self.raise_on_failure:
+            raise RuntimeError(message)
+        warnings.warn(message, RuntimeWarning, stacklevel=3)
+
+    def _solve_columns(self, b: np.ndarray, initial_guess: Optional[Sequence[Sequence[float]]]) -> np.ndarray:
+        """
+        Solves k systems with the same matrix one column at a time.
+        The warm start of every column is the same column of the previous solution.
+        Afterwards iterations is the total of all columns and residual_norm the worst column.
+        """
+        previous = self.last_solution if self.warm_start and self.last_solution is not None \
+            and self.last_solution.shape == b.shape else None
+        guesses = np.asarray(initial_guess, dtype=np.float64) if initial_guess is not None else previous
+
+        x = np.empty_like(b)
+        iterations = 0
+        residual_norm = 0.0
+        for column in range(b.shape[1]):
+            self.last_solution = None
+            x[:, column] = self.solve(b[:, column], None if guesses is None else guesses[:, column])
+            iterations += self.iterations
+            residual_norm = max(residual_norm, self.residual_norm)
+
+        self.iterations = iterations
+        self.residual_norm = residual_norm
+        self.converged = residual_norm <= self.tolerance
+        self.last_solution = x.copy()
+        return x
@@ -0,0 +1,163 @@
+import numpy as np
+from typing import List, Sequence, Tuple
+
+# Rows solved together with one dense product - a sweep takes no_nodes / SUBSTITUTION_BLOCK NumPy steps
+SUBSTITUTION_BLOCK: int = 64
+
+
+def _segment_sum(bins: np.ndarray, weights: np.ndarray, length: int) -> np.ndarray:
+    """Sums the weights (k,) or (k, m) into length bins (every column of 2D weights separately)."""
+    if weights.ndim == 1:
+        return np.bincount(bins, weights=weights, minlength=length)
+    m = weights.shape[1]
+    flat_bins = (bins[:, None].astype(np.int64) * m + np.arange(m)).ravel()
+    return np.bincount(flat_bins, weights=weights.ravel(), minlength=length * m).reshape(-1, m)
+
+
+class BlockSubstitution:
+    """
+    Class implementing the forward and back substitution of an LDLᵀ factorization
+    whose unit upper factor Lᵀ is stored in the CSR format (diagonal not stored).
+    The rows are processed in blocks of block_size: the inverse of the small triangular
+    diagonal block of every block is computed once, and the couplings with the other blocks are
+    gathered and summed with NumPy, so a sweep costs no_nodes / block_size vectorized steps
+    instead of a Python loop over the rows.
+    """
+
+    def __init__(self, indptr: np.ndarray, indices: np.ndarray, values: np.ndarray,
+                 block_size: int = SUBSTITUTION_BLOCK):
+        """
+        Initialization and inversion of the diagonal blocks.
+
+        Args:
+            indptr (np.ndarray): Offsets of the rows of Lᵀ in indices and values (length no_nodes + 1)
+            indices (np.ndarray): Column of every stored value (sorted in every row, all above the diagonal)
+            values (np.ndarray): Off-diagonal values of Lᵀ
+            block_size (int): Number of rows of one block
+        """
+        self.indptr: np.ndarray = indptr
+        self.indices: np.ndarray = indices
+        self.values: np.ndarray = values
+        self.no_nodes: int = len(indptr) - 1
+
+        # start, stop, inverse of the diagonal block of Lᵀ, local row of every value of the block rows
+        self.blocks: List[Tuple[int, int, np.ndarray, np.ndarray]] = []
+        for start in range(0, self.no_nodes, block_size):
+            stop = min(start + block_size, self.no_nodes)
+            first, last = indptr[start], indptr[stop]
+            rows = np.repeat(np.arange(stop - start, dtype=np.int16), np.diff(indptr[start:stop + 1]))
+            cols = indices[first:last]
+            inside = cols < stop
+            diagonal_block = np.eye(stop - start)
+            diagonal_block[rows[inside], cols[inside] - start] = values[first:last][inside]
+            self.blocks.append((start, stop, np.linalg.inv(diagonal_block), rows))
+
+    def solve(self, vector: Sequence[float], diagonal: np.ndarray) -> np.ndarray:
+        """
+        Solves L D Lᵀ x = b.
+
+        Args:
+            vector (list[float] | np.ndarray): Free term vector (no_nodes,) or matrix of vectors (no_nodes, k)
+            diagonal (np.ndarray): Diagonal D of the factorization
+
+        Returns:
+            np.ndarray: Solution of the same shape as the free term
+        """
+        y = np.array(vector, dtype=np.float64)
+        indptr, indices, values = self.indptr, self.indices, self.values
+
+        # Forward substitution with L (column-oriented): a solved block updates the rows below it
+        for start, stop, inverse, rows in self.blocks:
+            y[start:stop] = inverse.T @ y[start:stop]
+            first, last = indptr[start], indptr[stop]
+            if first == last:
+                continue
+            block_values = values[first:last] if y.ndim == 1 else values[first:last, None]
+            updates = _segment_sum(indices[first:last] - start, block_values * y[start:stop][rows], stop - start)
+            y[stop:start + len(updates)] -= updates[stop - start:]
+
+        # Scaling by D⁻¹
+        y /= diagonal if y.ndim == 1 else diagonal[:, None]
+
+        # Back substitution with Lᵀ (row-oriented): the unknowns of the current and the earlier blocks
+        # are still zero in x, so the products contain only the couplings with the solved blocks
+        x = np.zeros_like(y)
+        for start, stop, inverse, rows in reversed(self.blocks):
+            first, last = indptr[start], indptr[stop]
+            rhs = y[start:stop]
+            if first != last:
+                block_values = values[first:last] if y.ndim == 1 else values[first:last, None]
+                rhs = rhs - _segment_sum(rows, block_values * x[indices[first:last]], stop - start)
+            x[start:stop] = inverse @ rhs
+
+        return x
+
+
+class BandBlockSubstitution:
+    """
+    Class implementing the forward and back substitution of a variable-band (skyline) LDLᵀ factorization,
+    where row k of Lᵀ covers the contiguous columns k+1..k+width. The rows of a block together
+    cover a short range of columns, so the couplings of every block are kept as a dense slab
+    and both sweeps are one matrix-vector product (BLAS) per block.
+    """
+
+    def __init__(self, indptr: np.ndarray, values: np.ndarray, block_size: int = SUBSTITUTION_BLOCK):
+        """
+        Initialization of the dense slabs and inversion of the diagonal blocks.
+
+        Args:
+            indptr (np.ndarray): Offsets of the segments of the rows of Lᵀ in values (length no_nodes + 1)
+            values (np.ndarray): Off-diagonal values of Lᵀ, row k holds the columns k+1..k+width
+            block_size (int): Number of rows of one block
+        """
+        self.no_nodes: int = len(indptr) - 1
+        lengths = np.diff(indptr)
+
+        # start, stop, last coupled column + 1, inverse of the diagonal block of Lᵀ, coupling with columns >= stop
+        self.blocks: List[Tuple[int, int, int, np.ndarray, np.ndarray]] = []
+        for start in range(0, self.no_nodes, block_size):
+            stop = min(start + block_size, self.no_nodes)
+            block_lengths = lengths[start:stop]
+            reach = max(int((np.arange(start + 1, stop + 1) + block_lengths).max()), stop)
+            first, last = indptr[start], indptr[stop]
+
+            # Local row and column of every value of the block rows
+            rows = np.repeat(np.arange(stop - start), block_lengths)
+            cols = np.arange(last - first) - np.repeat(indptr[start:stop] - first - np.arange(1, stop - start + 1),
+                                                       block_lengths)
+            slab = np.zeros((stop - start, reach - start))
+            slab[rows, cols] = values[first:last]
+
+            inverse = np.linalg.inv(slab[:, :stop - start] + np.eye(stop - start))
+            self.blocks.append((start, stop, reach, inverse, np.ascontiguousarray(slab[:, stop - start:])))
+
+    def solve(self, vector: Sequence[float], diagonal: np.ndarray) -> np.ndarray:
+        """
+        Solves L D Lᵀ x = b.
+
+        Args:
+            vector (list[float] | np.ndarray): Free term vector (no_nodes,) or matrix of vectors (no_nodes, k)
+            diagonal (np.ndarray): Diagonal D of the factorization
+
+        Returns:
+            np.ndarray: Solution of the same shape as the free term
+        """
+        x = np.array(vector, dtype=np.float64)
+
+        # Forward substitution with L: a solved block updates the rows of its slab below it
+        for start, stop, reach, inverse, coupling in self.blocks:
+            x[start:stop] = inverse.T @ x[start:stop]
+            if reach > stop:
+                x[stop:reach] -= coupling.T @ x[start:stop]
+
+        # Scaling by D⁻¹
+        x /= diagonal if x.ndim == 1 else diagonal[:, None]
+
+        # Back substitution with Lᵀ: the rows below the block are already solved
+        for start, stop, reach, inverse, coupling in reversed(self.blocks):
+            rhs = x[start:stop]
+            if reach > stop:
+                rhs = rhs - coupling @ x[stop:reach]
+            x[start:stop] = inverse @ rhs
+
+        return x
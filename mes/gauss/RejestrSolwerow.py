@@ -0,0 +1,202 @@
+import numpy as np
+from functools import partial
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+from mes.macierz.MacierzRzadka import MacierzRzadka
+from mes.gauss.Eliminacja import gaussian_elimination
+from mes.gauss.RozkladLDL import LDLFactorization
+from mes.gauss.RozkladSkyline import SkylineLDLFactorization, half_bandwidth
+from mes.gauss.GradientySprzezone import PCGSolver
+from mes.gauss.PodstawienieBlokowe import SUBSTITUTION_BLOCK
+
+# Largest system solved with the dense backend (the dense matrix takes 8·n² bytes)
+DENSE_MAX_NODES: int = 4000
+
+# Constants of the cost model of the direct backends [s]. Least-squares fit (relative error of the fit
+# below 40%) of the times of DenseSolver and SkylineLDLFactorization measured on structured grids from
+# generate_mesh - 100 to 4000 nodes for the dense backend, 100 to 40000 nodes for the skyline one -
+# with Python 3.11 and NumPy 2.2 on the machine of benchmarks/baseline.json. Only the ratio of the
+# estimates decides, so the constants need refitting only when a backend changes.
+DENSE_FACTOR_COST = (1e-4, 1e-7, 1e-11)          # fixed + per n² (conversion to a dense array) + per n³ (Cholesky)
+DENSE_SOLVE_COST = (1.3e-5, 5e-10)              # fixed + per n² (two triangular sweeps)
+SKYLINE_FACTOR_COST = (2.6e-5, 9.2e-8, 3e-9)    # per row: fixed + per b + per b²
+SKYLINE_SOLVE_COST = (1.8e-7, 1.1e-9)           # per row: fixed + per b
+
+# Backends considered by "auto" - only the direct ones, whose results do not depend on a tolerance
+AUTOMATIC_SOLVERS: Tuple[str, ...] = ("dense", "skyline")
+
+
+class DenseSolver:
+    """
+    Class implementing the dense direct solver of the system of equations (LAPACK through NumPy).
+    The symmetric positive definite matrix is factored once (Cholesky, A = L Lᵀ) and every solve
+    is a forward and a back substitution with L, run in blocks of rows with BLAS products -
+    the fastest backend for small grids and many time steps.
+    """
+
+    def __init__(self, matrix: Union[List[List[float]], MacierzRzadka], block_size: int = SUBSTITUTION_BLOCK):
+        """
+        Initialization and factorization of the matrix.
+
+        Args:
+            matrix (list[list[float]] | MacierzRzadka): Symmetric positive definite matrix of the system
+            block_size (int): Number of rows of one block of the substitutions
+
+        Raises:
+            ValueError: When the matrix is not symmetric positive definite
+        """
+        dense = np.array(matrix.to_dense() if isinstance(matrix, MacierzRzadka) else matrix, dtype=np.float64)
+        if not np.allclose(dense, dense.T, rtol=1e-10, atol=0.0):
+            raise ValueError("Dense solver needs a symmetric matrix")
+        try:
+            self.factor: np.ndarray = np.linalg.cholesky(dense)
+        except np.linalg.LinAlgError as error:
+            raise ValueError(f"Matrix is not positive definite: {error}") from error
+
+        # Inverses of the triangular diagonal blocks of L
+        n = len(dense)
+        self.blocks: List[Tuple[int, int, np.ndarray]] = [
+            (start, min(start + block_size, n),
+             np.linalg.inv(self.factor[start:start + block_size, start:start + block_size]))
+            for start in range(0, n, block_size)]
+
+    def solve(self, vector: Sequence[float]) -> np.ndarray:
+        """
+        Solves the system of equations for a vector or a (no_nodes, k) matrix of right-hand sides.
+        """
+        x = np.array(vector, dtype=np.float64)
+        factor = self.factor
+
+        # Forward substitution with L
+        for start, stop, inverse in self.blocks:
+            x[start:stop] = inverse @ (x[start:stop] - factor[start:stop, :start] @ x[:start])
+
+        # Back substitution with Lᵀ
+        for start, stop, inverse in reversed(self.blocks):
+            x[start:stop] = inverse.T @ (x[start:stop] - factor[stop:, start:stop].T @ x[stop:])
+        return x
+
+
+class GaussianEliminationSolver:
+    """
+    Reference backend: the original gaussian_elimination repeated for every right-hand side.
+    Slow (nothing is reused between solves), kept to check the other backends.
+    """
+
+    def __init__(self, matrix: Union[List[List[float]], MacierzRzadka]):
+        self.matrix: List[List[float]] = matrix.to_dense() if isinstance(matrix, MacierzRzadka) else matrix
+
+    def solve(self, vector: Sequence[float]) -> np.ndarray:
+        vector = np.asarray(vector, dtype=np.float64)
+        if vector.ndim == 1:
+            return np.array(gaussian_elimination(self.matrix, vector.tolist()))
+        return np.column_stack([gaussian_elimination(self.matrix, column.tolist()) for column in vector.T])
+
+
+# Registered backends: name -> factory building an object with a solve(vector) method from the matrix
+SOLVERS: Dict[str, Callable] = {
+    "dense": DenseSolver,
+    "skyline": SkylineLDLFactorization,
+    "ldl": LDLFactorization,
+    "pcg": PCGSolver,
+    "gauss": GaussianEliminationSolver,
+}
+
+
+def register_solver(name: str, factory: Callable) -> None:
+    """
+    Adds a backend to the registry (replacing a backend of the same name).
+
+    Args:
+        name (str): Name of the backend
+        factory (Callable): Builds an object with a solve(vector) method from the system matrix
+    """
+    SOLVERS[name] = factory
+
+
+def estimate_costs(no_nodes: int, bandwidth: int, steps: int) -> Dict[str, float]:
+    """
+    Estimates the time of the factorization and all solves of every automatically selectable backend.
+
+    Args:
+        no_nodes (int): Number of unknowns
+        bandwidth (int): Half-bandwidth of the matrix
+        steps (int): Number of solves with the same matrix (time steps)
+
+    Returns:
+        dict[str, float]: Estimated time [s] of each backend (the dense one only up to DENSE_MAX_NODES)
+    """
+    n, b = float(no_nodes), float(bandwidth)
+    costs = {
+        "skyline": n * (SKYLINE_FACTOR_COST[0] + SKYLINE_FACTOR_COST[1] * b + SKYLINE_FACTOR_COST[2] * b * b)
+                   + steps * n * (SKYLINE_SOLVE_COST[0] + SKYLINE_SOLVE_COST[1] * b),
+    }
+    if no_nodes <= DENSE_MAX_NODES:
+        costs["dense"] = (DENSE_FACTOR_COST[0] + DENSE_FACTOR_COST[1] * n * n + DENSE_FACTOR_COST[2] * n ** 3
+                          + steps * (DENSE_SOLVE_COST[0] + DENSE_SOLVE_COST[1] * n * n))
+    return costs
+
+
+def select_solver(no_nodes: int, bandwidth: int, steps: int) -> str:
+    """
+    Chooses the direct backend (AUTOMATIC_SOLVERS) with the lowest estimated total time.
+    The iterative "pcg" backend is never chosen automatically - its results differ from the direct
+    solution by its tolerance, so it has to be requested by name.
+
+    Args:
+        no_nodes (int): Number of unknowns
+        bandwidth (int): Half-bandwidth of the matrix
+        steps (int): Number of solves with the same matrix (time steps)
+
+    Returns:
+        str: Name of the registered backend
+    """
+    costs = estimate_costs(no_nodes, bandwidth, max(steps, 1))
+    return min((name for name in costs if name in AUTOMATIC_SOLVERS), key=costs.get)
+
+
+def resolve_solver(name: str, element_IDs: Optional[Sequence[Sequence[int]]] = None,
+                   no_nodes: Optional[int] = None, steps: int = 1) -> str:
+    """
+    Returns the name of the backend to use ("auto" is replaced by the choice of select_solver).
+
+    Args:
+        name (str): Name of the backend or "auto"
+        element_IDs (list[list[int]], optional): Node IDs (one-based) of each element (required by "auto")
+        no_nodes (int, optional): Number of unknowns (largest node ID by default)
+        steps (int): Number of solves with the same matrix
+
+    Raises:
+        ValueError: When the backend is unknown or "auto" has no connectivity
+    """
+    if name == "auto":
+        if element_IDs is None:
+            raise ValueError("Automatic selection of the solver needs the connectivity of the grid")
+        ids = np.asarray(element_IDs, dtype=np.int64)
+        name = select_solver(no_nodes if no_nodes is not None else int(ids.max()), half_bandwidth(ids), steps)
+    if name not in SOLVERS:
+        raise ValueError(f"Unknown solver: {name} (available: {', '.join(SOLVERS)}, auto)")
+    return name
+
+
+def solver_factory(name: str = "auto", element_IDs: Optional[Sequence[Sequence[int]]] = None,
+                   no_nodes: Optional[int] = None, steps: int = 1) -> Callable:
+    """
+    Returns the factory of a registered backend (the factorization argument of the time steppers).
+
+    Args:
+        name (str): Name of the backend or "auto" (chosen by select_solver)
+        element_IDs (list[list[int]], optional): Node IDs (one-based) of each element - give the bandwidth
+                                                 for "auto" and the profile of the skyline backend
+        no_nodes (int, optional): Number of unknowns (largest node ID by default)
+        steps (int): Number of solves with the same matrix
+
+    Returns:
+        Callable: Factory building the solver from the system matrix
+
+    Raises:
+        ValueError: When the backend is unknown or "auto" has no connectivity
+    """
+    factory = SOLVERS[resolve_solver(name, element_IDs, no_nodes, steps)]
+    if factory is SkylineLDLFactorization and element_IDs is not None:
+        factory = partial(SkylineLDLFactorization, element_IDs=element_IDs)
+    return factory
@@ -0,0 +1,83 @@
+import numpy as np
+from typing import Dict, List, Sequence, Union
+from mes.macierz.MacierzRzadka import MacierzRzadka
+from mes.gauss.PodstawienieBlokowe import BlockSubstitution
+
+
+class LDLFactorization:
+    """
+    Class implementing the sparse LDLᵀ factorization of a symmetric matrix.
+    The matrix [C]/dτ + [H] is symmetric positive definite and does not change between
+    time steps, so it is factored once and every step only needs the forward and
+    back substitution, whose cost is proportional to the number of non-zeros of the factor
+    (run block by block with NumPy, see BlockSubstitution).
+    """
+
+    def __init__(self, matrix: Union[List[List[float]], MacierzRzadka], incomplete: bool = False):
+        """
+        Initialization and factorization of the matrix.
+
+        Args:
+            matrix (list[list[float]] | MacierzRzadka): Symmetric matrix of the system of equations
+            incomplete (bool): If True, the fill-in outside the sparsity pattern of the matrix is dropped
+                               (incomplete factorization IC(0), used as a preconditioner)
+
+        Raises:
+            ValueError: When a zero pivot is encountered (the matrix is singular)
+        """
+        if not isinstance(matrix, MacierzRzadka):
+            matrix = MacierzRzadka.from_dense(matrix)
+
+        self.no_nodes: int = matrix.no_rows
+        n = self.no_nodes
+        rows: List[Dict[int, float]] = [matrix.get_row(i) for i in range(n)]
+
+        # Elimination restricted to the upper triangle - rows[k] becomes row k of D·Lᵀ
+        for k in range(n):
+            pivot_row = rows[k]
+            pivot = pivot_row.get(k, 0.0)
+            if pivot == 0.0:
+                raise ValueError(f"Zero pivot in row {k}")
+
+            upper = [(j, value) for j, value in pivot_row.items() if j > k]
+            for i, value_i in upper:
+                factor = value_i / pivot
+                row = rows[i]
+                for j, value_j in upper:
+                    if j >= i and (not incomplete or j in row):
+                        row[j] = row.get(j, 0.0) - factor * value_j
+
+        # Storing the unit upper factor Lᵀ in the CSR format and the diagonal D
+        self.diagonal: np.ndarray = np.array([rows[k][k] for k in range(n)])
+        indptr: List[int] = [0]
+        indices: List[int] = []
+        values: List[float] = []
+        for k in range(n):
+            for j in sorted(rows[k]):
+                if j > k:
+                    indices.append(j)
+                    values.append(rows[k][j] / self.diagonal[k])
+            indptr.append(len(indices))
+
+        self.indptr: np.ndarray = np.array(indptr, dtype=np.int64)
+        self.indices: np.ndarray = np.array(indices, dtype=np.int64)
+        self.values: np.ndarray = np.array(values, dtype=np.float64)
+        self.substitution: BlockSubstitution = BlockSubstitution(self.indptr, self.indices, self.values)
+
+    @property
+    def nnz(self) -> int:
+        """Number of off-diagonal non-zeros of the factor L."""
+        return len(self.values)
+
+    def solve(self, vector: Sequence[float]) -> np.ndarray:
+        """
+        Solves the system of equations using the stored factorization.
+        Accepts a single vector or a (no_nodes, k) matrix of right-hand sides.
+
+        Args:
+            vector (list[float] | np.ndarray): Free term vector (or matrix of vectors)
+
+        Returns:
+            np.ndarray: Solution of the same shape as the free term
+        """
+        return self.substitution.solve(vector, self.diagonal)
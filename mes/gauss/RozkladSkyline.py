@@ -0,0 +1,151 @@
+import numpy as np
+from typing import List, Optional, Sequence, Union
+from mes.macierz.MacierzRzadka import MacierzRzadka
+from mes.gauss.PodstawienieBlokowe import BandBlockSubstitution
+
+
+def profile_from_connectivity(element_IDs: Sequence[Sequence[int]], no_nodes: int) -> np.ndarray:
+    """
+    Determines the profile (envelope) of the global matrix from the element connectivity.
+    For every node returns the lowest index of a node sharing an element with it,
+    i.e. the first non-zero column of its row in the lower triangle.
+
+    Args:
+        element_IDs (list[list[int]]): Node IDs (one-based) of each element
+        no_nodes (int): Number of nodes in the MES grid
+
+    Returns:
+        np.ndarray: Zero-based index of the first column of the profile in every row
+    """
+    ids = np.asarray(element_IDs, dtype=np.int64).reshape(-1, 4) - 1
+    first = np.arange(no_nodes, dtype=np.int64)
+    np.minimum.at(first, ids.ravel(), np.repeat(ids.min(axis=1), 4))
+    return first
+
+
+def half_bandwidth(element_IDs: Sequence[Sequence[int]]) -> int:
+    """
+    Calculates the half-bandwidth of the global matrix (largest difference
+    of node indices inside one element).
+
+    Args:
+        element_IDs (list[list[int]]): Node IDs of each element
+
+    Returns:
+        int: Half-bandwidth of the matrix
+    """
+    ids = np.asarray(element_IDs, dtype=np.int64).reshape(-1, 4)
+    return int((ids.max(axis=1) - ids.min(axis=1)).max())
+
+
+class SkylineLDLFactorization:
+    """
+    Class implementing the variable-band (skyline) LDLᵀ factorization of a symmetric matrix.
+    The fill-in of the factorization stays inside the profile of the matrix, so for grids
+    numbered row by row only O(n·b) values are stored and the factorization costs O(n·b²),
+    where b is the half-bandwidth (about the number of nodes in one row of the grid).
+    The substitutions run on dense slabs of the band, one block of rows at a time (BandBlockSubstitution).
+    """
+
+    def __init__(self, matrix: Union[List[List[float]], MacierzRzadka],
+                 element_IDs: Optional[Sequence[Sequence[int]]] = None):
+        """
+        Initialization and factorization of the matrix.
+
+        Args:
+            matrix (list[list[float]] | MacierzRzadka): Symmetric matrix of the system of equations
+            element_IDs (list[list[int]], optional): Node IDs of each element - if given, the profile
+                                                     is derived from the connectivity instead of the matrix
+
+        Raises:
+            ValueError: When a zero pivot is encountered (the matrix is singular)
+        """
+        if not isinstance(matrix, MacierzRzadka):
+            matrix = MacierzRzadka.from_dense(matrix)
+
+        n = matrix.no_rows
+        self.no_nodes: int = n
+
+        # First column of the profile in every row (column indices in CSR rows are sorted)
+        if element_IDs is not None:
+            first = profile_from_connectivity(element_IDs, n)
+        else:
+            first = np.minimum(matrix.indices[matrix.indptr[:-1]], np.arange(n))
+
+        # Last column of the profile in every row of the upper factor: max{c : first[c] <= k}
+        last = np.full(n, -1, dtype=np.int64)
+        np.maximum.at(last, first, np.arange(n, dtype=np.int64))
+        last = np.maximum(np.maximum.accumulate(last), np.arange(n))
+        self.half_bandwidth: int = int((last - np.arange(n)).max()) if n else 0
+
+        # Offsets of the stored segments of every row of Lᵀ (columns k+1..last[k])
+        lengths = last - np.arange(n)
+        self.indptr: np.ndarray = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(lengths, out=self.indptr[1:])
+        self.values: np.ndarray = np.zeros(self.indptr[-1])
+        self.diagonal: np.ndarray = np.zeros(n)
+
+        # Right-looking elimination on a sliding dense window covering rows/columns k..k+b
+        b = self.half_bandwidth
+        window = np.zeros((b + 1, b + 1))
+        for i in range(min(b + 1, n)):
+            self._load_row(matrix, window, i, 0)
+
+        for k in range(n):
+            pivot = window[0, 0]
+            if pivot == 0.0:
+                raise ValueError(f"Zero pivot in row {k}")
+
+            width = lengths[k]
+            upper = window[0, 1:width + 1] / pivot
+            self.diagonal[k] = pivot
+            self.values[self.indptr[k]:self.indptr[k + 1]] = upper
+
+            # Rank-1 update of the trailing block inside the profile
+            if width:
+                window[1:width + 1, 1:width + 1] -= np.outer(upper, window[0, 1:width + 1])
+
+            # Moving the window by one row/column and loading the next row of the matrix
+            window[:-1, :-1] = window[1:, 1:]
+            window[-1, :] = 0.0
+            window[:, -1] = 0.0
+            if k + b + 1 < n:
+                self._load_row(matrix, window, k + b + 1, k + 1)
+        self.substitution: BandBlockSubstitution = BandBlockSubstitution(self.indptr, self.values)
+
+    @staticmethod
+    def _load_row(matrix: MacierzRzadka, window: np.ndarray, row: int, offset: int) -> None:
+        """
+        Copies row (and, by symmetry, column) of the matrix into the sliding window.
+
+        Args:
+            matrix (MacierzRzadka): Factored matrix
+            window (np.ndarray): Dense window whose first row/column corresponds to index offset
+            row (int): Index of the row to load
+            offset (int): Global index of the first row of the window
+        """
+        start, end = matrix.indptr[row], matrix.indptr[row + 1]
+        cols = matrix.indices[start:end]
+        mask = (cols >= offset) & (cols <= row)
+        local_cols = cols[mask] - offset
+        local_row = row - offset
+        window[local_row, local_cols] = matrix.data[start:end][mask]
+        window[local_cols, local_row] = matrix.data[start:end][mask]
+
+    @property
+    def profile_size(self) -> int:
+        """Number of stored off-diagonal values of the factor."""
+        return len(self.values)
+
+    def solve(self, vector: Sequence[float]) -> np.ndarray:
+        """
+        Solves the system of equations using the stored factorization.
+        Accepts a single vector or a (no_nodes, k) matrix of right-hand sides.
+
+        Args:
+            vector (list[float] | np.ndarray): Free term vector (or matrix of vectors)
+
+        Returns:
+            np.ndarray: Solution of the same shape as the free term
+        """
+        return self.substitution.solve(vector, self.diagonal)
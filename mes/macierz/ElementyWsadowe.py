@@ -0,0 +1,307 @@
+import numpy as np
+from functools import lru_cache
+from typing import List, Optional, Tuple
+from mes.classes.Element import Element
+from mes.macierz.UniversalElement import EDGE_NODES, get_reference_tables
+from mes.macierz.GeometriaElementu import batch_jacobians, batch_shape_gradients
+from mes.macierz.MacierzH import no_integration_nodes
+
+# Highest number of integration nodes of gauss_legendre
+MAX_QUADRATURE_ORDER: int = 5
+
+
+def element_coordinates(elements: List[Element]) -> np.ndarray:
+    """
+    Collects the coordinates of the nodes of all elements into one array.
+
+    Args:
+        elements (list[Element]): Finite elements of the grid
+
+    Returns:
+        np.ndarray: Array of shape (n_elements, 4, 2) with (x, y) of every node
+    """
+    return np.array([[(node.x, node.y) for node in element.connected_nodes] for element in elements],
+                    dtype=np.float64).reshape(-1, 4, 2)
+
+
+def reference_tables(no_int_nodes: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Returns the cached tables of the universal element as arrays.
+
+    Args:
+        no_int_nodes (int): Number of integration nodes in each direction
+
+    Returns:
+        tuple: N values (P, 4), dN/dksi (P, 4), dN/deta (P, 4) and weights (P,)
+               at the P = no_int_nodes² integration points
+    """
+    tables = get_reference_tables(no_int_nodes)
+    return tables.n_values, tables.dn_dksi, tables.dn_deta, tables.weights
+
+
+def batch_matrix_h(coords: np.ndarray, conductivity: float, no_int_nodes: int = no_integration_nodes) -> np.ndarray:
+    """
+    Calculates the local H matrices of all elements at once (equivalent of MatrixH).
+
+    Args:
+        coords (np.ndarray): Coordinates of the nodes, shape (E, 4, 2)
+        conductivity (float): Thermal conductivity coefficient
+        no_int_nodes (int): Number of integration nodes in each direction
+
+    Returns:
+        np.ndarray: Stacked H matrices of shape (E, 4, 4)
+    """
+    coords = np.asarray(coords, dtype=np.float64).reshape(-1, 4, 2)
+    weights = get_reference_tables(no_int_nodes).weights
+
+    # Derivatives of the shape functions in the physical coordinates, shape (E, P, 4)
+    dn_dx, dn_dy, det_j = batch_shape_gradients(coords, no_int_nodes)
+
+    scale = conductivity * det_j * weights
+    return (np.einsum('epi,epj,ep->eij', dn_dx, dn_dx, scale) +
+            np.einsum('epi,epj,ep->eij', dn_dy, dn_dy, scale))
+
+
+def batch_matrix_c(coords: np.ndarray, specific_heat: float, density: float,
+                   no_int_nodes: int = no_integration_nodes) -> np.ndarray:
+    """
+    Calculates the local C matrices of all elements at once (equivalent of MacierzC).
+
+    Args:
+        coords (np.ndarray): Coordinates of the nodes, shape (E, 4, 2)
+        specific_heat (float): Specific heat of the material [J/(kg·K)]
+        density (float): Material density [kg/m³]
+        no_int_nodes (int): Number of integration nodes in each direction
+
+    Returns:
+        np.ndarray: Stacked C matrices of shape (E, 4, 4)
+    """
+    coords = np.asarray(coords, dtype=np.float64).reshape(-1, 4, 2)
+    n_values, dn_dksi, dn_deta, weights = reference_tables(no_int_nodes)
+    det_j = batch_jacobians(coords, dn_dksi, dn_deta)[4]
+    scale = specific_heat * density * det_j * weights
+    return np.einsum('pi,pj,ep->eij', n_values, n_values, scale)
+
+
+# Relative length of the bilinear term x1 - x2 + x3 - x4 below which an element is treated as affine
+AFFINE_TOLERANCE: float = 1e-12
+
+# Rounding error of the bilinear term in units of the precision of the largest coordinate of the element
+AFFINE_ROUNDING: float = 4.0
+
+
+def affine_elements(coords: np.ndarray, tolerance: float = AFFINE_TOLERANCE,
+                    precision: Optional[float] = None) -> np.ndarray:
+    """
+    Detects the affine elements (parallelograms, including rectangles and squares).
+    The mapping of the element is x(ksi, eta) = x0 + a ksi + b eta + h ksi eta with
+    h = (x1 - x2 + x3 - x4) / 4, so the element is affine (constant Jacobian) when h vanishes.
+    The coordinates are known only to their precision, so h below the rounding error of the
+    largest coordinate (AFFINE_ROUNDING * precision * max|x|) also counts as zero - otherwise
+    parallelograms far from the origin or given in single precision would be missed.
+
+    Args:
+        coords (np.ndarray): Coordinates of the nodes, shape (E, 4, 2)
+        tolerance (float): Allowed length of h relative to the diagonals of the element
+        precision (float, optional): Relative precision of the coordinates
+                                     (machine epsilon of the dtype of coords by default)
+
+    Returns:
+        np.ndarray: (E,) True for affine elements
+    """
+    coords = np.asarray(coords)
+    if precision is None:
+        precision = float(np.finfo(coords.dtype if coords.dtype.kind == "f" else np.float64).eps)
+    coords = coords.astype(np.float64, copy=False).reshape(-1, 4, 2)
+    bilinear = coords[:, 0] - coords[:, 1] + coords[:, 2] - coords[:, 3]
+    size = np.hypot(*(coords[:, 2] - coords[:, 0]).T) + np.hypot(*(coords[:, 3] - coords[:, 1]).T)
+    rounding = AFFINE_ROUNDING * precision * np.abs(coords).max(axis=(1, 2), initial=0.0)
+    return np.hypot(*bilinear.T) <= tolerance * size + rounding
+
+
+@lru_cache(maxsize=None)
+def affine_reference_matrices() -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Integrals over the reference element of the products of the shape functions and their derivatives.
+    The integrands are polynomials of degree 2 in each direction, so the 2-point rule gives them exactly.
+
+    Returns:
+        tuple: ∫ dN/dksi dN/dksiᵀ, ∫ (dN/dksi dN/detaᵀ + dN/deta dN/dksiᵀ), ∫ dN/deta dN/detaᵀ
+               and ∫ N Nᵀ, each of shape (4, 4)
+    """
+    n_values, dn_dksi, dn_deta, weights = reference_tables(2)
+    ksi_ksi = np.einsum('p,pi,pj->ij', weights, dn_dksi, dn_dksi)
+    ksi_eta = np.einsum('p,pi,pj->ij', weights, dn_dksi, dn_deta)
+    eta_eta = np.einsum('p,pi,pj->ij', weights, dn_deta, dn_deta)
+    n_n = np.einsum('p,pi,pj->ij', weights, n_values, n_values)
+    matrices = (ksi_ksi, ksi_eta + ksi_eta.T, eta_eta, n_n)
+    for matrix in matrices:
+        matrix.setflags(write=False)
+    return matrices
+
+
+def batch_affine(coords: np.ndarray, conductivity: float, specific_heat: float,
+                 density: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Calculates the H and C matrices of affine (parallelogram) elements in closed form.
+    The Jacobian is constant, with rows a = dx/dksi and b = dx/deta, so
+        [H] = k / detJ · (|b|² Kξξ - (a·b) (Kξη + Kηξ) + |a|² Kηη)
+        [C] = c ρ detJ · M
+    where Kξξ, Kξη, Kηη and M are the constant matrices of affine_reference_matrices -
+    no integration points, inverse Jacobians or per-point matrices are needed.
+
+    Args:
+        coords (np.ndarray): Coordinates of the nodes of affine elements, shape (E, 4, 2)
+        conductivity (float): Thermal conductivity coefficient
+        specific_heat (float): Specific heat of the material [J/(kg·K)]
+        density (float): Material density [kg/m³]
+
+    Returns:
+        tuple: Stacked H and C matrices, each of shape (E, 4, 4)
+    """
+    coords = np.asarray(coords, dtype=np.float64).reshape(-1, 4, 2)
+    ksi_ksi, ksi_eta, eta_eta, n_n = affine_reference_matrices()
+    a = (-coords[:, 0] + coords[:, 1] + coords[:, 2] - coords[:, 3]) / 4
+    b = (-coords[:, 0] - coords[:, 1] + coords[:, 2] + coords[:, 3]) / 4
+    det_j = a[:, 0] * b[:, 1] - a[:, 1] * b[:, 0]
+
+    factors = np.stack([np.einsum('ek,ek->e', b, b), -np.einsum('ek,ek->e', a, b), np.einsum('ek,ek->e', a, a)],
+                       axis=1) * (conductivity / det_j)[:, None]
+    h_matrices = factors @ np.stack([ksi_ksi, ksi_eta, eta_eta]).reshape(3, 16)
+    c_matrices = np.multiply.outer(specific_heat * density * det_j, n_n)
+    return h_matrices.reshape(-1, 4, 4), c_matrices
+
+
+def jacobian_variation(coords: np.ndarray) -> np.ndarray:
+    """
+    Calculates the distortion of the elements as the relative variation of detJ across the element.
+    detJ of a bilinear element is linear in ksi and eta, so its extremes are in the corners,
+    where it is proportional to the cross product of the two walls meeting there.
+    Parallelograms (and rectangles) have constant detJ - variation 0.
+
+    Args:
+        coords (np.ndarray): Coordinates of the nodes, shape (E, 4, 2)
+
+    Returns:
+        np.ndarray: (E,) half of the range of detJ divided by its mean
+    """
+    coords = np.asarray(coords, dtype=np.float64).reshape(-1, 4, 2)
+    following = np.roll(coords, -1, axis=1) - coords
+    preceding = np.roll(coords, 1, axis=1) - coords
+    corner_det_j = following[..., 0] * preceding[..., 1] - following[..., 1] * preceding[..., 0]
+    return (corner_det_j.max(axis=1) - corner_det_j.min(axis=1)) / (2 * np.abs(corner_det_j.mean(axis=1)))
+
+
+def quadrature_error(variation: np.ndarray, order: int) -> np.ndarray:
+    """
+    Estimates the relative error of the H matrix of an n-point rule from the relative variation d of detJ:
+    d^(2(n-1)) / 10 (an upper envelope measured on randomly distorted elements).
+
+    Args:
+        variation (np.ndarray): (E,) relative variation of detJ (see jacobian_variation)
+        order (int): Number of integration nodes in each direction
+
+    Returns:
+        np.ndarray: (E,) estimated relative error of the H matrix
+    """
+    return variation ** (2 * (order - 1)) / 10
+
+
+def quadrature_orders(coords: np.ndarray, tolerance: float, min_order: int = 2,
+                      max_order: int = MAX_QUADRATURE_ORDER) -> np.ndarray:
+    """
+    Chooses the number of integration nodes of the H matrix of every element - the lowest order
+    whose error estimate (see quadrature_error) meets the tolerance: 2 for parallelograms,
+    up to max_order for strongly distorted elements. Elements needing more than max_order
+    get max_order, so their error may stay above the tolerance.
+
+    Args:
+        coords (np.ndarray): Coordinates of the nodes, shape (E, 4, 2)
+        tolerance (float): Allowed relative error of the H matrix (accuracy floor)
+        min_order (int): Lowest number of integration nodes
+        max_order (int): Highest number of integration nodes
+
+    Returns:
+        np.ndarray: (E,) number of integration nodes in each direction
+    """
+    variation = jacobian_variation(coords)
+    orders = np.full(len(variation), max_order, dtype=np.int64)
+    for order in range(max_order - 1, min_order - 1, -1):
+        orders[quadrature_error(variation, order) <= tolerance] = order
+    return orders
+
+
+def batch_matrix_h_orders(coords: np.ndarray, conductivity: float, orders: np.ndarray) -> np.ndarray:
+    """
+    Calculates the local H matrices of all elements, each with its own number of integration nodes.
+
+    Args:
+        coords (np.ndarray): Coordinates of the nodes, shape (E, 4, 2)
+        conductivity (float): Thermal conductivity coefficient
+        orders (np.ndarray): (E,) number of integration nodes of every element (see quadrature_orders)
+
+    Returns:
+        np.ndarray: Stacked H matrices of shape (E, 4, 4)
+    """
+    coords = np.asarray(coords, dtype=np.float64).reshape(-1, 4, 2)
+    h_matrices = np.empty((len(coords), 4, 4))
+    for order in np.unique(orders):
+        selected = orders == order
+        h_matrices[selected] = batch_matrix_h(coords[selected], conductivity, int(order))
+    return h_matrices
+
+
+@lru_cache(maxsize=None)
+def edge_reference_integrals(no_int_nodes: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Integrals of the shape functions over the walls of the reference element (per unit detJ).
+
+    Args:
+        no_int_nodes (int): Number of integration nodes on a wall
+
+    Returns:
+        tuple: Σ w N Nᵀ of every wall (4, 4, 4) and Σ w N of every wall (4, 4)
+    """
+    tables = get_reference_tables(no_int_nodes)
+    n_values = tables.edge_n_values
+    n_n = np.einsum('p,wpi,wpj->wij', tables.edge_weights, n_values, n_values)
+    n_sum = np.einsum('p,wpi->wi', tables.edge_weights, n_values)
+    n_n.setflags(write=False)
+    n_sum.setflags(write=False)
+    return n_n, n_sum
+
+
+def batch_surface(coords: np.ndarray, edge_elements: np.ndarray, edge_walls: np.ndarray, alfa: float,
+                  ambient_temp: float, no_int_nodes: int = no_integration_nodes) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Calculates the HBC matrices and P vectors of all elements at once from the list of walls
+    with the boundary condition (equivalent of MacierzHBC and WektorP).
+    Both come from the same integrals of the shape functions over the wall - HBC uses N Nᵀ,
+    P uses N scaled by the ambient temperature - and detJ of a wall is half of its length.
+
+    Args:
+        coords (np.ndarray): Coordinates of the nodes, shape (E, 4, 2)
+        edge_elements (np.ndarray): (m,) index (into coords) of the element owning each wall
+        edge_walls (np.ndarray): (m,) local number of each wall (0 - bottom, 1 - right, 2 - top, 3 - left)
+        alfa (float): Heat exchange coefficient [W/(m²·K)]
+        ambient_temp (float): Ambient temperature [°C]
+        no_int_nodes (int): Number of integration nodes on a wall
+
+    Returns:
+        tuple: HBC matrices (E, 4, 4) and P vectors (E, 4)
+    """
+    coords = np.asarray(coords, dtype=np.float64).reshape(-1, 4, 2)
+    edge_elements = np.asarray(edge_elements, dtype=np.int64)
+    edge_walls = np.asarray(edge_walls, dtype=np.int64)
+    n_n, n_sum = edge_reference_integrals(no_int_nodes)
+
+    edge_nodes = np.array(EDGE_NODES)[edge_walls]                       # (m, 2)
+    start = coords[edge_elements, edge_nodes[:, 0]]
+    end = coords[edge_elements, edge_nodes[:, 1]]
+    det_j = 0.5 * np.hypot(*(end - start).T)                             # (m,)
+
+    hbc = np.zeros((len(coords), 4, 4))
+    p = np.zeros((len(coords), 4))
+    np.add.at(hbc, edge_elements, (alfa * det_j)[:, None, None] * n_n[edge_walls])
+    np.add.at(p, edge_elements, (alfa * ambient_temp * det_j)[:, None] * n_sum[edge_walls])
+    return hbc, p
@@ -0,0 +1,171 @@
+import numpy as np
+from typing import List, Optional, Tuple
+from mes.classes.Node import Node
+from mes.classes.Element import Element
+from mes.macierz.UniversalElement import EDGE_NODES, get_reference_tables
+
+
+def calculate_distance(node1: Node, node2: Node) -> float:
+    x1 = node1.x
+    y1 = node1.y
+
+    x2 = node2.x
+    y2 = node2.y
+
+    distance = ((x2 - x1) ** 2 + (y2 - y1) ** 2) ** 0.5
+    return distance
+
+
+def powierzchnie_bc(element: Element) -> List[int]:
+    """
+    Identifies the surfaces of the element with boundary conditions.
+
+    Args:
+        element (Element): Finite element to analyze
+
+    Returns:
+        list[int]: List of 4 values specifying the boundary conditions on each side
+                  (0 - no boundary condition, >0 - boundary condition)
+    """
+    # Initialization of arrays of boundary conditions for nodes and surfaces
+    punkty_z_bc = [0,  # point 0 (First point in element ->  Bottom left)
+                   0,  # point 1 (Node with MaxID - 1  ->  Bottom right)
+                   0,  # point 2 (Node with MinID      ->  Top right)
+                   0]  # point 3 (Node with MinID + 1  ->  Top left)
+
+    powierzchnie_z_bc = [0,  # wall 0 (Between Node 0 and Node 1 ->  Bottom wall)
+                         0,  # wall 1 (Between Node 1 and Node 2 ->  Right wall)
+                         0,  # wall 2 (Between Node 2 and Node 3 ->  Top wall)
+                         0]  # wall 3 (Between Node 3 and Node 0 -> Left wall)
+
+    # Checking the boundary conditions in the nodes
+    if element.connected_nodes[0].BC > 0:                        # point 0 bottom left
+        punkty_z_bc[0] = element.connected_nodes[0].BC
+
+    if element.connected_nodes[1].BC > 0:                        # point 1
+        punkty_z_bc[1] = element.connected_nodes[1].BC
+
+    if element.connected_nodes[2].BC > 0:                        # point 2
+        punkty_z_bc[2] = element.connected_nodes[2].BC
+
+    if element.connected_nodes[3].BC > 0:                        # point 3
+        punkty_z_bc[3] = element.connected_nodes[3].BC
+
+    # Identifying surfaces with boundary conditions
+    # A surface has a boundary condition if both its nodes have the same condition
+    if punkty_z_bc[0] > 0 and punkty_z_bc[0] == punkty_z_bc[1]:     # wall 0 *bottom* (node 0,1)
+        powierzchnie_z_bc[0] = punkty_z_bc[0]
+
+    if punkty_z_bc[1] > 0 and punkty_z_bc[1] == punkty_z_bc[2]:     # wall 1 *right* (node 1,2)
+        powierzchnie_z_bc[1] = punkty_z_bc[1]
+
+    if punkty_z_bc[2] > 0 and punkty_z_bc[2] == punkty_z_bc[3]:     # wall 2 *top* (node 2,3)
+        powierzchnie_z_bc[2] = punkty_z_bc[2]
+
+    if punkty_z_bc[3] > 0 and punkty_z_bc[3] == punkty_z_bc[0]:     # wall 3 *left* (node 3,0)
+        powierzchnie_z_bc[3] = punkty_z_bc[3]
+
+    return powierzchnie_z_bc
+
+
+def batch_jacobians(coords: np.ndarray, dn_dksi: np.ndarray, dn_deta: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Calculates the Jacobian entries of all elements at all integration points.
+
+    Args:
+        coords (np.ndarray): Coordinates of the nodes, shape (E, 4, 2)
+        dn_dksi (np.ndarray): Derivatives of the shape functions with respect to ksi, shape (P, 4)
+        dn_deta (np.ndarray): Derivatives of the shape functions with respect to eta, shape (P, 4)
+
+    Returns:
+        tuple: dx/dksi, dx/deta, dy/dksi, dy/deta and det(J), each of shape (E, P)
+    """
+    x = coords[:, :, 0]
+    y = coords[:, :, 1]
+    dx_dksi = x @ dn_dksi.T
+    dx_deta = x @ dn_deta.T
+    dy_dksi = y @ dn_dksi.T
+    dy_deta = y @ dn_deta.T
+    det_j = dx_dksi * dy_deta - dx_deta * dy_dksi
+    return dx_dksi, dx_deta, dy_dksi, dy_deta, det_j
+
+
+def batch_shape_gradients(coords: np.ndarray, no_int_nodes: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Calculates the derivatives of the shape functions in the physical coordinates
+    for all elements at all integration points.
+
+    Args:
+        coords (np.ndarray): Coordinates of the nodes, shape (E, 4, 2)
+        no_int_nodes (int): Number of integration nodes in each direction
+
+    Returns:
+        tuple: dN/dx (E, P, 4), dN/dy (E, P, 4) and det(J) (E, P)
+    """
+    tables = get_reference_tables(no_int_nodes)
+    dx_dksi, dx_deta, dy_dksi, dy_deta, det_j = batch_jacobians(coords, tables.dn_dksi, tables.dn_deta)
+    inverse_det = 1 / det_j[:, :, None]
+    dn_dx = (dy_deta[:, :, None] * tables.dn_dksi - dy_dksi[:, :, None] * tables.dn_deta) * inverse_det
+    dn_dy = (dx_dksi[:, :, None] * tables.dn_deta - dx_deta[:, :, None] * tables.dn_dksi) * inverse_det
+    return dn_dx, dn_dy, det_j
+
+
+class ElementGeometry:
+    """
+    Class storing the geometric data of one finite element for a given quadrature order.
+    Computed once per element and shared by the H, C, HBC and P builders, so the Jacobian
+    of every integration point and the lengths of the walls are evaluated only once.
+    """
+
+    def __init__(self, element: Element, no_int_nodes: int):
+        """
+        Initialization and calculation of the geometry of the element.
+
+        Args:
+            element (Element): Finite element
+            no_int_nodes (int): Number of integration nodes in each direction
+        """
+        self.element: Element = element
+        self.no_int_nodes: int = no_int_nodes
+        tables = get_reference_tables(no_int_nodes)
+        coords = np.array([(node.x, node.y) for node in element.connected_nodes], dtype=np.float64)
+
+        dx_dksi, dx_deta, dy_dksi, dy_deta, det_j = batch_jacobians(coords[None], tables.dn_dksi, tables.dn_deta)
+
+        # Jacobian matrices [[dx/dksi, dx/deta], [dy/dksi, dy/deta]] at every integration point, shape (P, 2, 2)
+        self.jacobians: np.ndarray = np.stack([np.stack([dx_dksi[0], dx_deta[0]], axis=-1),
+                                               np.stack([dy_dksi[0], dy_deta[0]], axis=-1)], axis=-2)
+        self.det_j: np.ndarray = det_j[0]
+
+        # Matrices used to get the physical derivatives: [[dy/deta, -dy/dksi], [-dx/deta, dx/dksi]] / det(J)
+        inverse_det = 1 / self.det_j
+        self.inverse_jacobians: np.ndarray = np.stack([
+            np.stack([dy_deta[0], -dy_dksi[0]], axis=-1),
+            np.stack([-dx_deta[0], dx_dksi[0]], axis=-1)], axis=-2) * inverse_det[:, None, None]
+
+        # Derivatives of the shape functions with respect to x and y, shape (P, 4)
+        self.dn_dx: np.ndarray = (self.inverse_jacobians[:, 0, 0, None] * tables.dn_dksi +
+                                  self.inverse_jacobians[:, 0, 1, None] * tables.dn_deta)
+        self.dn_dy: np.ndarray = (self.inverse_jacobians[:, 1, 0, None] * tables.dn_dksi +
+                                  self.inverse_jacobians[:, 1, 1, None] * tables.dn_deta)
+
+        # Walls: boundary conditions and lengths
+        self.boundary_walls, self.edge_lengths = ElementGeometry.walls_of(element)
+
+    @staticmethod
+    def walls_of(element: Element, geometry: Optional['ElementGeometry'] = None) -> Tuple[List[int], List[float]]:
+        """
+        Returns the boundary condition and the length of every wall of the element - taken from
+        the shared geometry when it is given, so the surface builders need no Jacobians of their own.
+
+        Args:
+            element (Element): Finite element
+            geometry (ElementGeometry, optional): Precomputed geometry of the element
+
+        Returns:
+            tuple: Boundary condition of each wall (see powierzchnie_bc) and the lengths of the walls
+        """
+        if geometry is not None:
+            return geometry.boundary_walls, geometry.edge_lengths
+        return powierzchnie_bc(element), [calculate_distance(element.connected_nodes[a], element.connected_nodes[b])
+                                          for a, b in EDGE_NODES]
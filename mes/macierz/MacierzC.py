@@ -1,13 +1,14 @@
 from mes.macierz.WektorP import N1, N2, N3, N4
-from mes.macierz.MacierzH import no_integration_nodes, JacobianMatrix
-from mes.macierz.UniversalElement import UniversalElement
+from mes.macierz.MacierzH import no_integration_nodes
+from mes.macierz.UniversalElement import get_universal_element
+from mes.macierz.GeometriaElementu import ElementGeometry
 from mes.classes.Node import Node
 from mes.classes.Element import Element
 from tabulate import tabulate
-from typing import List
+from typing import List, Optional
 
 # Initialization of the universal element for a given number of integration nodes
-el = UniversalElement(no_integration_nodes)
+el = get_universal_element(no_integration_nodes)
 
 # Definition of the test finite element nodes
 n1 = Node(1, 0, 0, 1)          # Lower left node
@@ -29,7 +30,8 @@ class MacierzC:
     Calculates the matrix of thermal capacity for a four-node finite element.
     """
     
-    def __init__(self, specific_heat: float, density: float, element: Element):
+    def __init__(self, specific_heat: float, density: float, element: Element,
+                 geometry: Optional[ElementGeometry] = None):
         """
         Initialization and calculation of the matrix of thermal capacity.
         
@@ -37,33 +39,38 @@ class MacierzC:
             specific_heat (float): Specific heat of the material [J/(kg·K)]
             density (float): Material density [kg/m³]
             element (Element): Finite element for which the matrix is calculated
+            geometry (ElementGeometry, optional): Precomputed geometry of the element - its number
+                                                  of integration nodes is used (no_integration_nodes otherwise)
         """
+        no_int_nodes = geometry.no_int_nodes if geometry is not None else no_integration_nodes
+        universal = get_universal_element(no_int_nodes)
+        self.no_int_nodes: int = no_int_nodes
+
         # Initialization of the array of shape functions for all integration points
-        self.n_functions: List[List[float]] = [[0] * 4 for _ in range(no_integration_nodes ** 2)]
+        self.n_functions: List[List[float]] = [[0] * 4 for _ in range(no_int_nodes ** 2)]
         self.c_matrices: List[List[List[float]]] = []  # List of C matrices for each integration point
         self.element: Element = element
 
         # Calculation of the shape function values at the integration points
-        for i in range(no_integration_nodes ** 2):
-            self.n_functions[i][0] = N1(el.integration_points[i].x, el.integration_points[i].y)
-            self.n_functions[i][1] = N2(el.integration_points[i].x, el.integration_points[i].y)
-            self.n_functions[i][2] = N3(el.integration_points[i].x, el.integration_points[i].y)
-            self.n_functions[i][3] = N4(el.integration_points[i].x, el.integration_points[i].y)
-
-        # Calculation of the Jacobian determinants for each integration point
-        self.jacobian_determinants: List[float] = []
-        for i in range(no_integration_nodes ** 2):
-            temporary_jacobian = JacobianMatrix(element, no_integration_nodes, i)
-            self.jacobian_determinants.append(temporary_jacobian.detJ)
+        for i in range(no_int_nodes ** 2):
+            self.n_functions[i][0] = N1(universal.integration_points[i].x, universal.integration_points[i].y)
+            self.n_functions[i][1] = N2(universal.integration_points[i].x, universal.integration_points[i].y)
+            self.n_functions[i][2] = N3(universal.integration_points[i].x, universal.integration_points[i].y)
+            self.n_functions[i][3] = N4(universal.integration_points[i].x, universal.integration_points[i].y)
+
+        # Jacobian determinants for each integration point
+        if geometry is None:
+            geometry = ElementGeometry(element, no_int_nodes)
+        self.jacobian_determinants: List[float] = geometry.det_j.tolist()
 
         # Getting the integration weights from the universal element
         self.weights: List[float] = []
-        for weight in range(len(el.weights)):
-            tmp = el.weights[weight]
+        for weight in range(len(universal.weights)):
+            tmp = universal.weights[weight]
             self.weights.append(tmp)
 
         # Calculation of the C matrix for each integration point
-        for i in range(no_integration_nodes ** 2):
+        for i in range(no_int_nodes ** 2):
             matrix_c_temp: List[List[float]] = [[0] * 4 for _ in range(4)]
 
             for row in range(4):
@@ -101,7 +108,7 @@ class MacierzC:
         """
         Displays the values of the shape functions at all integration points.
         """
-        for i in range(no_integration_nodes ** 2):
+        for i in range(self.no_int_nodes ** 2):
             for j in range(4):
                 value = self.n_functions[i][j]
                 print(f"{value: .6f}", end="\t")
@@ -1,8 +1,9 @@
 from mes.classes.Node import Node
-from mes.macierz.UniversalElement import UniversalElement
+from mes.macierz.UniversalElement import get_universal_element
+from mes.macierz.GeometriaElementu import ElementGeometry
 from mes.classes.Element import Element
 from tabulate import tabulate
-from typing import List
+from typing import List, Optional
 
 no_integration_nodes: int = 4  # Number of integration nodes
 
@@ -17,7 +18,7 @@ elem.addNode(n2)
 elem.addNode(n3)
 elem.addNode(n4)
 
-_universal = UniversalElement(no_integration_nodes)
+_universal = get_universal_element(no_integration_nodes)
 ksi = _universal.ksi_derivatives  # Derivatives of the shape functions with respect to ksi
 eta = _universal.eta_derivatives  # Derivatives of the shape functions with respect to eta
 
@@ -33,11 +34,11 @@ def dx_dksi(element: Element, no_nodes: int, integration_point: int) -> float:
     Returns:
         float: Value of the derivative dx/dksi
     """
-    temp = UniversalElement(no_nodes)
+    derivatives = get_universal_element(no_nodes).ksi_derivatives
     result = 0.0
     temporary = 0.0
     for i in range(len(element.connected_nodes)):
-        temporary = element.connected_nodes[i].x * ksi[i][integration_point]
+        temporary = element.connected_nodes[i].x * derivatives[i][integration_point]
         result += temporary
     return result
 
@@ -51,10 +52,10 @@ def dy_dksi(element: Element, no_nodes: int, integration_point: int) -> float:
         no_nodes (int): Number of integration nodes
         integration_point (int): Integration point number
     """
-    temp = UniversalElement(no_nodes)
+    derivatives = get_universal_element(no_nodes).ksi_derivatives
     result = 0.0
     for i in range(len(element.connected_nodes)):
-        temporary = element.connected_nodes[i].y * ksi[i][integration_point]
+        temporary = element.connected_nodes[i].y * derivatives[i][integration_point]
         result += temporary
     return result
 
@@ -67,10 +68,10 @@ def dx_deta(element: Element, no_nodes: int, integration_point: int) -> float:
         no_nodes (int): Number of integration nodes
         integration_point (int): Integration point number
     """
-    temp = UniversalElement(no_nodes)
+    derivatives = get_universal_element(no_nodes).eta_derivatives
     result = 0.0
     for i in range(len(element.connected_nodes)):
-        temporary = element.connected_nodes[i].x * eta[i][integration_point]
+        temporary = element.connected_nodes[i].x * derivatives[i][integration_point]
         result += temporary
     return result
 
@@ -83,10 +84,10 @@ def dy_deta(element: Element, no_nodes: int, integration_point: int) -> float:
         no_nodes (int): Number of integration nodes
         integration_point (int): Integration point number
     """
-    temp = UniversalElement(no_nodes)
+    derivatives = get_universal_element(no_nodes).eta_derivatives
     result = 0.0
     for i in range(len(element.connected_nodes)):
-        temporary = element.connected_nodes[i].y * eta[i][integration_point]
+        temporary = element.connected_nodes[i].y * derivatives[i][integration_point]
         result += temporary
     return result
 
@@ -151,38 +152,23 @@ class dNi_dX:
     Class calculating the derivatives of the shape functions with respect to x.
     """
     
-    def __init__(self, element: Element, no_nodes: int):
+    def __init__(self, element: Element, no_nodes: int, geometry: Optional[ElementGeometry] = None):
         """
         Initialization and calculation of the derivatives of the shape functions with respect to x.
         
         Args:
             element (Element): Finite element
             no_nodes (int): Number of integration nodes
+            geometry (ElementGeometry, optional): Precomputed geometry of the element
         """
         self.no_nodes: int = no_nodes
+        if geometry is None:
+            geometry = ElementGeometry(element, no_nodes)
 
-        cols = no_nodes ** 2
-        rows = 4
-        self.j_matrices: List[JacobianMatrix] = [None for _ in range(cols)]
-        self.j_matrices_ready: List[List[List[float]]] = [None for _ in range(cols)]
-        self.matrix: List[List[float]] = [[None for _ in range(cols)] for _ in range(rows)]
-
-        for i in range(cols):
-            temp = JacobianMatrix(element, no_nodes, i)
-            self.j_matrices[i] = temp
-
-        for i in range(cols):
-            temp = self.j_matrices[i].get_matrix_ready_for_DNi()
-            self.j_matrices_ready[i] = temp.get_matrix()
-
-        for integration_point in range(cols):
-            jacobian_matrix = self.j_matrices_ready[integration_point]
-            for shape_function in range(rows):
-                result = (
-                        jacobian_matrix[0][0] * ksi[shape_function][integration_point] +
-                        jacobian_matrix[0][1] * eta[shape_function][integration_point]
-                )
-                self.matrix[shape_function][integration_point] = result
+        # Jacobian matrices and the matrices ready for dN/dX are taken from the shared geometry
+        self.j_matrices: List[List[List[float]]] = geometry.jacobians.tolist()
+        self.j_matrices_ready: List[List[List[float]]] = geometry.inverse_jacobians.tolist()
+        self.matrix: List[List[float]] = geometry.dn_dx.T.tolist()
 
     def print_matrix(self) -> None:
         print("Matrix dN/dX:")
@@ -207,41 +193,23 @@ class dNi_dY:
     Class calculating the derivatives of the shape functions with respect to y.
     """
     
-    def __init__(self, element: Element, no_nodes: int):
+    def __init__(self, element: Element, no_nodes: int, geometry: Optional[ElementGeometry] = None):
         """
         Initialization and calculation of the derivatives of the shape functions with respect to y.
         
         Args:
             element (Element): Finite element
             no_nodes (int): Number of integration nodes
+            geometry (ElementGeometry, optional): Precomputed geometry of the element
         """
         self.no_nodes: int = no_nodes
+        if geometry is None:
+            geometry = ElementGeometry(element, no_nodes)
 
-        cols = no_nodes ** 2
-        rows = 4
-        self.j_matrices: List[List[List[float]]] = []
-        self.j_matrices_copy: List[JacobianMatrix] = [None for _ in range(cols)]
-        self.j_matrices_ready: List[List[List[float]]] = [None for _ in range(cols)]
-        self.matrix: List[List[float]] = [[None for _ in range(cols)] for _ in range(rows)]
-
-        for i in range(cols):
-            temp1 = JacobianMatrix(element, no_nodes, i)
-            temp2 = JacobianMatrix(element, no_nodes, i)
-            self.j_matrices.append(temp1.get_matrix())
-            self.j_matrices_copy[i] = temp2
-
-        for i in range(cols):
-            temp = self.j_matrices_copy[i].get_matrix_ready_for_DNi()
-            self.j_matrices_ready[i] = temp.get_matrix()
-
-        for integration_point in range(cols):
-            jacobian_matrix = self.j_matrices_ready[integration_point]
-            for shape_function in range(rows):
-                result = (
-                        jacobian_matrix[1][0] * ksi[shape_function][integration_point] +
-                        jacobian_matrix[1][1] * eta[shape_function][integration_point]
-                )
-                self.matrix[shape_function][integration_point] = result
+        # Jacobian matrices and the matrices ready for dN/dY are taken from the shared geometry
+        self.j_matrices: List[List[List[float]]] = geometry.jacobians.tolist()
+        self.j_matrices_ready: List[List[List[float]]] = geometry.inverse_jacobians.tolist()
+        self.matrix: List[List[float]] = geometry.dn_dy.T.tolist()
 
     def print_matrix(self) -> None:
         print("Matrix dN/dY:")
@@ -275,7 +243,7 @@ class TransposedMatrix:
     Class implementing the transposed matrix and operations on it.
     """
     
-    def __init__(self, elem_: Element, no_nodes: int, k_value: float):
+    def __init__(self, elem_: Element, no_nodes: int, k_value: float, geometry: Optional[ElementGeometry] = None):
         """
         Initialization and calculation of the transposed matrix.
         
@@ -283,9 +251,12 @@ class TransposedMatrix:
             elem_ (Element): Finite element
             no_nodes (int): Number of integration nodes
             k_value (float): Thermal conductivity coefficient
+            geometry (ElementGeometry, optional): Precomputed geometry of the element
         """
-        self.temp_dx = dNi_dX(elem_, no_nodes)
-        self.temp_dy = dNi_dY(elem_, no_nodes)
+        if geometry is None:
+            geometry = ElementGeometry(elem_, no_nodes)
+        self.temp_dx = dNi_dX(elem_, no_nodes, geometry)
+        self.temp_dy = dNi_dY(elem_, no_nodes, geometry)
         self.no_nodes: int = no_nodes
         self.n_matrices: int = no_nodes ** 2
         self.rows: int = 4
@@ -293,11 +264,7 @@ class TransposedMatrix:
         self.matricesX: List[List[List[float]]] = []
         self.matricesY: List[List[List[float]]] = []
         self.matricesSum: List[List[List[float]]] = []
-        self.jacobian_determinants: List[float] = []
-
-        for i in range(no_nodes ** 2):
-            temporary_jacobian = JacobianMatrix(elem_, no_nodes, i)
-            self.jacobian_determinants.append(temporary_jacobian.detJ)
+        self.jacobian_determinants: List[float] = geometry.det_j.tolist()
 
         for col in range(self.cols):
             matrix_x = self.calculateMatrixX(col)
@@ -371,7 +338,7 @@ class MatrixH:
     Class implementing the matrix H (heat conduction).
     """
     
-    def __init__(self, _elem: Element, no_nodes: int, k: float):
+    def __init__(self, _elem: Element, no_nodes: int, k: float, geometry: Optional[ElementGeometry] = None):
         """
         Initialization and calculation of the matrix H.
         
@@ -379,13 +346,15 @@ class MatrixH:
             _elem (Element): Finite element
             no_nodes (int): Number of integration nodes
             k (float): Thermal conductivity coefficient
+            geometry (ElementGeometry, optional): Precomputed geometry of the element
+                                                  (shared with the C, HBC and P builders)
         """
         self.element: Element = _elem
-        self.matrices: TransposedMatrix = TransposedMatrix(_elem, no_nodes, k)
+        self.matrices: TransposedMatrix = TransposedMatrix(_elem, no_nodes, k, geometry)
         self.k: float = k
         self.matrices_with_weights: List[List[List[float]]] = []
 
-        universal_el = UniversalElement(no_nodes)
+        universal_el = get_universal_element(no_nodes)
         self.weights: List[float] = []
         for weight in range(len(universal_el.weights)):
             tmp = universal_el.weights[weight]
@@ -1,6 +1,9 @@
-from typing import List
+import numpy as np
+from typing import List, Union
+from mes.macierz.MacierzRzadka import MacierzRzadka
 
-def sum_matrices(c_matrix_total: List[List[float]], h_matrix_total: List[List[float]]) -> List[List[float]]:
+def sum_matrices(c_matrix_total: Union[List[List[float]], MacierzRzadka],
+                 h_matrix_total: Union[List[List[float]], MacierzRzadka]) -> Union[List[List[float]], MacierzRzadka]:
     """
     Sums the global matrices C and H to form [C]/dτ + [H].
     Operation required in the finite difference method.
@@ -13,8 +16,12 @@ def sum_matrices(c_matrix_total: List[List[float]], h_matrix_total: List[List[fl
         list[list[float]]: Suma macierzy [C]/dτ + [H]
         
     Note:
-        Assumes that both matrices have the same dimensions (no_nodes x no_nodes)
+        Assumes that both matrices have the same dimensions (no_nodes x no_nodes).
+        Sparse (CSR) matrices are summed in O(nnz) and the result is also sparse.
     """
+    if isinstance(c_matrix_total, MacierzRzadka) and isinstance(h_matrix_total, MacierzRzadka):
+        return c_matrix_total.add(h_matrix_total)
+
     # Getting the size of the matrix (number of nodes)
     no_nodes = len(c_matrix_total)
     # Initializing the result matrix with zeros
@@ -42,6 +49,9 @@ def sum_vectors(c_multiplied: List[float], p_vector: List[float]) -> List[float]
     Note:
         Assumes that both vectors have the same length (no_nodes)
     """
+    if isinstance(c_multiplied, np.ndarray) or isinstance(p_vector, np.ndarray):
+        return np.add(c_multiplied, p_vector)
+
     # Getting the length of the vectors (number of nodes)
     no_nodes = len(c_multiplied)
     # Initializing the result vector with zeros
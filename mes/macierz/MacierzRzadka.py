@@ -0,0 +1,211 @@
+import numpy as np
+from typing import List, Sequence
+
+
+class MacierzRzadka:
+    """
+    Class implementing a sparse matrix in the compressed sparse row (CSR) format.
+    Used for the global matrices of the MES grid, where every row contains only
+    the couplings of a node with its neighbours, so memory grows with the number
+    of non-zero entries (nnz) instead of no_nodes².
+    """
+
+    def __init__(self, no_rows: int, no_cols: int, data: np.ndarray, indices: np.ndarray, indptr: np.ndarray):
+        """
+        Initialization of the sparse matrix from ready CSR arrays.
+
+        Args:
+            no_rows (int): Number of rows
+            no_cols (int): Number of columns
+            data (np.ndarray): Non-zero values, row by row
+            indices (np.ndarray): Column index of each value in data
+            indptr (np.ndarray): Offsets of the beginning of each row in data (length no_rows + 1)
+        """
+        self.no_rows: int = no_rows
+        self.no_cols: int = no_cols
+        self.data: np.ndarray = np.asarray(data, dtype=np.float64)
+        self.indices: np.ndarray = np.asarray(indices, dtype=np.int64)
+        self.indptr: np.ndarray = np.asarray(indptr, dtype=np.int64)
+        # Row index of every stored value, used by the vectorized matrix-vector product
+        self.row_of_entry: np.ndarray = np.repeat(np.arange(no_rows, dtype=np.int64), np.diff(self.indptr))
+
+    @classmethod
+    def from_triplets(cls, rows: np.ndarray, cols: np.ndarray, values: np.ndarray,
+                      no_rows: int, no_cols: int) -> 'MacierzRzadka':
+        """
+        Compresses COO triplets (row, col, value) into the CSR format.
+        Duplicated positions are summed, which is exactly the aggregation of local matrices.
+
+        Args:
+            rows (np.ndarray): Row indices (zero-based)
+            cols (np.ndarray): Column indices (zero-based)
+            values (np.ndarray): Values at the given positions
+            no_rows (int): Number of rows of the matrix
+            no_cols (int): Number of columns of the matrix
+
+        Returns:
+            MacierzRzadka: Matrix in the CSR format with sorted column indices
+        """
+        rows = np.asarray(rows, dtype=np.int64).ravel()
+        cols = np.asarray(cols, dtype=np.int64).ravel()
+        values = np.asarray(values, dtype=np.float64).ravel()
+
+        # Linear key of every position - sorting by it gives row-major order
+        keys = rows * no_cols + cols
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+        data = np.bincount(inverse, weights=values, minlength=len(unique_keys))
+
+        unique_rows = unique_keys // no_cols
+        indices = unique_keys % no_cols
+        indptr = np.zeros(no_rows + 1, dtype=np.int64)
+        np.cumsum(np.bincount(unique_rows, minlength=no_rows), out=indptr[1:])
+
+        return cls(no_rows, no_cols, data, indices, indptr)
+
+    @classmethod
+    def from_element_matrices(cls, element_IDs: Sequence[Sequence[int]], local_matrices: Sequence[Sequence[Sequence[float]]],
+                              no_nodes: int) -> 'MacierzRzadka':
+        """
+        Builds the global sparse matrix from the 4x4 local matrices of the elements.
+
+        Args:
+            element_IDs (list[list[int]]): Node IDs (one-based) of each element
+            local_matrices (list[list[list[float]]]): Local 4x4 matrices of the elements
+            no_nodes (int): Number of nodes in the MES grid
+
+        Returns:
+            MacierzRzadka: Global matrix in the CSR format
+        """
+        ids = np.asarray(element_IDs, dtype=np.int64).reshape(-1, 4) - 1
+        local = np.asarray(local_matrices, dtype=np.float64).reshape(-1, 4, 4)
+        rows = np.broadcast_to(ids[:, :, None], local.shape)
+        cols = np.broadcast_to(ids[:, None, :], local.shape)
+        return cls.from_triplets(rows, cols, local, no_nodes, no_nodes)
+
+    @classmethod
+    def from_sum(cls, matrices: Sequence['MacierzRzadka']) -> 'MacierzRzadka':
+        """
+        Sums sparse matrices of the same dimensions in one compression
+        (e.g. the global matrices assembled from consecutive element ranges).
+
+        Args:
+            matrices (list[MacierzRzadka]): Components of the sum (at least one)
+
+        Returns:
+            MacierzRzadka: Sum of the matrices in the CSR format
+        """
+        if len(matrices) == 1:
+            return matrices[0]
+        first = matrices[0]
+        return cls.from_triplets(np.concatenate([matrix.row_of_entry for matrix in matrices]),
+                                 np.concatenate([matrix.indices for matrix in matrices]),
+                                 np.concatenate([matrix.data for matrix in matrices]), first.no_rows, first.no_cols)
+
+    @classmethod
+    def from_dense(cls, matrix: Sequence[Sequence[float]]) -> 'MacierzRzadka':
+        """
+        Converts a dense list-of-lists matrix to the CSR format (zeros are dropped).
+
+        Args:
+            matrix (list[list[float]]): Dense matrix
+
+        Returns:
+            MacierzRzadka: Matrix in the CSR format
+        """
+        dense = np.asarray(matrix, dtype=np.float64)
+        rows, cols = np.nonzero(dense)
+        return cls.from_triplets(rows, cols, dense[rows, cols], dense.shape[0], dense.shape[1])
+
+    @property
+    def nnz(self) -> int:
+        """Number of stored (non-zero) entries."""
+        return len(self.data)
+
+    def copy(self) -> 'MacierzRzadka':
+        return MacierzRzadka(self.no_rows, self.no_cols, self.data.copy(), self.indices.copy(), self.indptr.copy())
+
+    def scale(self, factor: float) -> None:
+        """
+        Multiplies all entries of the matrix by a factor (in place).
+
+        Args:
+            factor (float): Multiplier
+        """
+        self.data *= factor
+
+    def add(self, other: 'MacierzRzadka') -> 'MacierzRzadka':
+        """
+        Sums two sparse matrices of the same dimensions.
+
+        Args:
+            other (MacierzRzadka): Second component of the sum
+
+        Returns:
+            MacierzRzadka: New matrix equal to self + other
+        """
+        if (self.no_rows, self.no_cols) != (other.no_rows, other.no_cols):
+            raise ValueError("Matrices must have the same dimensions")
+
+        # The same sparsity pattern (the usual case for C and H of one grid) - sum the values only
+        if np.array_equal(self.indptr, other.indptr) and np.array_equal(self.indices, other.indices):
+            return MacierzRzadka(self.no_rows, self.no_cols, self.data + other.data,
+                                 self.indices.copy(), self.indptr.copy())
+
+        rows = np.concatenate([self.row_of_entry, other.row_of_entry])
+        cols = np.concatenate([self.indices, other.indices])
+        values = np.concatenate([self.data, other.data])
+        return MacierzRzadka.from_triplets(rows, cols, values, self.no_rows, self.no_cols)
+
+    def multiply_by_vector(self, vector: Sequence[float]) -> np.ndarray:
+        """
+        Multiplies the matrix by a vector (or by the columns of a matrix) in O(nnz).
+
+        Args:
+            vector (list[float]): Vector of length no_cols or array of shape (no_cols, k)
+
+        Returns:
+            np.ndarray: Result vector of length no_rows (array of shape (no_rows, k) for 2D input)
+        """
+        vector = np.asarray(vector, dtype=np.float64)
+        if vector.ndim == 1:
+            return np.bincount(self.row_of_entry, weights=self.data * vector[self.indices], minlength=self.no_rows)
+
+        # All columns in one pass: entry (row, j) goes to bin row * k + j
+        k = vector.shape[1]
+        bins = (self.row_of_entry[:, None] * k + np.arange(k)).ravel()
+        products = (self.data[:, None] * vector[self.indices]).ravel()
+        return np.bincount(bins, weights=products, minlength=self.no_rows * k).reshape(self.no_rows, k)
+
+    def diagonal(self) -> np.ndarray:
+        """
+        Returns the main diagonal of the matrix (zeros where no entry is stored).
+        """
+        diagonal = np.zeros(min(self.no_rows, self.no_cols))
+        mask = self.row_of_entry == self.indices
+        diagonal[self.indices[mask]] = self.data[mask]
+        return diagonal
+
+    def row_sums(self) -> np.ndarray:
+        """
+        Returns the sum of every row (e.g. the row-sum lumped [C], which is diagonal).
+        """
+        return np.bincount(self.row_of_entry, weights=self.data, minlength=self.no_rows)
+
+    def get_row(self, row: int) -> dict:
+        """
+        Returns the stored entries of one row as a dictionary {column: value}.
+
+        Args:
+            row (int): Row index (zero-based)
+        """
+        start, end = self.indptr[row], self.indptr[row + 1]
+        return dict(zip(self.indices[start:end].tolist(), self.data[start:end].tolist()))
+
+    def to_dense(self) -> List[List[float]]:
+        """
+        Converts the matrix to the dense list-of-lists form used by the rest of the program.
+        Intended for printing and debugging of small grids only.
+        """
+        dense = np.zeros((self.no_rows, self.no_cols))
+        np.add.at(dense, (self.row_of_entry, self.indices), self.data)
+        return dense.tolist()
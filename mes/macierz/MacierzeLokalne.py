@@ -0,0 +1,32 @@
+from typing import List, Tuple
+from mes.classes.Element import Element
+from mes.classes.Global import Global
+from mes.macierz.GeometriaElementu import ElementGeometry
+from mes.macierz.MacierzC import MacierzC
+from mes.macierz.MacierzH import MatrixH
+from mes.macierz.WektorP import MacierzHBC, WektorP
+
+
+def element_local_matrices(element: Element, no_int_nodes: int,
+                           global_data: Global) -> Tuple[List[List[float]], List[List[float]], List[float]]:
+    """
+    Calculates the local matrices and vector of one element with the per-element builders.
+    The geometry (Jacobians of the integration points, walls and their lengths) is computed once
+    and shared by the H, HBC, C and P builders.
+
+    Args:
+        element (Element): Finite element
+        no_int_nodes (int): Number of integration nodes in each direction
+        global_data (Global): Material and boundary condition parameters
+
+    Returns:
+        tuple: H + HBC (4x4), C (4x4) and P (4) of the element
+    """
+    g = global_data
+    geometry = ElementGeometry(element, no_int_nodes)
+    h_matrix = MatrixH(element, no_int_nodes, g.conductivity, geometry).total_matrix
+    hbc_matrix = MacierzHBC(element, no_int_nodes, g.alfa, geometry).hbc_matrix
+    c_matrix = MacierzC(g.specificHeat, g.density, element, geometry).total_matrix
+    p_vector = WektorP(element, no_int_nodes, g.alfa, g.tot, geometry).p_vector
+    h_with_bc = [[h + hbc for h, hbc in zip(h_row, hbc_row)] for h_row, hbc_row in zip(h_matrix, hbc_matrix)]
+    return h_with_bc, c_matrix, p_vector
@@ -0,0 +1,144 @@
+import numpy as np
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Tuple
+
+# Local matrices of a set of elements: H + HBC (k, 4, 4), C (k, 4, 4), P for Tot = 1 (k, 4), integration points
+LocalMatrices = Tuple[np.ndarray, np.ndarray, np.ndarray, int]
+
+
+class ElementMatrixCache:
+    """
+    Class implementing the cache of the local matrices of elements with the same shape.
+    The local matrices do not change when an element is translated, so an element is identified
+    by the coordinates of its nodes relative to the first node, rounded to a step proportional
+    to the size of the element, the walls with the boundary condition and the material parameters.
+    Every distinct shape of a range of elements is computed once and reused by all matching
+    elements - on structured grids all elements share a few shapes. The cache keeps at most
+    max_entries shapes and evicts the least recently used one.
+    """
+
+    def __init__(self, max_entries: int = 4096, tolerance: float = 1e-6):
+        """
+        Args:
+            max_entries (int): Largest number of stored shapes
+            tolerance (float): Rounding step of the relative coordinates as a fraction of the size
+                               of the element (grids saved with single precision need about 1e-6)
+
+        Raises:
+            ValueError: When max_entries or tolerance is not positive
+        """
+        if max_entries < 1 or tolerance <= 0:
+            raise ValueError("Cache size and tolerance must be positive")
+        self.max_entries: int = max_entries
+        self.tolerance: float = tolerance
+        self._entries: "OrderedDict[Hashable, Tuple[np.ndarray, np.ndarray, np.ndarray]]" = OrderedDict()
+
+        # Statistics (lookups of distinct shapes and elements served)
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self.elements: int = 0
+        self.computed_elements: int = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of the lookups of distinct shapes found in the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    @property
+    def reuse_rate(self) -> float:
+        """Fraction of the elements whose matrices were not computed."""
+        return 1 - self.computed_elements / self.elements if self.elements else 0.0
+
+    def statistics(self) -> Dict[str, float]:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses,
+                "evictions": self.evictions, "hit_rate": self.hit_rate, "elements": self.elements,
+                "computed_elements": self.computed_elements, "reuse_rate": self.reuse_rate}
+
+    def clear(self) -> None:
+        """Removes the stored shapes (the statistics are kept)."""
+        self._entries.clear()
+
+    def shape_keys(self, coords: np.ndarray, walls: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Groups the elements by shape.
+
+        Args:
+            coords (np.ndarray): Coordinates of the nodes, shape (k, 4, 2)
+            walls (np.ndarray): (k, 4) boundary condition flags of the walls
+
+        Returns:
+            tuple: Keys of the distinct shapes (u,) as bytes, index of the first element of every shape (u,)
+                   and the shape of every element (k,)
+
+        Raises:
+            ValueError: When all nodes of an element coincide (the element has no size)
+        """
+        relative = (coords[:, 1:] - coords[:, :1]).reshape(len(coords), 6)
+        size = np.abs(relative).max(axis=1, initial=0.0)
+        degenerate = np.flatnonzero(size == 0)
+        if len(degenerate):
+            raise ValueError(f"{len(degenerate)} degenerate elements (all nodes at one point), "
+                             f"first at position {degenerate[0]}")
+        # Rounding step tolerance * 2^e for elements of size in [2^e, 2^(e+1)); the exponent is a part
+        # of the key, so elements differing only in scale never share a key
+        exponent = np.floor(np.log2(size))
+        step = self.tolerance * np.exp2(exponent)
+        keys = np.concatenate([exponent[:, None], np.rint(relative / step[:, None]), walls], axis=1).astype(np.int64)
+
+        # Rows compared as raw bytes - much faster than np.unique along an axis
+        rows = np.ascontiguousarray(keys).view(np.dtype((np.void, keys.shape[1] * keys.itemsize))).ravel()
+        unique, first, inverse = np.unique(rows, return_index=True, return_inverse=True)
+        return unique, first, inverse.ravel()
+
+    def local_matrices(self, coords: np.ndarray, walls: np.ndarray, material: Hashable,
+                       compute: Callable[[np.ndarray], LocalMatrices]) -> LocalMatrices:
+        """
+        Returns the local matrices of a range of elements, computing only the shapes missing in the cache.
+
+        Args:
+            coords (np.ndarray): Coordinates of the nodes, shape (k, 4, 2)
+            walls (np.ndarray): (k, 4) boundary condition flags of the walls
+            material (Hashable): Parameters the matrices depend on (material, boundary condition, quadrature)
+            compute (Callable): Computes the local matrices of the elements with the given indices
+
+        Returns:
+            tuple: H + HBC (k, 4, 4), C (k, 4, 4), P for Tot = 1 (k, 4) and the number of integration points used
+        """
+        unique, first, inverse = self.shape_keys(coords, walls)
+        keys = [(material, row) for row in unique.tolist()]
+        h_shapes = np.empty((len(keys), 4, 4))
+        c_shapes = np.empty((len(keys), 4, 4))
+        p_shapes = np.empty((len(keys), 4))
+
+        missing = []
+        for shape, key in enumerate(keys):
+            entry = self._entries.get(key)
+            if entry is None:
+                missing.append(shape)
+                continue
+            self._entries.move_to_end(key)
+            h_shapes[shape], c_shapes[shape], p_shapes[shape] = entry
+        self.hits += len(keys) - len(missing)
+        self.misses += len(missing)
+
+        integration_points = 0
+        if missing:
+            h_new, c_new, p_new, integration_points = compute(first[missing])
+            h_shapes[missing], c_shapes[missing], p_shapes[missing] = h_new, c_new, p_new
+            # Shapes that would be evicted again within this call are not stored at all
+            stored = range(max(0, len(missing) - self.max_entries), len(missing))
+            self.evictions += len(missing) - len(stored)
+            for row in stored:
+                self._entries[keys[missing[row]]] = (h_new[row], c_new[row], p_new[row])
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+        self.elements += len(coords)
+        self.computed_elements += len(missing)
+        return h_shapes[inverse], c_shapes[inverse], p_shapes[inverse], integration_points
@@ -1,6 +1,8 @@
-from mes.gauss.GaussianIntegral import GaussianIntegral
+from mes.gauss.GaussianIntegral import GaussianIntegral, gauss_legendre
 from mes.classes.Node import Node
-from typing import List
+from functools import lru_cache
+from typing import List, NamedTuple, Tuple
+import numpy as np
 
 # Functions calculating the derivatives of the shape functions with respect to ksi
 def n1_ksi(eta: float) -> float:
@@ -37,6 +39,18 @@ def n4_eta(ksi: float) -> float:
     return (1/4) * (1-ksi)
 
 
+def shape_functions(ksi: float, eta: float) -> Tuple[float, float, float, float]:
+    """Values of the four bilinear shape functions N1..N4 at the point (ksi, eta)"""
+    return (0.25 * (1 - ksi) * (1 - eta),
+            0.25 * (1 + ksi) * (1 - eta),
+            0.25 * (1 + ksi) * (1 + eta),
+            0.25 * (1 - ksi) * (1 + eta))
+
+
+# Local node pairs forming the walls of the element: bottom, right, top, left
+EDGE_NODES: Tuple[Tuple[int, int], ...] = ((0, 1), (1, 2), (2, 3), (3, 0))
+
+
 class UniversalElement:
     """
     Class implementing a universal element for MES.
@@ -119,3 +133,73 @@ class UniversalElement:
             value.printNode()
         print()
 
+
+
+class ReferenceTables(NamedTuple):
+    """
+    Immutable reference data of the universal element for one quadrature order.
+    All arrays are read-only and shared by every kernel in the process.
+    """
+    no_int_nodes: int
+    points: np.ndarray          # (P, 2) integration points (ksi, eta), P = no_int_nodes²
+    weights: np.ndarray         # (P,) products of the weights in both directions
+    n_values: np.ndarray        # (P, 4) values of N1..N4
+    dn_dksi: np.ndarray         # (P, 4) derivatives of N1..N4 with respect to ksi
+    dn_deta: np.ndarray         # (P, 4) derivatives of N1..N4 with respect to eta
+    edge_points: np.ndarray     # (4, no_int_nodes, 2) integration points on the walls
+    edge_weights: np.ndarray    # (no_int_nodes,) weights of the one-dimensional quadrature
+    edge_n_values: np.ndarray   # (4, no_int_nodes, 4) values of N1..N4 on the walls
+
+
+@lru_cache(maxsize=None)
+def get_universal_element(no_int_nodes: int) -> UniversalElement:
+    """
+    Returns the universal element for a given number of integration nodes.
+    The element is created once per process and shared - it must not be modified.
+
+    Args:
+        no_int_nodes (int): Number of integration nodes in each direction
+    """
+    return UniversalElement(no_int_nodes)
+
+
+def _read_only(values) -> np.ndarray:
+    array = np.array(values, dtype=np.float64)
+    array.flags.writeable = False
+    return array
+
+
+@lru_cache(maxsize=None)
+def get_reference_tables(no_int_nodes: int) -> ReferenceTables:
+    """
+    Returns the cached reference tables of the universal element for a given quadrature order.
+
+    Args:
+        no_int_nodes (int): Number of integration nodes in each direction
+
+    Returns:
+        ReferenceTables: Integration points, weights, shape functions and their derivatives
+                         inside the element and on its walls
+    """
+    universal = get_universal_element(no_int_nodes)
+    nodes, weights_1d = gauss_legendre(no_int_nodes)
+    points = [(p.x, p.y) for p in universal.integration_points]
+
+    # Integration points on the walls, in the same order as in MacierzHBC and WektorP
+    reversed_nodes = nodes[::-1]
+    edge_points = [[(ksi, -1) for ksi in nodes],             # bottom wall
+                   [(1, eta) for eta in nodes],              # right wall
+                   [(ksi, 1) for ksi in reversed_nodes],     # top wall
+                   [(-1, eta) for eta in reversed_nodes]]    # left wall
+
+    return ReferenceTables(
+        no_int_nodes=no_int_nodes,
+        points=_read_only(points),
+        weights=_read_only([w.x * w.y for w in universal.weights]),
+        n_values=_read_only([shape_functions(ksi, eta) for ksi, eta in points]),
+        dn_dksi=_read_only(universal.ksi_derivatives).T,
+        dn_deta=_read_only(universal.eta_derivatives).T,
+        edge_points=_read_only(edge_points),
+        edge_weights=_read_only(weights_1d),
+        edge_n_values=_read_only([[shape_functions(ksi, eta) for ksi, eta in wall] for wall in edge_points]),
+    )
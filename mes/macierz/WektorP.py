@@ -1,8 +1,10 @@
 from mes.classes.Node import Node
 from mes.classes.Element import Element
-from mes.macierz.UniversalElement import UniversalElement
+from mes.macierz.UniversalElement import get_universal_element
+from mes.gauss.GaussianIntegral import gauss_legendre
+from mes.macierz.GeometriaElementu import ElementGeometry
 from mes.macierz.MacierzH import no_integration_nodes
-from typing import List
+from typing import List, Optional
 
 n1 = Node(1, 0.1, 0.005, 1)
 n2 = Node(2, 0.0546918, 0.005, 1)
@@ -15,7 +17,7 @@ elem.addNode(n2)
 elem.addNode(n3)
 elem.addNode(n4)
 
-_universal = UniversalElement(no_integration_nodes)
+_universal = get_universal_element(no_integration_nodes)
 
 def print_matrix(matrix: List[List[float]], name: str) -> None:
     print(f"{name}:")
@@ -40,74 +42,12 @@ def N4(ksi: float, eta: float) -> float:
     return result
 
 
-def calculate_distance(node1: Node, node2: Node) -> float:
-    x1 = node1.x
-    y1 = node1.y
-
-    x2 = node2.x
-    y2 = node2.y
-
-    distance = ((x2 - x1) ** 2 + (y2 - y1) ** 2) ** 0.5
-    return distance
-
-
-def powierzchnie_bc(element: Element) -> List[int]:
-    """
-    Identifies the surfaces of the element with boundary conditions.
-    
-    Args:
-        element (Element): Finite element to analyze
-        
-    Returns:
-        list[int]: List of 4 values specifying the boundary conditions on each side
-                  (0 - no boundary condition, >0 - boundary condition)
-    """
-    # Initialization of arrays of boundary conditions for nodes and surfaces
-    punkty_z_bc = [0,  # point 0 (First point in element ->  Bottom left)
-                   0,  # point 1 (Node with MaxID - 1  ->  Bottom right)
-                   0,  # point 2 (Node with MinID      ->  Top right)
-                   0]  # point 3 (Node with MinID + 1  ->  Top left)
-
-    powierzchnie_z_bc = [0,  # wall 0 (Between Node 0 and Node 1 ->  Bottom wall)
-                         0,  # wall 1 (Between Node 1 and Node 2 ->  Right wall)
-                         0,  # wall 2 (Between Node 2 and Node 3 ->  Top wall)
-                         0]  # wall 3 (Between Node 3 and Node 0 -> Left wall)
-
-    # Checking the boundary conditions in the nodes
-    if element.connected_nodes[0].BC > 0:                        # point 0 bottom left
-        punkty_z_bc[0] = element.connected_nodes[0].BC
-
-    if element.connected_nodes[1].BC > 0:                        # point 1
-        punkty_z_bc[1] = element.connected_nodes[1].BC
-
-    if element.connected_nodes[2].BC > 0:                        # point 2
-        punkty_z_bc[2] = element.connected_nodes[2].BC
-
-    if element.connected_nodes[3].BC > 0:                        # point 3
-        punkty_z_bc[3] = element.connected_nodes[3].BC
-
-    # Identifying surfaces with boundary conditions
-    # A surface has a boundary condition if both its nodes have the same condition
-    if punkty_z_bc[0] > 0 and punkty_z_bc[0] == punkty_z_bc[1]:     # wall 0 *bottom* (node 0,1)
-        powierzchnie_z_bc[0] = punkty_z_bc[0]
-
-    if punkty_z_bc[1] > 0 and punkty_z_bc[1] == punkty_z_bc[2]:     # wall 1 *right* (node 1,2)
-        powierzchnie_z_bc[1] = punkty_z_bc[1]
-
-    if punkty_z_bc[2] > 0 and punkty_z_bc[2] == punkty_z_bc[3]:     # wall 2 *top* (node 2,3)
-        powierzchnie_z_bc[2] = punkty_z_bc[2]
-
-    if punkty_z_bc[3] > 0 and punkty_z_bc[3] == punkty_z_bc[0]:     # wall 3 *left* (node 3,0)
-        powierzchnie_z_bc[3] = punkty_z_bc[3]
-
-    return powierzchnie_z_bc
-
-
 class MacierzHBC:
-    def __init__(self, element: Element, no_int_nodes: int, alfa: float):
+    def __init__(self, element: Element, no_int_nodes: int, alfa: float, geometry: Optional[ElementGeometry] = None):
         self.element: Element = element
         self.no_int_nodes: int = no_int_nodes
-        self.sciany_z_bc: List[int] = powierzchnie_bc(element)
+        # Walls with boundary conditions and their lengths - taken from the shared geometry if available
+        self.sciany_z_bc, self.edge_lengths = ElementGeometry.walls_of(element, geometry)
         self.punkty_bc0: List[Node] = []     #integration points - bottom wall
         self.punkty_bc1: List[Node] = []     #integration points - right wall
         self.punkty_bc2: List[Node] = []     #integration points - top wall
@@ -115,23 +55,11 @@ class MacierzHBC:
         self.hbc_side_matrices: List[List[List[float]]] = []
         self.hbc_matrix: List[List[float]] = [[0 for _ in range(4)] for _ in range(4)]
 
-        self.weights: List[float] = []
-        for weight in range(no_int_nodes):
-            tmp = _universal.weights[weight].x
-            self.weights.append(tmp)
-
-        # for weight in self.weights:
-        #     print(weight)
-
-        x_cords: List[float] = []
-        y_cords: List[float] = []
-
-        for i in range(no_int_nodes ** 2):
-            y_cords.append(_universal.integration_points[i].y)
-            x_cords.append(_universal.integration_points[i].x)
-
-        x_cords = list(set(x_cords))        # unique values
-        y_cords = list(set(y_cords))
+        # Cached one-dimensional quadrature of the given order (nodes in the same order as the weights)
+        gauss_nodes, gauss_weights = gauss_legendre(no_int_nodes)
+        self.weights: List[float] = list(gauss_weights)
+        x_cords: List[float] = list(gauss_nodes)
+        y_cords: List[float] = list(gauss_nodes)
 
         if self.sciany_z_bc[0] > 0:     #if bottom wall has bc
             for i in range(no_int_nodes):
@@ -196,7 +124,7 @@ class MacierzHBC:
 
         if self.sciany_z_bc[nr_boku] > 0:
             if nr_boku == 0:
-                detJ = calculate_distance(self.element.connected_nodes[0], self.element.connected_nodes[1]) * 0.5
+                detJ = self.edge_lengths[0] * 0.5
                 for i in range(len(hbc)):
                     hbc[i][0] = N1(self.punkty_bc0[i].x, self.punkty_bc0[i].y)
                     hbc[i][1] = N2(self.punkty_bc0[i].x, self.punkty_bc0[i].y)
@@ -204,7 +132,7 @@ class MacierzHBC:
                     hbc[i][3] = N4(self.punkty_bc0[i].x, self.punkty_bc0[i].y)
 
             elif nr_boku == 1:
-                detJ = calculate_distance(self.element.connected_nodes[1], self.element.connected_nodes[2]) * 0.5
+                detJ = self.edge_lengths[1] * 0.5
                 for i in range(len(hbc)):
                     hbc[i][0] = N1(self.punkty_bc1[i].x, self.punkty_bc1[i].y)
                     hbc[i][1] = N2(self.punkty_bc1[i].x, self.punkty_bc1[i].y)
@@ -212,7 +140,7 @@ class MacierzHBC:
                     hbc[i][3] = N4(self.punkty_bc1[i].x, self.punkty_bc1[i].y)
 
             elif nr_boku == 2:
-                detJ = calculate_distance(self.element.connected_nodes[2], self.element.connected_nodes[3]) * 0.5
+                detJ = self.edge_lengths[2] * 0.5
                 for i in range(len(hbc)):
                     hbc[i][0] = N1(self.punkty_bc2[i].x, self.punkty_bc2[i].y)
                     hbc[i][1] = N2(self.punkty_bc2[i].x, self.punkty_bc2[i].y)
@@ -220,7 +148,7 @@ class MacierzHBC:
                     hbc[i][3] = N4(self.punkty_bc2[i].x, self.punkty_bc2[i].y)
 
             elif nr_boku == 3:
-                detJ = calculate_distance(self.element.connected_nodes[3], self.element.connected_nodes[0]) * 0.5
+                detJ = self.edge_lengths[3] * 0.5
                 for i in range(len(hbc)):
                     hbc[i][0] = N1(self.punkty_bc3[i].x, self.punkty_bc3[i].y)
                     hbc[i][1] = N2(self.punkty_bc3[i].x, self.punkty_bc3[i].y)
@@ -271,12 +199,24 @@ class WektorP:
     Considers convective boundary conditions on the surfaces of the element.
     """
     
-    def __init__(self, element: Element, no_int_nodes: int, alfa: float, ambient_temp: float):
+    def __init__(self, element: Element, no_int_nodes: int, alfa: float, ambient_temp: float,
+                 geometry: Optional[ElementGeometry] = None):
+        """
+        Initialization and calculation of the vector of thermal loads.
+
+        Args:
+            element (Element): Finite element
+            no_int_nodes (int): Number of integration nodes on a wall
+            alfa (float): Heat exchange coefficient [W/(m²·K)]
+            ambient_temp (float): Ambient temperature [°C]
+            geometry (ElementGeometry, optional): Precomputed geometry of the element
+        """
         self.element: Element = element
         self.no_int_nodes: int = no_int_nodes
         self.alfa: float = alfa
         self.ambient_temp: float = ambient_temp
-        self.sciany_z_bc: List[int] = powierzchnie_bc(element)
+        # Walls with boundary conditions and their lengths - taken from the shared geometry if available
+        self.sciany_z_bc, self.edge_lengths = ElementGeometry.walls_of(element, geometry)
         self.punkty_bc0: List[Node] = []     #integration points - bottom wall
         self.punkty_bc1: List[Node] = []     #integration points - right wall
         self.punkty_bc2: List[Node] = []     #integration points - top wall
@@ -284,20 +224,11 @@ class WektorP:
         self.p_side_vectors: List[List[float]] = []
         self.p_vector: List[float] = [0 for _ in range(4)]
 
-        self.weights: List[float] = []
-        for weight in range(no_int_nodes):
-            tmp = _universal.weights[weight].x
-            self.weights.append(tmp)
-
-        x_cords: List[float] = []
-        y_cords: List[float] = []
-
-        for i in range(no_int_nodes ** 2):
-            y_cords.append(_universal.integration_points[i].y)
-            x_cords.append(_universal.integration_points[i].x)
-
-        x_cords = list(set(x_cords))        # unique values
-        y_cords = list(set(y_cords))
+        # Cached one-dimensional quadrature of the given order (nodes in the same order as the weights)
+        gauss_nodes, gauss_weights = gauss_legendre(no_int_nodes)
+        self.weights: List[float] = list(gauss_weights)
+        x_cords: List[float] = list(gauss_nodes)
+        y_cords: List[float] = list(gauss_nodes)
 
         if self.sciany_z_bc[0] > 0:     #if bottom wall has bc
             for i in range(no_int_nodes):
@@ -373,8 +304,7 @@ class WektorP:
             # Calculations for each surface of the element
             if nr_boku == 0:  # Bottom wall
                 # Calculation of the Jacobian for the given surface
-                detJ = calculate_distance(self.element.connected_nodes[0], 
-                                       self.element.connected_nodes[1]) * 0.5
+                detJ = self.edge_lengths[0] * 0.5
                 # Calculation of the shape functions at the integration points
                 for i in range(len(n_funcs)):
                     n_funcs[i][0] = N1(self.punkty_bc0[i].x, self.punkty_bc0[i].y)
@@ -383,7 +313,7 @@ class WektorP:
                     n_funcs[i][3] = N4(self.punkty_bc0[i].x, self.punkty_bc0[i].y)
 
             elif nr_boku == 1:
-                detJ = calculate_distance(self.element.connected_nodes[1], self.element.connected_nodes[2]) * 0.5
+                detJ = self.edge_lengths[1] * 0.5
                 # Calculation of the shape functions at the integration points
                 for i in range(len(n_funcs)):
                     n_funcs[i][0] = N1(self.punkty_bc1[i].x, self.punkty_bc1[i].y)
@@ -392,7 +322,7 @@ class WektorP:
                     n_funcs[i][3] = N4(self.punkty_bc1[i].x, self.punkty_bc1[i].y)
 
             elif nr_boku == 2:
-                detJ = calculate_distance(self.element.connected_nodes[2], self.element.connected_nodes[3]) * 0.5
+                detJ = self.edge_lengths[2] * 0.5
                 # Calculation of the shape functions at the integration points
                 for i in range(len(n_funcs)):
                     n_funcs[i][0] = N1(self.punkty_bc2[i].x, self.punkty_bc2[i].y)
@@ -401,7 +331,7 @@ class WektorP:
                     n_funcs[i][3] = N4(self.punkty_bc2[i].x, self.punkty_bc2[i].y)
 
             elif nr_boku == 3:
-                detJ = calculate_distance(self.element.connected_nodes[3], self.element.connected_nodes[0]) * 0.5
+                detJ = self.edge_lengths[3] * 0.5
                 # Calculation of the shape functions at the integration points
                 for i in range(len(n_funcs)):
                     n_funcs[i][0] = N1(self.punkty_bc3[i].x, self.punkty_bc3[i].y)
@@ -0,0 +1,159 @@
+import math
+import numpy as np
+from collections import OrderedDict
+from typing import Callable, Iterator, Optional, Sequence, Tuple
+from mes.macierz.MacierzRzadka import MacierzRzadka
+from mes.macierz.MacierzOperacje import sum_matrices
+from mes.gauss.RozkladLDL import LDLFactorization
+from mes.symulacja.Pomiary import Profiler, DISABLED_PROFILER
+
+
+class AdaptiveTimeStepper:
+    """
+    Class implementing the implicit time stepping with an adaptive time step:
+        ([C]/dτ + [H]) {T1} = [C]/dτ {T0} + {P}
+    The local error of a step is estimated by step doubling - one step of dτ is compared
+    with two steps of dτ/2 - and dτ is grown or shrunk to keep it below the tolerance.
+    The accepted temperatures are the Richardson extrapolation 2 T(dτ/2, dτ/2) - T(dτ),
+    which is second order accurate, so a large step reaches the accuracy of many fixed steps.
+    The steps are powers of two times the initial step, so the few system matrices
+    in use are factored once and reused from a small cache.
+    """
+
+    def __init__(self, c_matrix: MacierzRzadka, h_matrix: MacierzRzadka, p_vector: Sequence[float],
+                 initial_step: float, tolerance: float = 0.1, min_step: Optional[float] = None,
+                 max_step: Optional[float] = None, factorization: Callable = LDLFactorization,
+                 safety: float = 0.9, max_cached: int = 8, profiler: Profiler = DISABLED_PROFILER):
+        """
+        Initialization of the stepping engine (nothing is factored until the first step).
+
+        Args:
+            c_matrix (MacierzRzadka): Global matrix [C] (not divided by dτ)
+            h_matrix (MacierzRzadka): Global matrix [H] (with HBC)
+            p_vector (list[float]): Global vector {P}
+            initial_step (float): First time step [s]; all steps are initial_step * 2^k
+            tolerance (float): Allowed local error of a step - largest temperature difference [°C]
+            min_step (float, optional): Smallest time step (initial_step / 1024 by default)
+            max_step (float, optional): Largest time step (unbounded by default)
+            factorization (Callable): Factory building an object with a solve(vector) method
+            safety (float): Safety factor of the step size prediction
+            max_cached (int): Number of factorizations kept in the cache
+            profiler (Profiler): Collector of the factorization and solve timers
+
+        Raises:
+            ValueError: When the step bounds are inconsistent
+        """
+        if initial_step <= 0 or tolerance <= 0:
+            raise ValueError("Initial step and tolerance must be positive")
+        min_step = initial_step / 1024 if min_step is None else min_step
+        if min_step <= 0 or min_step > initial_step or (max_step is not None and max_step < initial_step):
+            raise ValueError("Step bounds must satisfy 0 < min_step <= initial_step <= max_step")
+
+        self.c_matrix: MacierzRzadka = c_matrix
+        self.h_matrix: MacierzRzadka = h_matrix
+        self.p_vector: np.ndarray = np.asarray(p_vector, dtype=np.float64)
+        self.initial_step: float = initial_step
+        self.tolerance: float = tolerance
+        self.factorization: Callable = factorization
+        self.safety: float = safety
+        self.max_cached: int = max_cached
+        self.profiler: Profiler = profiler
+
+        # Allowed levels k of the steps initial_step * 2^k
+        self.min_level: int = math.ceil(math.log2(min_step / initial_step) - 1e-9)
+        self.max_level: Optional[int] = None if max_step is None else math.floor(math.log2(max_step / initial_step) + 1e-9)
+
+        self._cache: "OrderedDict[float, Tuple[MacierzRzadka, object]]" = OrderedDict()
+
+        # Statistics of the last run
+        self.accepted_steps: int = 0
+        self.rejected_steps: int = 0
+        self.solves: int = 0
+        self.factorizations: int = 0
+
+    def _system(self, step_time: float) -> Tuple[MacierzRzadka, object]:
+        """Returns [C]/dτ and the factored system matrix of the time step (cached)."""
+        system = self._cache.get(step_time)
+        if system is not None:
+            self._cache.move_to_end(step_time)
+            return system
+
+        c_matrix_dtau = self.c_matrix.copy()
+        c_matrix_dtau.scale(1 / step_time)
+        with self.profiler.phase("factorization"):
+            system = (c_matrix_dtau, self.factorization(sum_matrices(c_matrix_dtau, self.h_matrix)))
+        self.factorizations += 1
+        self._cache[step_time] = system
+        if len(self._cache) > self.max_cached:
+            self._cache.popitem(last=False)
+        return system
+
+    def _solve(self, step_time: float, t0_vector: np.ndarray) -> np.ndarray:
+        c_matrix_dtau, factorization = self._system(step_time)
+        with self.profiler.phase("solve"):
+            solution = factorization.solve(c_matrix_dtau.multiply_by_vector(t0_vector) + self.p_vector)
+        self.solves += 1
+        return solution
+
+    def step(self, t0_vector: np.ndarray, step_time: float) -> Tuple[np.ndarray, float]:
+        """
+        Performs one step with the error estimate.
+
+        Args:
+            t0_vector (np.ndarray): Temperatures in nodes at the beginning of the step
+            step_time (float): Time step [s]
+
+        Returns:
+            tuple[np.ndarray, float]: Extrapolated temperatures at the end of the step
+                                      and the estimated local error of the half steps
+        """
+        full = self._solve(step_time, t0_vector)
+        half = self._solve(step_time / 2, self._solve(step_time / 2, t0_vector))
+        return 2 * half - full, float(np.max(np.abs(half - full)))
+
+    def run(self, t0_vector: Sequence[float], sim_time: float,
+            sample_times: Optional[Sequence[float]] = None) -> Iterator[Tuple[float, np.ndarray]]:
+        """
+        Advances the temperature field up to sim_time and reports it at the sample times.
+        Temperatures between two accepted steps are interpolated linearly.
+
+        Args:
+            t0_vector (list[float]): Initial temperatures in nodes
+            sim_time (float): Total simulation time [s]
+            sample_times (list[float], optional): Times of the output (multiples of the initial step by default)
+
+        Yields:
+            tuple[float, np.ndarray]: Sample time and temperatures in nodes
+        """
+        if sample_times is None:
+            sample_times = self.initial_step * np.arange(1, int(sim_time / self.initial_step + 1e-9) + 1)
+        samples = sorted(float(time) for time in sample_times if 0 < time <= sim_time)
+        self.accepted_steps = self.rejected_steps = self.solves = 0
+
+        time = 0.0
+        solution = np.asarray(t0_vector, dtype=np.float64)
+        level = 0
+        next_sample = 0
+        while time < sim_time * (1 - 1e-12) and next_sample < len(samples):
+            step_time = min(self.initial_step * 2.0 ** level, sim_time - time)
+            new_solution, error = self.step(solution, step_time)
+
+            if error > self.tolerance and level > self.min_level:
+                # Rejected - shrink by as many levels as the error estimate requires
+                self.rejected_steps += 1
+                factor = self.safety * math.sqrt(self.tolerance / error)
+                level = max(self.min_level, level + min(-1, math.floor(math.log2(factor))))
+                continue
+
+            self.accepted_steps += 1
+            new_time = time + step_time
+            while next_sample < len(samples) and samples[next_sample] <= new_time * (1 + 1e-12):
+                weight = min(1.0, (samples[next_sample] - time) / step_time)
+                yield samples[next_sample], solution + weight * (new_solution - solution)
+                next_sample += 1
+            time, solution = new_time, new_solution
+
+            # The local error of the implicit Euler step is O(dτ²) - grow when twice the step fits
+            if error == 0.0 or self.safety * math.sqrt(self.tolerance / error) >= 2.0:
+                if self.max_level is None or level < self.max_level:
+                    level += 1
@@ -0,0 +1,65 @@
+import numpy as np
+from typing import Callable, List, Optional, Sequence, Union
+from mes.macierz.MacierzRzadka import MacierzRzadka
+from mes.macierz.MacierzOperacje import sum_matrices
+from mes.gauss.RozkladLDL import LDLFactorization
+from mes.symulacja.Pomiary import Profiler, DISABLED_PROFILER
+
+
+class TimeStepper:
+    """
+    Class implementing the implicit time stepping of the transient heat equation:
+        ([C]/dτ + [H]) {T1} = [C]/dτ {T0} + {P}
+    The matrix of the system is constant, so it is factored once in the constructor
+    and every step costs one matrix-vector product plus the substitutions.
+    """
+
+    def __init__(self, c_matrix_dtau: Union[List[List[float]], MacierzRzadka],
+                 h_matrix: Union[List[List[float]], MacierzRzadka], p_vector: Sequence[float],
+                 factorization: Callable = LDLFactorization, profiler: Profiler = DISABLED_PROFILER):
+        """
+        Initialization of the stepping engine and factorization of the system matrix.
+
+        Args:
+            c_matrix_dtau (list[list[float]] | MacierzRzadka): Global matrix [C] already divided by dτ
+            h_matrix (list[list[float]] | MacierzRzadka): Global matrix [H] (with HBC)
+            p_vector (list[float]): Global vector {P}
+            factorization (Callable): Factory building an object with a solve(vector) method
+                                      from the system matrix (LDLFactorization by default);
+                                      an iterative PCGSolver warm-starts from the previous step
+            profiler (Profiler): Collector of the factorization, matvec and solve timers
+        """
+        if not isinstance(c_matrix_dtau, MacierzRzadka):
+            c_matrix_dtau = MacierzRzadka.from_dense(c_matrix_dtau)
+        if not isinstance(h_matrix, MacierzRzadka):
+            h_matrix = MacierzRzadka.from_dense(h_matrix)
+
+        self.c_matrix_dtau: MacierzRzadka = c_matrix_dtau
+        self.p_vector: np.ndarray = np.asarray(p_vector, dtype=np.float64)
+        self.profiler: Profiler = profiler
+        self.system_matrix: MacierzRzadka = sum_matrices(c_matrix_dtau, h_matrix)
+        with profiler.phase("factorization"):
+            self.factorization = factorization(self.system_matrix)
+
+    def step(self, t0_vector: Sequence[float], p_vector: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Performs a single time step.
+        Several scenarios can be advanced at once: with temperatures of shape (n, k)
+        every column is one scenario and the system is solved for all columns together.
+
+        Args:
+            t0_vector (list[float]): Temperatures in nodes at the beginning of the step, (n,) or (n, k)
+            p_vector (np.ndarray, optional): Load vector replacing {P}, (n,) or (n, k) - one column per scenario
+
+        Returns:
+            np.ndarray: Temperatures in nodes at the end of the step (same shape as t0_vector)
+        """
+        with self.profiler.phase("matvec"):
+            rhs = self.c_matrix_dtau.multiply_by_vector(t0_vector) + (self.p_vector if p_vector is None else p_vector)
+        with self.profiler.phase("solve"):
+            solution = self.factorization.solve(rhs)
+        # Iterative solvers report the iterations of the last solve
+        iterations = getattr(self.factorization, "iterations", None)
+        if iterations is not None:
+            self.profiler.count("solver_iterations", iterations)
+        return solution
@@ -0,0 +1,177 @@
+import math
+import numpy as np
+from typing import Iterator, Optional, Sequence, Tuple
+from mes.macierz.MacierzRzadka import MacierzRzadka
+from mes.symulacja.Pomiary import Profiler, DISABLED_PROFILER
+
+
+def _power_iteration(c_lumped: np.ndarray, h_matrix: MacierzRzadka, tolerance: float, max_iterations: int,
+                     seed: int) -> Tuple[float, np.ndarray]:
+    """Rayleigh quotient and unit iteration vector of the power iteration on [C]^-½ [H] [C]^-½."""
+    scale = 1 / np.sqrt(c_lumped)
+    vector = np.random.default_rng(seed).random(len(c_lumped)) + 0.5
+    vector /= np.linalg.norm(vector)
+    eigenvalue = 0.0
+    for _ in range(max_iterations):
+        product = scale * h_matrix.multiply_by_vector(scale * vector)
+        estimate = float(vector @ product)
+        norm = np.linalg.norm(product)
+        if norm == 0.0:
+            return 0.0, vector
+        if abs(estimate - eigenvalue) <= tolerance * abs(estimate):
+            return estimate, vector
+        vector = product / norm
+        eigenvalue = estimate
+    return eigenvalue, vector
+
+
+def largest_eigenvalue(c_lumped: np.ndarray, h_matrix: MacierzRzadka, tolerance: float = 1e-6,
+                       max_iterations: int = 1000, seed: int = 0) -> float:
+    """
+    Estimates the largest eigenvalue of [C]⁻¹[H] for a diagonal (lumped) [C] by power iteration.
+    The iteration runs on the symmetric matrix [C]^-½ [H] [C]^-½, which has the same eigenvalues,
+    and the estimate is its Rayleigh quotient (it approaches the eigenvalue from below).
+
+    Args:
+        c_lumped (np.ndarray): Diagonal of the lumped matrix [C] (positive)
+        h_matrix (MacierzRzadka): Global matrix [H] (with HBC)
+        tolerance (float): Relative change of the estimate ending the iteration
+        max_iterations (int): Largest number of matrix-vector products
+        seed (int): Seed of the random starting vector
+
+    Returns:
+        float: Estimate of the largest eigenvalue [1/s]
+    """
+    return _power_iteration(np.asarray(c_lumped, dtype=np.float64), h_matrix, tolerance, max_iterations, seed)[0]
+
+
+def gershgorin_bound(c_lumped: np.ndarray, h_matrix: MacierzRzadka) -> float:
+    """
+    Returns the Gershgorin bound of the eigenvalues of [C]⁻¹[H] for a diagonal [C]:
+    max_i Σ_j |H_ij| / C_ii - never below the largest eigenvalue.
+    """
+    absolute_sums = np.bincount(h_matrix.row_of_entry, weights=np.abs(h_matrix.data), minlength=h_matrix.no_rows)
+    return float((absolute_sums / np.asarray(c_lumped, dtype=np.float64)).max(initial=0.0))
+
+
+def eigenvalue_upper_bound(c_lumped: np.ndarray, h_matrix: MacierzRzadka, tolerance: float = 1e-6,
+                           max_iterations: int = 1000, seed: int = 0) -> float:
+    """
+    Bounds the largest eigenvalue of [C]⁻¹[H] from above (the Rayleigh quotient of largest_eigenvalue
+    is slightly below it, so a critical step computed from it is slightly too large).
+    The power iteration gives the Rayleigh quotient μ and the residual r = A v - μ v of its vector;
+    the interval μ ± ||r|| contains the eigenvalue the iteration converged to, so μ + ||r|| bounds it.
+    The result is never above the Gershgorin bound, which holds for any matrix.
+
+    Args:
+        c_lumped (np.ndarray): Diagonal of the lumped matrix [C] (positive)
+        h_matrix (MacierzRzadka): Global matrix [H] (with HBC)
+        tolerance (float): Relative change of the estimate ending the power iteration
+        max_iterations (int): Largest number of matrix-vector products
+        seed (int): Seed of the random starting vector
+
+    Returns:
+        float: Upper bound of the largest eigenvalue [1/s]
+    """
+    c_lumped = np.asarray(c_lumped, dtype=np.float64)
+    estimate, vector = _power_iteration(c_lumped, h_matrix, tolerance, max_iterations, seed)
+    scale = 1 / np.sqrt(c_lumped)
+    residual = np.linalg.norm(scale * h_matrix.multiply_by_vector(scale * vector) - estimate * vector)
+    return min(estimate + float(residual), gershgorin_bound(c_lumped, h_matrix))
+
+
+class ExplicitTimeStepper:
+    """
+    Class implementing the explicit (forward Euler) time stepping with the lumped matrix [C]:
+        {T1} = {T0} + dτ [C]⁻¹ ({P} - [H] {T0})
+    [C] is diagonal, so a step costs one sparse matrix-vector product and a diagonal scale
+    and no factorization is needed. The scheme is stable for dτ < 2 / λmax([C]⁻¹[H]),
+    so each requested time step is divided into equal sub-steps below this limit
+    (computed from an upper bound of λmax, so the limit itself is never overestimated).
+    The limit controls stability only: a stable sub-step may still be far too long for an accurate
+    transient (forward Euler is first order), so max_substep optionally caps the sub-step as well.
+    """
+
+    def __init__(self, c_lumped: Sequence[float], h_matrix: MacierzRzadka, p_vector: Sequence[float],
+                 step_time: float, safety: float = 0.9, critical_step: Optional[float] = None,
+                 max_substep: Optional[float] = None, profiler: Profiler = DISABLED_PROFILER):
+        """
+        Initialization of the stepping engine and estimation of the stable time step.
+
+        Args:
+            c_lumped (list[float]): Diagonal of the lumped global matrix [C]
+            h_matrix (MacierzRzadka): Global matrix [H] (with HBC)
+            p_vector (list[float]): Global vector {P}
+            step_time (float): Requested time step [s] (sub-cycled if above the stable step)
+            safety (float): Fraction of the critical step used as the largest sub-step
+            critical_step (float, optional): Known critical step [s] (2 / eigenvalue_upper_bound by default)
+            max_substep (float, optional): Largest sub-step [s] allowed for accuracy (only stability by default)
+            profiler (Profiler): Collector of the eigenvalue and matvec timers
+
+        Raises:
+            ValueError: When the lumped [C] is not positive or the step, the safety factor
+                        or max_substep is out of range
+        """
+        self.c_lumped: np.ndarray = np.asarray(c_lumped, dtype=np.float64)
+        if (self.c_lumped <= 0).any():
+            raise ValueError("Lumped capacity matrix must have a positive diagonal")
+        if step_time <= 0 or not 0 < safety <= 1:
+            raise ValueError("Time step must be positive and the safety factor in (0, 1]")
+        if max_substep is not None and max_substep <= 0:
+            raise ValueError("Largest sub-step must be positive")
+
+        self.h_matrix: MacierzRzadka = h_matrix
+        self.p_vector: np.ndarray = np.asarray(p_vector, dtype=np.float64)
+        self.step_time: float = step_time
+        self.profiler: Profiler = profiler
+        self.inverse_capacity: np.ndarray = 1 / self.c_lumped
+
+        if critical_step is None:
+            with profiler.phase("eigenvalue"):
+                eigenvalue = eigenvalue_upper_bound(self.c_lumped, h_matrix)
+            critical_step = math.inf if eigenvalue <= 0 else 2 / eigenvalue
+        self.critical_step: float = critical_step
+
+        # Equal sub-steps of the requested step, each below the stable limit (and max_substep)
+        largest_substep = safety * critical_step if max_substep is None else min(safety * critical_step, max_substep)
+        self.substeps: int = max(1, math.ceil(step_time / largest_substep - 1e-9))
+        self.substep_time: float = step_time / self.substeps
+
+    def step(self, t0_vector: Sequence[float], p_vector: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Performs a single (sub-cycled) time step.
+        With temperatures of shape (n, k) every column is one scenario.
+
+        Args:
+            t0_vector (list[float]): Temperatures in nodes at the beginning of the step, (n,) or (n, k)
+            p_vector (np.ndarray, optional): Load vector replacing {P}, (n,) or (n, k) - one column per scenario
+
+        Returns:
+            np.ndarray: Temperatures in nodes at the end of the step (same shape as t0_vector)
+        """
+        solution = np.array(t0_vector, dtype=np.float64)
+        loads = self.p_vector if p_vector is None else p_vector
+        scale = self.substep_time * self.inverse_capacity
+        if solution.ndim == 2:
+            scale = scale[:, None]
+        with self.profiler.phase("matvec"):
+            for _ in range(self.substeps):
+                solution += scale * (loads - self.h_matrix.multiply_by_vector(solution))
+        self.profiler.count("substeps", self.substeps)
+        return solution
+
+    def run(self, t0_vector: Sequence[float], sim_time: float) -> Iterator[Tuple[float, np.ndarray]]:
+        """
+        Advances the temperature field from step_time up to sim_time.
+
+        Args:
+            t0_vector (list[float]): Initial temperatures in nodes
+            sim_time (float): Total simulation time [s]
+
+        Yields:
+            tuple[float, np.ndarray]: Current time and temperatures in nodes after each step
+        """
+        solution = np.asarray(t0_vector, dtype=np.float64)
+        for step in range(1, int(sim_time / self.step_time + 1e-9) + 1):
+            solution = self.step(solution)
+            yield step * self.step_time, solution
@@ -0,0 +1,323 @@
+import os
+import warnings
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple
+from mes.classes.Global import Global
+from mes.classes.SiatkaTablicowa import ArrayMesh
+from mes.macierz.ElementyWsadowe import (MAX_QUADRATURE_ORDER, affine_elements, batch_affine, batch_matrix_h_orders,
+                                         batch_matrix_c, batch_surface, jacobian_variation, quadrature_error,
+                                         quadrature_orders)
+from mes.macierz.PamiecElementow import ElementMatrixCache, LocalMatrices
+from mes.symulacja.Pomiary import Profiler, DISABLED_PROFILER
+
+# Below this number of elements per worker the pool costs more than it saves
+MIN_ELEMENTS_PER_WORKER: int = 256
+
+# Description of an array in shared memory: name of the block, shape, dtype
+ArraySpec = Tuple[str, Tuple[int, ...], str]
+
+# Statistics of the worker caches added to the cache of the caller
+CACHE_COUNTERS: Tuple[str, ...] = ("hits", "misses", "evictions", "elements", "computed_elements")
+
+
+def local_matrices_range(mesh: ArrayMesh, global_data: Global, no_int_nodes: int, start: int = 0,
+                         stop: Optional[int] = None, profiler: Profiler = DISABLED_PROFILER,
+                         quadrature_tolerance: Optional[float] = None, min_int_nodes: int = 2,
+                         cache: Optional[ElementMatrixCache] = None) -> LocalMatrices:
+    """
+    Calculates the local matrices and vectors of a range of elements.
+    {P} is linear in the ambient temperature, so it is returned for Tot = 1
+    (the load of any ambient temperature is this vector multiplied by Tot).
+
+    [H] and [C] of affine (parallelogram) elements are computed in closed form; the walls are straight
+    for every element, so [HBC] and {P} are always the constant wall integrals scaled by the wall length
+    and are integrated with at most 2 nodes (exact).
+    With quadrature_tolerance the number of integration nodes of the remaining elements is chosen per element:
+    detJ of a bilinear element is linear, so the 2-point rule is already exact for [C], [HBC] and {P},
+    and [H] gets the lowest order whose error estimate (from the variation of detJ) meets the tolerance,
+    up to MAX_QUADRATURE_ORDER. Elements still above the tolerance at that order are counted
+    (quadrature_unresolved) and reported with a RuntimeWarning.
+
+    Args:
+        mesh (ArrayMesh): Grid of the simulation
+        global_data (Global): Material and boundary condition parameters
+        no_int_nodes (int): Number of integration nodes in each direction (not used with quadrature_tolerance)
+        start (int): Index of the first element
+        stop (int, optional): Index after the last element (all elements by default)
+        profiler (Profiler): Collector of the element_affine/h/c/surface timers and the quadrature counters
+        quadrature_tolerance (float, optional): Allowed relative error of [H] - enables the choice
+                                                of the order per element (fixed no_int_nodes by default)
+        min_int_nodes (int): Lowest number of integration nodes of the per-element choice
+        cache (ElementMatrixCache, optional): Cache of the matrices of elements with the same shape -
+                                              only the shapes missing in it are computed
+
+    Returns:
+        tuple: H + HBC (k, 4, 4), C (k, 4, 4), P for Tot = 1 (k, 4)
+               and the number of integration points used
+    """
+    stop = mesh.elements_number if stop is None else stop
+    coords = mesh.element_coordinates(start, stop)
+    quadrature = (quadrature_tolerance, min_int_nodes)
+    if cache is None:
+        edges = mesh.boundary_edges()
+        first, last = np.searchsorted(edges.elements, [start, stop])
+        return _element_matrices(coords, edges.elements[first:last] - start, edges.walls[first:last],
+                                 global_data, no_int_nodes, profiler, *quadrature)
+
+    g = global_data
+    walls = mesh.boundary_walls(start, stop)
+    material = (g.conductivity, g.specificHeat, g.density, g.alfa, no_int_nodes, *quadrature)
+
+    def compute(indices: np.ndarray) -> LocalMatrices:
+        edge_elements, edge_walls = np.nonzero(walls[indices])
+        return _element_matrices(coords[indices], edge_elements, edge_walls, g, no_int_nodes, profiler, *quadrature)
+
+    hits, misses = cache.hits, cache.misses
+    with profiler.phase("element_cache"):
+        result = cache.local_matrices(coords, walls, material, compute)
+    profiler.count("cache_hits", cache.hits - hits)
+    profiler.count("cache_misses", cache.misses - misses)
+    return result
+
+
+def _element_matrices(coords: np.ndarray, edge_elements: np.ndarray, edge_walls: np.ndarray, g: Global,
+                      no_int_nodes: int, profiler: Profiler, quadrature_tolerance: Optional[float],
+                      min_int_nodes: int) -> LocalMatrices:
+    """Local matrices of the elements with the given coordinates and boundary walls (see local_matrices_range)."""
+    h_local = np.empty((len(coords), 4, 4))
+    c_local = np.empty((len(coords), 4, 4))
+
+    # Parallelograms in closed form, only the distorted elements need quadrature
+    affine = affine_elements(coords)
+    if affine.any():
+        with profiler.phase("element_affine"):
+            h_local[affine], c_local[affine] = batch_affine(coords[affine], g.conductivity,
+                                                            g.specificHeat, g.density)
+    distorted = ~affine
+    quadrature_coords = coords[distorted]
+
+    if quadrature_tolerance is None:
+        exact_order = no_int_nodes
+        orders = np.full(len(quadrature_coords), no_int_nodes)
+    else:
+        min_int_nodes = min(min_int_nodes, MAX_QUADRATURE_ORDER)
+        exact_order = max(2, min_int_nodes)
+        with profiler.phase("quadrature_orders"):
+            orders = quadrature_orders(quadrature_coords, quadrature_tolerance, min_int_nodes, MAX_QUADRATURE_ORDER)
+            _report_unresolved(quadrature_coords[orders == MAX_QUADRATURE_ORDER], quadrature_tolerance, profiler)
+    if len(quadrature_coords):
+        with profiler.phase("element_h"):
+            h_local[distorted] = batch_matrix_h_orders(quadrature_coords, g.conductivity, orders)
+        with profiler.phase("element_c"):
+            c_local[distorted] = batch_matrix_c(quadrature_coords, g.specificHeat, g.density, exact_order)
+    volume_points = int(np.sum(orders ** 2)) + len(quadrature_coords) * exact_order ** 2
+
+    # Surface integration only over the walls from the boundary-edge index - the walls are straight,
+    # so the 2-point rule is exact for [HBC] and {P} whatever the order of the volume integrals
+    surface_order = min(exact_order, 2)
+    with profiler.phase("element_surface"):
+        hbc_local, p_local = batch_surface(coords, edge_elements, edge_walls, g.alfa, 1.0, surface_order)
+    h_local += hbc_local
+    integration_points = volume_points + 2 * len(edge_elements) * surface_order
+
+    return h_local, c_local, p_local, integration_points
+
+
+def _report_unresolved(coords: np.ndarray, tolerance: float, profiler: Profiler) -> None:
+    """Counts and reports the elements whose [H] error estimate exceeds the tolerance at the highest order."""
+    errors = quadrature_error(jacobian_variation(coords), MAX_QUADRATURE_ORDER)
+    unresolved = int(np.count_nonzero(errors > tolerance))
+    if unresolved:
+        profiler.count("quadrature_unresolved", unresolved)
+        warnings.warn(f"{unresolved} elements exceed the quadrature tolerance {tolerance:.1e} with "
+                      f"{MAX_QUADRATURE_ORDER} integration nodes (estimated relative error of [H] up to "
+                      f"{errors.max():.1e})", RuntimeWarning, stacklevel=4)
+
+
+def _share(array: np.ndarray, blocks: List[shared_memory.SharedMemory]) -> Tuple[np.ndarray, ArraySpec]:
+    """Creates a shared memory block holding a copy of the array (appended to blocks for cleanup)."""
+    block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    blocks.append(block)
+    shared = np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)
+    shared[...] = array
+    return shared, (block.name, array.shape, array.dtype.str)
+
+
+def _attach(spec: ArraySpec, blocks: List[shared_memory.SharedMemory]) -> np.ndarray:
+    """Maps an array created by _share in another process."""
+    name, shape, dtype = spec
+    block = shared_memory.SharedMemory(name=name)
+    blocks.append(block)
+    return np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+
+# State of a worker process - the grid and the output buffers mapped once by _init_worker
+_worker: Dict[str, object] = {}
+
+
+def _init_worker(inputs: Dict[str, ArraySpec], outputs: Dict[str, ArraySpec], global_data: Global,
+                 no_int_nodes: int, quadrature: Dict[str, object], cache_settings: Optional[Tuple[int, float]]) -> None:
+    blocks: List[shared_memory.SharedMemory] = []
+    arrays = {key: _attach(spec, blocks) for key, spec in {**inputs, **outputs}.items()}
+    cache = ElementMatrixCache(*cache_settings) if cache_settings is not None else None
+    _worker.update(arrays, blocks=blocks, global_data=global_data, no_int_nodes=no_int_nodes, quadrature=quadrature,
+                   cache=cache,
+                   mesh=ArrayMesh(arrays["node_ids"], arrays["coordinates"], arrays["element_ids"],
+                                  arrays["connectivity"], arrays["bc"]))
+
+
+def _compute_chunk(element_range: Tuple[int, int]) -> Tuple[int, Tuple[int, ...]]:
+    """
+    Writes the local matrices of a range of elements to the shared output buffers.
+    Returns the integration points used and the change of the statistics of the worker cache.
+    """
+    start, stop = element_range
+    cache: Optional[ElementMatrixCache] = _worker["cache"]
+    before = _cache_counters(cache)
+    h_local, c_local, p_local, integration_points = local_matrices_range(
+        _worker["mesh"], _worker["global_data"], _worker["no_int_nodes"], start, stop,
+        cache=cache, **_worker["quadrature"])
+    _worker["h"][start:stop] = h_local
+    _worker["c"][start:stop] = c_local
+    _worker["p"][start:stop] = p_local
+    return integration_points, tuple(after - previous for after, previous in zip(_cache_counters(cache), before))
+
+
+def _cache_counters(cache: Optional[ElementMatrixCache]) -> Tuple[int, ...]:
+    return tuple(getattr(cache, name) for name in CACHE_COUNTERS) if cache is not None else (0,) * len(CACHE_COUNTERS)
+
+
+class AssemblyPool:
+    """
+    Class implementing a pool of worker processes computing the local matrices of the elements.
+    The grid is placed in shared memory once, every worker maps it and writes the results
+    of its element ranges to preallocated shared output arrays at the positions of the elements,
+    so the result does not depend on the order in which the chunks finish.
+    The processes, the shared arrays and the element caches of the workers live until close is called,
+    so repeated assemblies of the same grid (e.g. by one Simulation) reuse the shapes cached by the workers.
+    """
+
+    def __init__(self, mesh: ArrayMesh, global_data: Global, no_int_nodes: int, workers: Optional[int] = None,
+                 quadrature_tolerance: Optional[float] = None, min_int_nodes: int = 2,
+                 cache: Optional[ElementMatrixCache] = None):
+        """
+        Initialization of the shared memory and start of the worker processes.
+
+        Args:
+            mesh (ArrayMesh): Grid of the simulation
+            global_data (Global): Material and boundary condition parameters
+            no_int_nodes (int): Number of integration nodes in each direction
+            workers (int, optional): Number of processes (number of CPUs by default)
+            quadrature_tolerance (float, optional): Allowed relative error of [H] of the per-element order choice
+            min_int_nodes (int): Lowest number of integration nodes of the per-element choice
+            cache (ElementMatrixCache, optional): Cache of the matrices of elements with the same shape;
+                                                  every worker keeps its own cache with the same settings
+                                                  and their statistics are added to this one
+        """
+        self.elements_number: int = mesh.elements_number
+        self.workers: int = workers or os.cpu_count() or 1
+        self.cache: Optional[ElementMatrixCache] = cache
+        self._blocks: List[shared_memory.SharedMemory] = []
+        self._results: Dict[str, np.ndarray] = {}
+        self._executor: Optional[ProcessPoolExecutor] = None
+        try:
+            inputs = {key: _share(array, self._blocks)[1] for key, array in (
+                ("node_ids", mesh.node_ids), ("coordinates", mesh.coordinates), ("element_ids", mesh.element_ids),
+                ("connectivity", mesh.element_node_ids), ("bc", mesh.bc))}
+            outputs = {}
+            for key, shape in (("h", (self.elements_number, 4, 4)), ("c", (self.elements_number, 4, 4)),
+                               ("p", (self.elements_number, 4))):
+                self._results[key], outputs[key] = _share(np.zeros(shape), self._blocks)
+            quadrature = {"quadrature_tolerance": quadrature_tolerance, "min_int_nodes": min_int_nodes}
+            cache_settings = None if cache is None else (cache.max_entries, cache.tolerance)
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                                 initargs=(inputs, outputs, global_data, no_int_nodes, quadrature,
+                                                           cache_settings))
+        except BaseException:
+            self.close()
+            raise
+
+    def __enter__(self) -> 'AssemblyPool':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def local_matrices(self, chunk_size: Optional[int] = None) -> LocalMatrices:
+        """
+        Calculates the local matrices of all elements in the worker processes.
+
+        Args:
+            chunk_size (int, optional): Elements in one task (about 4 tasks per worker by default)
+
+        Returns:
+            tuple: H + HBC (E, 4, 4), C (E, 4, 4), P for Tot = 1 (E, 4)
+                   and the number of integration points used
+
+        Raises:
+            ValueError: When the pool is closed
+        """
+        if self._executor is None:
+            raise ValueError("The assembly pool is closed")
+        elements_number = self.elements_number
+        chunk_size = chunk_size or max(1, -(-elements_number // (4 * self.workers)))
+        ranges = [(start, min(start + chunk_size, elements_number)) for start in range(0, elements_number, chunk_size)]
+        chunks = list(self._executor.map(_compute_chunk, ranges))
+
+        h_local, c_local, p_local = (self._results[key].copy() for key in ("h", "c", "p"))
+        integration_points = sum(points for points, _ in chunks)
+        if self.cache is not None:
+            for name, *changes in zip(CACHE_COUNTERS, *(counters for _, counters in chunks)):
+                setattr(self.cache, name, getattr(self.cache, name) + sum(changes))
+        return h_local, c_local, p_local, integration_points
+
+    def close(self) -> None:
+        """Stops the worker processes and releases the shared memory (closing twice does nothing)."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        # Views of the blocks must be released before the blocks are closed
+        self._results.clear()
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks.clear()
+
+
+def use_workers(elements_number: int, workers: Optional[int]) -> int:
+    """
+    Returns the number of processes worth starting for a grid: at most workers (number of CPUs by default)
+    and at least MIN_ELEMENTS_PER_WORKER elements per process (1 - serial computation).
+    """
+    return min(workers or os.cpu_count() or 1, max(1, elements_number // MIN_ELEMENTS_PER_WORKER))
+
+
+def parallel_local_matrices(mesh: ArrayMesh, global_data: Global, no_int_nodes: int, workers: Optional[int] = None,
+                            chunk_size: Optional[int] = None, quadrature_tolerance: Optional[float] = None,
+                            min_int_nodes: int = 2, cache: Optional[ElementMatrixCache] = None) -> LocalMatrices:
+    """
+    Calculates the local matrices of all elements in a pool of worker processes started for this call only
+    (see AssemblyPool for a pool reused by repeated assemblies). Small grids are computed serially.
+
+    Args:
+        mesh (ArrayMesh): Grid of the simulation
+        global_data (Global): Material and boundary condition parameters
+        no_int_nodes (int): Number of integration nodes in each direction
+        workers (int, optional): Number of processes (number of CPUs by default)
+        chunk_size (int, optional): Elements in one task (about 4 tasks per worker by default)
+        quadrature_tolerance (float, optional): Allowed relative error of [H] of the per-element order choice
+        min_int_nodes (int): Lowest number of integration nodes of the per-element choice
+        cache (ElementMatrixCache, optional): Cache of the matrices of elements with the same shape
+
+    Returns:
+        tuple: H + HBC (E, 4, 4), C (E, 4, 4), P for Tot = 1 (E, 4)
+               and the number of integration points used
+    """
+    quadrature = {"quadrature_tolerance": quadrature_tolerance, "min_int_nodes": min_int_nodes}
+    workers = use_workers(mesh.elements_number, workers)
+    if workers <= 1:
+        return local_matrices_range(mesh, global_data, no_int_nodes, cache=cache, **quadrature)
+    with AssemblyPool(mesh, global_data, no_int_nodes, workers, cache=cache, **quadrature) as pool:
+        return pool.local_matrices(chunk_size)
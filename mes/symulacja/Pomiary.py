@@ -0,0 +1,184 @@
+import json
+import os
+import time
+import numpy as np
+from array import array
+from tabulate import tabulate
+from typing import Dict, List, Optional, Tuple
+
+PERCENTILES: Tuple[int, ...] = (50, 90, 99)
+
+
+class _PhaseNode:
+    """Statistics of one phase of the tree (a phase is identified by its path of names)."""
+
+    __slots__ = ("name", "total", "calls", "durations", "children")
+
+    def __init__(self, name: str):
+        self.name: str = name
+        self.total: float = 0.0
+        self.calls: int = 0
+        self.durations: array = array("d")   # Duration of every call [s] (8 bytes per call)
+        self.children: Dict[str, '_PhaseNode'] = {}
+
+    def to_dict(self) -> Dict:
+        result = {"total_s": self.total, "calls": self.calls}
+        if self.calls:
+            durations = np.frombuffer(self.durations, dtype=np.float64)
+            result["mean_s"] = self.total / self.calls
+            for percentile, value in zip(PERCENTILES, np.percentile(durations, PERCENTILES)):
+                result[f"p{percentile}_s"] = float(value)
+            result["max_s"] = float(durations.max())
+        if self.children:
+            result["children"] = {name: child.to_dict() for name, child in self.children.items()}
+        return result
+
+
+class _Phase:
+    """Context manager measuring one call of a phase."""
+
+    __slots__ = ("profiler", "node", "start")
+
+    def __init__(self, profiler: 'Profiler', node: _PhaseNode):
+        self.profiler: Profiler = profiler
+        self.node: _PhaseNode = node
+        self.start: float = 0.0
+
+    def __enter__(self) -> '_Phase':
+        self.profiler._stack.append(self.node)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        duration = time.perf_counter() - self.start
+        node = self.node
+        node.total += duration
+        node.calls += 1
+        node.durations.append(duration)
+        self.profiler._stack.pop()
+        if self.profiler.trace:
+            self.profiler._events.append((node.name, len(self.profiler._stack), self.start, duration))
+
+
+class _NullPhase:
+    """Phase of a disabled profiler - does nothing."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> '_NullPhase':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        pass
+
+
+_NULL_PHASE = _NullPhase()
+
+
+class Profiler:
+    """
+    Collects nested phase timers and counters of the simulation pipeline.
+    Phases opened inside another phase become its children, e.g. step -> matvec, solve.
+    A disabled profiler returns a shared no-op phase, so the instrumented code costs
+    one method call per phase when profiling is off.
+    """
+
+    def __init__(self, enabled: bool = True, trace: bool = False):
+        """
+        Args:
+            enabled (bool): If False, phases and counters are ignored
+            trace (bool): If True, every call of a phase is kept for the trace-event export
+        """
+        self.enabled: bool = enabled
+        self.trace: bool = trace
+        self.root: _PhaseNode = _PhaseNode("")
+        self.counters: Dict[str, int] = {}
+        self._stack: List[_PhaseNode] = [self.root]
+        self._events: List[Tuple[str, int, float, float]] = []
+        self._origin: float = time.perf_counter()
+
+    def phase(self, name: str):
+        """
+        Returns a context manager measuring a phase nested in the currently open phase.
+
+        Args:
+            name (str): Name of the phase (e.g. "assembly")
+        """
+        if not self.enabled:
+            return _NULL_PHASE
+        parent = self._stack[-1]
+        node = parent.children.get(name)
+        if node is None:
+            node = parent.children[name] = _PhaseNode(name)
+        return _Phase(self, node)
+
+    def count(self, name: str, value: int = 1) -> None:
+        """
+        Increases a counter (elements, integration_points, solver_iterations, bytes_written, ...).
+
+        Args:
+            name (str): Name of the counter
+            value (int): Increment
+        """
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + int(value)
+
+    def find(self, path: str) -> Optional[_PhaseNode]:
+        """Returns the statistics of a phase given by a "/"-separated path (e.g. "assemble/local_matrices")."""
+        node = self.root
+        for name in path.split("/"):
+            node = node.children.get(name)
+            if node is None:
+                return None
+        return node
+
+    def report(self) -> Dict:
+        """
+        Returns:
+            dict: Tree of the phases (totals, calls and latency percentiles) and the counters
+        """
+        return {"phases": {name: node.to_dict() for name, node in self.root.children.items()},
+                "counters": dict(self.counters)}
+
+    def to_json(self, path: str) -> None:
+        """Writes the report as JSON."""
+        with open(path, "w") as file:
+            json.dump(self.report(), file, indent=2)
+
+    def to_trace_events(self, path: str) -> None:
+        """
+        Writes the calls of the phases in the trace-event format (chrome://tracing, Perfetto).
+        Requires a profiler created with trace=True.
+        """
+        pid = os.getpid()
+        events = [{"name": name, "cat": "mes", "ph": "X", "pid": pid, "tid": 0,
+                   "ts": (start - self._origin) * 1e6, "dur": duration * 1e6, "args": {"depth": depth}}
+                  for name, depth, start, duration in self._events]
+        events.extend({"name": name, "ph": "C", "pid": pid, "tid": 0, "ts": 0, "args": {name: value}}
+                      for name, value in self.counters.items())
+        with open(path, "w") as file:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, file)
+
+    def format_report(self) -> str:
+        """
+        Returns:
+            str: Table of the phases (indented by nesting) followed by the counters
+        """
+        rows = []
+
+        def visit(node: _PhaseNode, depth: int) -> None:
+            for child in node.children.values():
+                stats = child.to_dict()
+                rows.append(["· " * depth + child.name, child.calls, f"{child.total:.6f}",
+                             *(f"{stats.get(f'p{percentile}_s', 0.0) * 1e3:.3f}" for percentile in PERCENTILES)])
+                visit(child, depth + 1)
+        visit(self.root, 0)
+
+        headers = ["Phase", "Calls", "Total [s]", *(f"p{percentile} [ms]" for percentile in PERCENTILES)]
+        table = tabulate(rows, headers=headers, tablefmt="grid")
+        counters = tabulate(sorted(self.counters.items()), headers=["Counter", "Value"], tablefmt="grid")
+        return table + "\n" + counters
+
+
+# Shared disabled profiler - the default of the instrumented classes
+DISABLED_PROFILER = Profiler(enabled=False)
@@ -0,0 +1,390 @@
+import numpy as np
+from typing import Callable, Iterator, List, Optional, Sequence, Tuple, Union
+from mes.classes.Global import Global
+from mes.classes.SiatkaBinarna import load_mesh
+from mes.classes.SiatkaTablicowa import ArrayMesh
+from mes.macierz.MacierzH import no_integration_nodes
+from mes.macierz.MacierzRzadka import MacierzRzadka
+from mes.macierz.PamiecElementow import ElementMatrixCache
+from mes.gauss.RejestrSolwerow import resolve_solver, solver_factory
+from mes.symulacja.KrokCzasowy import TimeStepper
+from mes.symulacja.KrokAdaptacyjny import AdaptiveTimeStepper
+from mes.symulacja.KrokJawny import ExplicitTimeStepper
+from mes.symulacja.Wyniki import ResultsSink
+from mes.symulacja.Pomiary import Profiler, DISABLED_PROFILER
+from mes.symulacja.Zakonczenie import TerminationMonitor
+from mes.symulacja.Montaz import AssemblyPool, local_matrices_range, use_workers
+
+# Elements whose local matrices are computed and added to the global matrices at once
+# (bounds the memory of the assembly of grids streamed from a binary file)
+ASSEMBLY_CHUNK_SIZE: int = 65536
+
+
+class Simulation:
+    """
+    Class implementing the whole transient heat transfer simulation for one grid:
+    assembly of the global [H], [C] and {P}, factorization of the system and time stepping.
+    All state is owned by the object, so many simulations can be created in one process.
+    """
+
+    def __init__(self, mesh: ArrayMesh, global_data: Global, no_int_nodes: int = no_integration_nodes,
+                 factorization: Union[str, Callable] = "auto", profiler: Profiler = DISABLED_PROFILER,
+                 workers: Optional[int] = 1, quadrature_tolerance: Optional[float] = None, min_int_nodes: int = 2,
+                 element_cache: Optional[ElementMatrixCache] = None, chunk_size: int = ASSEMBLY_CHUNK_SIZE):
+        """
+        Initialization of the simulation (nothing is computed until assemble is called).
+
+        Args:
+            mesh (ArrayMesh): Grid of the simulation
+            global_data (Global): Material, boundary condition and time parameters
+            no_int_nodes (int): Number of integration nodes in each direction
+            factorization (str | Callable): Name of a registered solver backend ("dense", "skyline", "ldl",
+                                            "pcg", "gauss"), "auto" - the direct backend chosen from the number
+                                            of nodes, the bandwidth and the number of steps - or a factory of the solver;
+                                            "ldl" keeps the factor in dictionaries and suits small meshes only
+                                            (about 15 times slower than "skyline" on a 10k-node grid)
+            profiler (Profiler): Collector of the phase timers and counters (disabled by default)
+            workers (int, optional): Processes computing the local matrices
+                                     (1 - serial, None - number of CPUs); the processes are started
+                                     by the first assemble and kept until close
+            quadrature_tolerance (float, optional): Allowed relative error of the local [H] - enables
+                                                    the choice of the quadrature order per element from its
+                                                    distortion (from min_int_nodes up to 5 nodes,
+                                                    no_int_nodes is then not used)
+            min_int_nodes (int): Lowest quadrature order of the per-element choice
+            element_cache (ElementMatrixCache, optional): Cache reusing the local matrices of elements
+                                                          with the same shape (may be shared by simulations)
+            chunk_size (int): Elements of one range of the serial assembly - the local matrices of one
+                              range at a time are kept in memory
+        """
+        self.mesh: ArrayMesh = mesh
+        self.global_data: Global = global_data
+        self.no_int_nodes: int = no_int_nodes
+        self.profiler: Profiler = profiler
+        self.workers: Optional[int] = workers
+        self.quadrature_tolerance: Optional[float] = quadrature_tolerance
+        self.min_int_nodes: int = min_int_nodes
+        self.element_cache: Optional[ElementMatrixCache] = element_cache
+        self.chunk_size: int = chunk_size
+        self.workers_used: int = use_workers(mesh.elements_number, workers)
+        self.assembly_pool: Optional[AssemblyPool] = None   # Worker processes (started by the first assemble)
+        if isinstance(factorization, str):
+            element_IDs = mesh.global_element_IDs
+            self.solver_name: str = resolve_solver(factorization, element_IDs, mesh.nodes_number, self.steps_number)
+            self.factorization: Callable = solver_factory(self.solver_name, element_IDs)
+        else:
+            self.solver_name = getattr(factorization, "__name__", type(factorization).__name__)
+            self.factorization = factorization
+
+        # Global matrices and vector (available after assemble)
+        self.h_matrix_global: Optional[MacierzRzadka] = None   # [H] + [HBC]
+        self.c_matrix_global: Optional[MacierzRzadka] = None   # [C] (not divided by dτ)
+        self.p_vector_global: Optional[np.ndarray] = None      # {P}
+        self.p_unit_vector: Optional[np.ndarray] = None        # {P} for Tot = 1 ({P} is linear in Tot)
+        self.stepper: Optional[TimeStepper] = None
+        self.adaptive_stepper: Optional[AdaptiveTimeStepper] = None   # Stepper of the last run_adaptive
+        self.explicit_stepper: Optional[ExplicitTimeStepper] = None   # Stepper of the last run_explicit
+
+        # State of the time loop
+        self.current_step: int = 0
+        self.temperatures: np.ndarray = np.full(mesh.nodes_number, float(global_data.initialTemp))
+
+    @classmethod
+    def from_file(cls, path: str, **kwargs) -> 'Simulation':
+        """
+        Creates the simulation from an input file (text or binary grid format).
+        The arrays of a binary grid stay memory mapped - the assembly reads them range by range.
+
+        Args:
+            path (str): Path to the input file
+            **kwargs: Further arguments of the constructor
+
+        Returns:
+            Simulation: Simulation of the grid with the parameters of the file
+        """
+        profiler = kwargs.get("profiler", DISABLED_PROFILER)
+        with profiler.phase("parse"):
+            mesh_data = load_mesh(path)
+            mesh = ArrayMesh.from_mesh_data(mesh_data)
+        return cls(mesh, Global.from_parameters(mesh_data.parameters), **kwargs)
+
+    @property
+    def current_time(self) -> float:
+        return self.current_step * self.global_data.simStepTime
+
+    def local_matrices(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Calculates the local matrices and vectors of all elements.
+
+        Returns:
+            tuple: H + HBC (E, 4, 4), C (E, 4, 4) and P (E, 4)
+        """
+        h_local, c_local, p_unit = self._element_matrices(0, self.mesh.elements_number)
+        return h_local, c_local, p_unit * self.global_data.tot
+
+    def _element_matrices(self, start: int, stop: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Local H + HBC, C and P for Tot = 1 of a range of elements (serial or in worker processes)."""
+        quadrature = {"quadrature_tolerance": self.quadrature_tolerance, "min_int_nodes": self.min_int_nodes,
+                      "cache": self.element_cache}
+        if self.workers_used == 1:
+            h_local, c_local, p_local, integration_points = local_matrices_range(
+                self.mesh, self.global_data, self.no_int_nodes, start, stop, profiler=self.profiler, **quadrature)
+        else:
+            with self.profiler.phase("parallel_elements"):
+                if self.assembly_pool is None:
+                    self.assembly_pool = AssemblyPool(self.mesh, self.global_data, self.no_int_nodes,
+                                                      self.workers_used, **quadrature)
+                h_local, c_local, p_local, integration_points = self.assembly_pool.local_matrices()
+
+        self.profiler.count("elements", stop - start)
+        self.profiler.count("integration_points", integration_points)
+        return h_local, c_local, p_local
+
+    def close(self) -> None:
+        """Stops the worker processes of the parallel assembly (the simulation can still be assembled again)."""
+        if self.assembly_pool is not None:
+            self.assembly_pool.close()
+            self.assembly_pool = None
+
+    def __enter__(self) -> 'Simulation':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def assemble(self, factor: bool = True) -> 'Simulation':
+        """
+        Assembles the global sparse matrices and vector and factors the system matrix.
+        The elements are processed in ranges of chunk_size: the local matrices of a range are
+        compressed to sparse matrices right away and the ranges are summed at the end.
+
+        Args:
+            factor (bool): If False, only the global matrices are assembled
+                           (the explicit scheme needs no factorization)
+
+        Returns:
+            Simulation: The same object (for chaining)
+        """
+        n = self.mesh.nodes_number
+        element_IDs = self.mesh.global_element_IDs
+        # The worker processes compute all elements at once
+        chunk_size = self.chunk_size if self.workers_used == 1 else max(self.mesh.elements_number, 1)
+        h_parts: List[MacierzRzadka] = []
+        c_parts: List[MacierzRzadka] = []
+        p_unit_vector = np.zeros(n)
+
+        with self.profiler.phase("assemble"):
+            for start, stop in self.mesh.iter_element_chunks(chunk_size):
+                with self.profiler.phase("local_matrices"):
+                    h_local, c_local, p_unit = self._element_matrices(start, stop)
+                with self.profiler.phase("global_assembly"):
+                    h_parts.append(MacierzRzadka.from_element_matrices(element_IDs[start:stop], h_local, n))
+                    c_parts.append(MacierzRzadka.from_element_matrices(element_IDs[start:stop], c_local, n))
+                    p_unit_vector += np.bincount(self.mesh.element_indices(start, stop).ravel(),
+                                                 weights=p_unit.ravel(), minlength=n)
+
+            with self.profiler.phase("global_assembly"):
+                self.h_matrix_global = MacierzRzadka.from_sum(h_parts)
+                self.c_matrix_global = MacierzRzadka.from_sum(c_parts)
+                self.p_unit_vector = p_unit_vector
+                self.p_vector_global = self.p_unit_vector * self.global_data.tot
+
+            if factor:
+                self._factor()
+        return self
+
+    def _factor(self) -> None:
+        """Builds the implicit stepper (factors [C]/dτ + [H]) from the assembled matrices."""
+        c_matrix_dtau = self.c_matrix_global.copy()
+        c_matrix_dtau.scale(1 / self.global_data.simStepTime)
+        self.stepper = TimeStepper(c_matrix_dtau, self.h_matrix_global, self.p_vector_global,
+                                   self.factorization, self.profiler)
+
+    def _prepare(self) -> None:
+        """Assembles and factors whatever is still missing before a run of the implicit scheme."""
+        if self.h_matrix_global is None:
+            self.assemble()
+        elif self.stepper is None:
+            with self.profiler.phase("assemble"):
+                self._factor()
+
+    def reset(self) -> None:
+        """Restores the initial temperature and time."""
+        self.current_step = 0
+        self.temperatures = np.full(self.mesh.nodes_number, float(self.global_data.initialTemp))
+
+    def step(self) -> np.ndarray:
+        """
+        Advances the simulation by one time step (assembling it first if needed).
+
+        Returns:
+            np.ndarray: Temperatures in nodes after the step
+        """
+        self._prepare()
+        with self.profiler.phase("step"):
+            self.temperatures = self.stepper.step(self.temperatures)
+        self.current_step += 1
+        return self.temperatures
+
+    @property
+    def steps_number(self) -> int:
+        """Number of time steps needed to reach the simulation time."""
+        return int(self.global_data.simTime / self.global_data.simStepTime + 1e-9)
+
+    def iterate(self) -> Iterator[Tuple[float, np.ndarray]]:
+        """
+        Advances the simulation step by step from the current state up to the simulation time.
+
+        Yields:
+            tuple[float, np.ndarray]: Current time and temperatures in nodes after each step
+        """
+        self._prepare()
+        while self.current_step < self.steps_number:
+            temperatures = self.step()
+            yield self.current_time, temperatures
+
+    def run(self, sink: Optional[ResultsSink] = None, keep_results: bool = True,
+            termination: Optional[TerminationMonitor] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Runs the time loop from the current state up to the simulation time.
+
+        Args:
+            sink (ResultsSink, optional): Writer receiving every step (opened and closed here)
+            keep_results (bool): If True, the temperatures of all steps are returned;
+                                 with False only the last step is returned (constant memory)
+            termination (TerminationMonitor, optional): Criteria stopping the loop early
+                                                        (steady state, threshold events)
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Times (steps,) and temperatures (steps, no_nodes)
+        """
+        if termination is not None and termination.start(self.current_time, self.temperatures):
+            return self._collect(iter(()), sink, keep_results, None)
+        return self._collect(self.iterate(), sink, keep_results, termination)
+
+    def _collect(self, states: Iterator[Tuple[float, np.ndarray]], sink: Optional[ResultsSink], keep_results: bool,
+                 termination: Optional[TerminationMonitor]) -> Tuple[np.ndarray, np.ndarray]:
+        """Writes the states of a time loop to the sink, keeps them and stops when the criteria are met."""
+        times: List[float] = []
+        results: List[np.ndarray] = []
+        if sink is not None:
+            sink.open(self.mesh.node_ids.tolist())
+        try:
+            for time, temperatures in states:
+                if sink is not None:
+                    with self.profiler.phase("output"):
+                        sink.write(time, temperatures)
+                if not keep_results:
+                    times.clear()
+                    results.clear()
+                times.append(time)
+                results.append(temperatures)
+                if termination is not None and termination.update(time, temperatures):
+                    break
+        finally:
+            if sink is not None:
+                sink.close()
+                self.profiler.count("bytes_written", sink.bytes_written)
+
+        return np.array(times, dtype=np.float64), np.array(results).reshape(len(results), self.mesh.nodes_number)
+
+    def run_adaptive(self, tolerance: float = 0.1, min_step: Optional[float] = None, max_step: Optional[float] = None,
+                     sample_times: Optional[Sequence[float]] = None, sink: Optional[ResultsSink] = None,
+                     termination: Optional[TerminationMonitor] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Runs the whole simulation from the initial temperature with an adaptive time step
+        (SimulationStepTime is the first step). The state of the fixed-step loop is not changed.
+
+        Args:
+            tolerance (float): Allowed local error of a step [°C]
+            min_step (float, optional): Smallest time step [s]
+            max_step (float, optional): Largest time step [s]
+            sample_times (list[float], optional): Times of the output (multiples of SimulationStepTime by default)
+            sink (ResultsSink, optional): Writer receiving every sample (opened and closed here)
+            termination (TerminationMonitor, optional): Criteria stopping the loop early (checked at the samples)
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Sample times (samples,) and temperatures (samples, no_nodes)
+        """
+        self._prepare()
+        g = self.global_data
+        self.adaptive_stepper = AdaptiveTimeStepper(self.c_matrix_global, self.h_matrix_global, self.p_vector_global,
+                                                    g.simStepTime, tolerance, min_step, max_step,
+                                                    self.factorization, profiler=self.profiler)
+        t0_vector = np.full(self.mesh.nodes_number, float(g.initialTemp))
+
+        if termination is not None and termination.start(0.0, t0_vector):
+            return self._collect(iter(()), sink, True, None)
+        return self._collect(self.adaptive_stepper.run(t0_vector, g.simTime, sample_times), sink, True, termination)
+
+    def run_explicit(self, safety: float = 0.9, sink: Optional[ResultsSink] = None, keep_results: bool = True,
+                     termination: Optional[TerminationMonitor] = None,
+                     max_substep: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Runs the whole simulation from the initial temperature with the explicit scheme
+        and the row-sum lumped [C]. Each SimulationStepTime is sub-cycled below the stable step
+        estimated from the largest eigenvalue of [C]⁻¹[H]; no system matrix is factored.
+        The state of the implicit time loop is not changed.
+
+        The sub-steps are chosen for stability, not accuracy: when SimulationStepTime is already below
+        the critical step it is taken in one sub-step, and the forward Euler error of such a long step
+        can be large (on Test1 the critical step is about 110 s, so a 50 s step is not divided).
+        Pass max_substep to bound the sub-step for accuracy as well.
+
+        Args:
+            safety (float): Fraction of the critical step used as the largest sub-step
+            sink (ResultsSink, optional): Writer receiving every step (opened and closed here)
+            keep_results (bool): If True, the temperatures of all steps are returned, otherwise only the last step
+            termination (TerminationMonitor, optional): Criteria stopping the loop early
+            max_substep (float, optional): Largest sub-step [s] allowed for accuracy (only stability by default)
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Times (steps,) and temperatures (steps, no_nodes)
+        """
+        if self.h_matrix_global is None:
+            self.assemble(factor=False)
+        g = self.global_data
+        self.explicit_stepper = ExplicitTimeStepper(self.c_matrix_global.row_sums(), self.h_matrix_global,
+                                                    self.p_vector_global, g.simStepTime, safety,
+                                                    max_substep=max_substep, profiler=self.profiler)
+        t0_vector = np.full(self.mesh.nodes_number, float(g.initialTemp))
+
+        if termination is not None and termination.start(0.0, t0_vector):
+            return self._collect(iter(()), sink, keep_results, None)
+        return self._collect(self.explicit_stepper.run(t0_vector, g.simTime), sink, keep_results, termination)
+
+    def run_scenarios(self, initial_temps: Sequence[float], ambient_temps: Sequence[float],
+                      keep_results: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Runs k scenarios differing in the initial and ambient temperature at once.
+        The system matrix is shared, so every step is one matrix-matrix product and one solve
+        with k right-hand sides: temperatures (n, k) and loads {P} * Tot_j (n, k).
+        The state of the single-scenario time loop is not changed.
+
+        Args:
+            initial_temps (list[float]): Initial temperature of each scenario
+            ambient_temps (list[float]): Ambient temperature Tot of each scenario
+                                         (either list may have length 1 - it is broadcast)
+            keep_results (bool): If True, the temperatures of all steps are returned,
+                                 otherwise only the last step
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Times (steps,) and temperatures (steps, no_nodes, k)
+        """
+        self._prepare()
+        initial, ambient = np.broadcast_arrays(np.asarray(initial_temps, dtype=np.float64).ravel(),
+                                               np.asarray(ambient_temps, dtype=np.float64).ravel())
+        loads = np.outer(self.p_unit_vector, ambient)
+        temperatures = np.tile(initial, (self.mesh.nodes_number, 1))
+
+        times: List[float] = []
+        results: List[np.ndarray] = []
+        for step in range(1, self.steps_number + 1):
+            with self.profiler.phase("scenario_step"):
+                temperatures = self.stepper.step(temperatures, loads)
+            if keep_results or step == self.steps_number:
+                times.append(step * self.global_data.simStepTime)
+                results.append(temperatures)
+
+        return (np.array(times, dtype=np.float64),
+                np.array(results).reshape(len(results), self.mesh.nodes_number, len(initial)))
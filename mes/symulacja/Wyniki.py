@@ -0,0 +1,261 @@
+import glob
+import struct
+from abc import ABC, abstractmethod
+import numpy as np
+from tabulate import tabulate
+from typing import List, Optional, Sequence, Tuple
+
+BINARY_MAGIC: bytes = b"MESRES01"
+# magic, dtype of the temperatures ("<f4" or "<f8"), number of nodes
+BINARY_HEADER = struct.Struct("<8s8sQ")
+
+
+class ResultsSink(ABC):
+    """
+    Base class of the results writers of the time loop.
+    Every step is written as soon as it is produced, so the memory used does not
+    depend on the number of steps. Subclasses implement _write and optionally _open and _close.
+    """
+
+    def __init__(self):
+        self.node_ids: List[int] = []
+        self.steps_written: int = 0
+        self.bytes_written: int = 0
+        self.is_open: bool = False
+
+    def open(self, node_ids: Sequence[int]) -> None:
+        """
+        Prepares the writer for a run.
+
+        Args:
+            node_ids (list[int]): Identifiers of the nodes (columns of the results)
+        """
+        self.node_ids = list(node_ids)
+        self._open()
+        self.is_open = True
+
+    def write(self, time: float, temperatures: Sequence[float]) -> None:
+        """
+        Writes the temperatures of one time step.
+
+        Args:
+            time (float): Time of the step [s]
+            temperatures (list[float]): Temperatures in nodes
+        """
+        self._write(time, np.asarray(temperatures, dtype=np.float64))
+        self.steps_written += 1
+
+    def close(self) -> None:
+        if self.is_open:
+            self._close()
+            self.is_open = False
+
+    def __enter__(self) -> 'ResultsSink':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _open(self) -> None:
+        pass
+
+    @abstractmethod
+    def _write(self, time: float, temperatures: np.ndarray) -> None:
+        pass
+
+    def _close(self) -> None:
+        pass
+
+
+class BinaryResultsSink(ResultsSink):
+    """
+    Appends raw binary records (time as float64, temperatures as float64 or float32)
+    after a short header. The file can be read back with read_binary_results as a memory map.
+    """
+
+    def __init__(self, path: str, dtype: type = np.float64):
+        """
+        Args:
+            path (str): Path of the output file
+            dtype (type): np.float64 or np.float32 - precision of the stored temperatures
+        """
+        super().__init__()
+        self.path: str = path
+        self.dtype: np.dtype = np.dtype(dtype).newbyteorder("<")
+        if self.dtype.kind != "f":
+            raise ValueError("Temperatures can be stored only as float32 or float64")
+        self.file = None
+
+    def _open(self) -> None:
+        self.file = open(self.path, "wb")
+        header = BINARY_HEADER.pack(BINARY_MAGIC, self.dtype.str.encode("ascii"), len(self.node_ids))
+        self.file.write(header)
+        self.file.write(np.asarray(self.node_ids, dtype="<i8").tobytes())
+        self.bytes_written += len(header) + 8 * len(self.node_ids)
+
+    def _write(self, time: float, temperatures: np.ndarray) -> None:
+        record = struct.pack("<d", time) + temperatures.astype(self.dtype).tobytes()
+        self.file.write(record)
+        self.bytes_written += len(record)
+
+    def _close(self) -> None:
+        self.file.close()
+
+
+class CsvResultsSink(ResultsSink):
+    """
+    Writes one CSV row per time step: time followed by the temperatures in nodes.
+    """
+
+    def __init__(self, path: str, float_format: str = "%.6f"):
+        """
+        Args:
+            path (str): Path of the output file
+            float_format (str): printf-style format of the temperatures
+        """
+        super().__init__()
+        self.path: str = path
+        self.float_format: str = float_format
+        self.file = None
+
+    def _open(self) -> None:
+        self.file = open(self.path, "w")
+        header = "Time," + ",".join(f"Node {node_id}" for node_id in self.node_ids) + "\n"
+        self.file.write(header)
+        self.bytes_written += len(header)
+
+    def _write(self, time: float, temperatures: np.ndarray) -> None:
+        line = f"{time}," + ",".join(self.float_format % value for value in temperatures.tolist()) + "\n"
+        self.file.write(line)
+        self.bytes_written += len(line)
+
+    def _close(self) -> None:
+        self.file.close()
+
+
+class NpyChunkedResultsSink(ResultsSink):
+    """
+    Collects the steps in a preallocated buffer and writes every chunk_steps steps
+    to a separate .npy file (prefix_00000.npy, prefix_00001.npy, ...).
+    Each file holds an array of shape (steps, 1 + no_nodes) - time in the first column.
+    """
+
+    def __init__(self, prefix: str, chunk_steps: int = 1000, dtype: type = np.float64):
+        """
+        Args:
+            prefix (str): Prefix of the output files
+            chunk_steps (int): Number of steps in one file
+            dtype (type): Precision of the stored values
+        """
+        super().__init__()
+        if chunk_steps < 1:
+            raise ValueError("Chunk must contain at least one step")
+        self.prefix: str = prefix
+        self.chunk_steps: int = chunk_steps
+        self.dtype: type = dtype
+        self.buffer: Optional[np.ndarray] = None
+        self.filled: int = 0
+        self.chunks_written: int = 0
+
+    def _open(self) -> None:
+        self.buffer = np.empty((self.chunk_steps, 1 + len(self.node_ids)), dtype=self.dtype)
+        self.filled = 0
+        self.chunks_written = 0
+
+    def _write(self, time: float, temperatures: np.ndarray) -> None:
+        self.buffer[self.filled, 0] = time
+        self.buffer[self.filled, 1:] = temperatures
+        self.filled += 1
+        if self.filled == self.chunk_steps:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self.filled:
+            chunk = self.buffer[:self.filled]
+            np.save(f"{self.prefix}_{self.chunks_written:05d}.npy", chunk)
+            self.bytes_written += chunk.nbytes
+            self.chunks_written += 1
+            self.filled = 0
+
+    def _close(self) -> None:
+        self._flush()
+        self.buffer = None
+
+
+def read_binary_results(path: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Opens a file written by BinaryResultsSink (memory mapped, no copy).
+
+    Args:
+        path (str): Path of the results file
+
+    Returns:
+        tuple: Node IDs (n,), times (steps,) and temperatures (steps, n)
+
+    Raises:
+        ValueError: When the file is not a results file
+    """
+    with open(path, "rb") as file:
+        magic, dtype, no_nodes = BINARY_HEADER.unpack(file.read(BINARY_HEADER.size))
+    if magic != BINARY_MAGIC:
+        raise ValueError(f"{path} is not a results file")
+
+    node_ids = np.fromfile(path, dtype="<i8", count=no_nodes, offset=BINARY_HEADER.size)
+    record = np.dtype([("time", "<f8"), ("temperatures", dtype.decode("ascii").strip("\x00"), (no_nodes,))])
+    offset = BINARY_HEADER.size + 8 * no_nodes
+    records = np.memmap(path, dtype=record, mode="r", offset=offset) if _file_size(path) > offset \
+        else np.zeros(0, dtype=record)
+    return node_ids, records["time"], records["temperatures"]
+
+
+def read_npy_chunks(prefix: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Reads all chunks written by NpyChunkedResultsSink.
+
+    Args:
+        prefix (str): Prefix of the chunk files
+
+    Returns:
+        tuple: Times (steps,) and temperatures (steps, n)
+    """
+    chunks = [np.load(path) for path in sorted(glob.glob(f"{glob.escape(prefix)}_[0-9][0-9][0-9][0-9][0-9].npy"))]
+    if not chunks:
+        return np.zeros(0), np.zeros((0, 0))
+    data = np.concatenate(chunks)
+    return data[:, 0], data[:, 1:]
+
+
+def format_report(times: Sequence[float], temperatures: np.ndarray, node_ids: Sequence[int]) -> str:
+    """
+    Formats the results as the human-readable tables printed by the program:
+    temperatures of all nodes and the minimum/maximum temperature in every step.
+
+    Args:
+        times (list[float]): Times of the steps
+        temperatures (np.ndarray): (steps, n) temperatures in nodes
+        node_ids (list[int]): Identifiers of the nodes
+
+    Returns:
+        str: Both tables in the "grid" format of tabulate
+    """
+    headers = ["Time"] + [f"Node {node_id}" for node_id in node_ids]
+    table_data = []
+    min_max_table_data = []
+    for time, row in zip(times, temperatures):
+        label = _time_label(time)
+        table_data.append([label] + [f"{value:.2f}" for value in row])
+        min_max_table_data.append([label, f"Min: {row.min():.9f}", f"Max: {row.max():.9f}"])
+
+    return (tabulate(table_data, headers=headers, tablefmt="grid") + "\n" +
+            tabulate(min_max_table_data, headers=["Time", "Min", "Max"], tablefmt="grid"))
+
+
+def _time_label(time: float) -> str:
+    """Whole-second times are printed as integers (as with the fixed step), fractional ones with two decimals."""
+    time = float(time)
+    return f"Time {int(time)}" if time.is_integer() else f"Time {time:.2f}"
+
+
+def _file_size(path: str) -> int:
+    with open(path, "rb") as file:
+        return file.seek(0, 2)
@@ -0,0 +1,179 @@
+import numpy as np
+from abc import ABC, abstractmethod
+from typing import Dict, Optional, Sequence
+
+
+class TerminationCriterion(ABC):
+    """
+    Base class of the conditions ending the time loop early.
+    The loop reports every new state with update; a criterion returns the time at which
+    it was satisfied (interpolated inside the step where it makes sense) or None.
+    start must be called with the initial state before the first update.
+    """
+
+    def __init__(self, name: str):
+        self.name: str = name
+
+    def start(self, time: float, temperatures: np.ndarray) -> Optional[float]:
+        """Receives the initial state; returns a time if the criterion already holds."""
+        return None
+
+    @abstractmethod
+    def update(self, time: float, temperatures: np.ndarray) -> Optional[float]:
+        """Receives the state after a step; returns the time at which the criterion was satisfied or None."""
+
+    def _require_started(self, started: bool) -> None:
+        if not started:
+            raise RuntimeError(f"Criterion {self.name} received a step before start was called")
+
+
+class SteadyState(TerminationCriterion):
+    """
+    Satisfied when the temperatures stop changing: the largest rate of change |ΔT|/Δτ
+    stayed below the tolerance for window consecutive steps.
+    """
+
+    def __init__(self, tolerance: float = 1e-3, window: int = 3, name: str = "steady_state"):
+        """
+        Args:
+            tolerance (float): Allowed largest rate of change of the temperature [°C/s]
+            window (int): Number of consecutive steps that must satisfy the tolerance
+            name (str): Name of the criterion in the results
+        """
+        super().__init__(name)
+        if window < 1:
+            raise ValueError("Window must contain at least one step")
+        self.tolerance: float = tolerance
+        self.window: int = window
+        self.quiet_steps: int = 0
+        self.last_time: float = 0.0
+        self.last_temperatures: Optional[np.ndarray] = None
+
+    def start(self, time: float, temperatures: np.ndarray) -> Optional[float]:
+        self.quiet_steps = 0
+        self.last_time = time
+        self.last_temperatures = np.array(temperatures, dtype=np.float64)
+        return None
+
+    def update(self, time: float, temperatures: np.ndarray) -> Optional[float]:
+        self._require_started(self.last_temperatures is not None)
+        rate = np.max(np.abs(temperatures - self.last_temperatures)) / (time - self.last_time)
+        self.quiet_steps = self.quiet_steps + 1 if rate < self.tolerance else 0
+        self.last_time = time
+        self.last_temperatures = np.array(temperatures, dtype=np.float64)
+        return time if self.quiet_steps >= self.window else None
+
+
+class ThresholdEvent(TerminationCriterion):
+    """
+    Satisfied when any (or all) of the selected nodes reach a temperature.
+    The crossing time of a node is interpolated linearly inside the step in which it crossed;
+    node_times holds the crossing time of every selected node (NaN - not crossed yet).
+    """
+
+    def __init__(self, threshold: float, mode: str = "any", rising: bool = True,
+                 nodes: Optional[Sequence[int]] = None, name: Optional[str] = None):
+        """
+        Args:
+            threshold (float): Temperature to reach [°C]
+            mode (str): "any" - first node reaching it, "all" - last of the selected nodes reaching it
+            rising (bool): True - reaching from below (heating), False - from above (cooling)
+            nodes (list[int], optional): Zero-based indices of the watched nodes (all by default)
+            name (str, optional): Name of the criterion in the results
+
+        Raises:
+            ValueError: When the mode is unknown
+        """
+        if mode not in ("any", "all"):
+            raise ValueError(f"Unknown mode of the threshold event: {mode}")
+        super().__init__(name or f"{mode}_{'above' if rising else 'below'}_{threshold:g}")
+        self.threshold: float = threshold
+        self.mode: str = mode
+        self.sign: float = 1.0 if rising else -1.0
+        self.nodes: Optional[np.ndarray] = None if nodes is None else np.asarray(nodes, dtype=np.int64)
+        self.node_times: Optional[np.ndarray] = None
+        self.last_time: float = 0.0
+        self.last_temperatures: Optional[np.ndarray] = None
+
+    def _watched(self, temperatures: np.ndarray) -> np.ndarray:
+        # Signed so that the event is always "reaching the threshold from below"
+        values = np.asarray(temperatures, dtype=np.float64)
+        return self.sign * (values if self.nodes is None else values[self.nodes])
+
+    def _result(self) -> Optional[float]:
+        crossed = ~np.isnan(self.node_times)
+        if self.mode == "any":
+            return float(np.nanmin(self.node_times)) if crossed.any() else None
+        return float(np.max(self.node_times)) if crossed.all() else None
+
+    def start(self, time: float, temperatures: np.ndarray) -> Optional[float]:
+        self.last_time = time
+        self.last_temperatures = self._watched(temperatures)
+        self.node_times = np.where(self.last_temperatures >= self.sign * self.threshold, time, np.nan)
+        return self._result()
+
+    def update(self, time: float, temperatures: np.ndarray) -> Optional[float]:
+        self._require_started(self.node_times is not None)
+        current = self._watched(temperatures)
+        level = self.sign * self.threshold
+        crossing = np.isnan(self.node_times) & (current >= level)
+        if crossing.any():
+            before = self.last_temperatures[crossing]
+            fraction = np.clip((level - before) / (current[crossing] - before), 0.0, 1.0)
+            self.node_times[crossing] = self.last_time + fraction * (time - self.last_time)
+        self.last_time = time
+        self.last_temperatures = current
+        return self._result()
+
+
+class TerminationMonitor:
+    """
+    Watches a set of criteria during the time loop and decides when the loop can stop:
+    as soon as any criterion is satisfied, or (require_all) when all of them are.
+    """
+
+    def __init__(self, criteria: Sequence[TerminationCriterion], require_all: bool = False):
+        """
+        Args:
+            criteria (list[TerminationCriterion]): Watched conditions (their names must differ)
+            require_all (bool): If True, the loop stops only when every criterion was satisfied
+        """
+        self.criteria: Sequence[TerminationCriterion] = criteria
+        self.require_all: bool = require_all
+        self.triggered: Dict[str, float] = {}   # Name of the criterion -> time at which it was satisfied
+        self.stopped_at: Optional[float] = None
+
+    def _record(self, criterion: TerminationCriterion, event_time: Optional[float]) -> None:
+        if event_time is not None and criterion.name not in self.triggered:
+            self.triggered[criterion.name] = event_time
+
+    def _should_stop(self, time: float) -> bool:
+        done = len(self.triggered) == len(self.criteria) if self.require_all else bool(self.triggered)
+        if done and self.criteria:
+            self.stopped_at = time
+        return done and bool(self.criteria)
+
+    def start(self, time: float, temperatures: np.ndarray) -> bool:
+        """
+        Receives the initial state.
+
+        Returns:
+            bool: True when the loop need not run at all
+        """
+        self.triggered = {}
+        self.stopped_at = None
+        for criterion in self.criteria:
+            self._record(criterion, criterion.start(time, temperatures))
+        return self._should_stop(time)
+
+    def update(self, time: float, temperatures: np.ndarray) -> bool:
+        """
+        Receives the state after a step.
+
+        Returns:
+            bool: True when the loop should stop
+        """
+        for criterion in self.criteria:
+            if criterion.name not in self.triggered:
+                self._record(criterion, criterion.update(time, temperatures))
+        return self._should_stop(time)
@@ -0,0 +1,92 @@
+import os
+import shutil
+import numpy as np
+import pytest
+import mes.classes.CzytnikSiatki as czytnik
+from mes.classes.CzytnikSiatki import CACHE_SUFFIX, read_mesh
+
+DATA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+
+
+@pytest.fixture
+def path(tmp_path) -> str:
+    target = tmp_path / "Test1_4_4.txt"
+    shutil.copyfile(os.path.join(DATA, "Test1_4_4.txt"), target)
+    return str(target)
+
+
+@pytest.fixture
+def hash_calls(monkeypatch):
+    calls = []
+    file_hash = czytnik._file_hash
+
+    def counting_hash(path):
+        calls.append(path)
+        return file_hash(path)
+    monkeypatch.setattr(czytnik, "_file_hash", counting_hash)
+    return calls
+
+
+def assert_same_mesh(first, second):
+    assert first.parameters == second.parameters
+    for field in ("node_ids", "coordinates", "element_ids", "connectivity", "bc_mask"):
+        np.testing.assert_array_equal(getattr(first, field), getattr(second, field))
+
+
+def test_sidecar_is_written_and_reused(path, hash_calls):
+    parsed = read_mesh(path)
+    assert os.path.exists(path + CACHE_SUFFIX)
+    assert not [name for name in os.listdir(os.path.dirname(path)) if name.endswith(".tmp")]
+
+    hash_calls.clear()
+    assert_same_mesh(read_mesh(path), parsed)
+    assert hash_calls == []
+
+
+def test_stale_mtime_with_same_content_refreshes_sidecar(path, hash_calls):
+    parsed = read_mesh(path)
+    os.utime(path, ns=(1, 123456789))
+
+    hash_calls.clear()
+    assert_same_mesh(read_mesh(path), parsed)
+    assert len(hash_calls) == 1
+    with np.load(path + CACHE_SUFFIX) as cache:
+        assert int(cache["source_mtime"]) == 123456789
+
+    hash_calls.clear()
+    read_mesh(path)
+    assert hash_calls == []
+
+
+def test_changed_content_invalidates_sidecar(path):
+    read_mesh(path)
+    with open(path) as file:
+        text = file.read()
+    with open(path, "w") as file:
+        file.write(text.replace("SimulationTime 500", "SimulationTime 100"))
+    os.utime(path, ns=(1, 1))
+
+    assert read_mesh(path).parameters["SimulationTime"] == "100"
+    with np.load(path + CACHE_SUFFIX) as cache:
+        assert int(cache["source_mtime"]) == 1
+
+
+@pytest.mark.parametrize("content", [b"PK\x03\x04garbage", b"", b"not a zip file"])
+def test_corrupt_sidecar_falls_back_to_parsing(path, content):
+    expected = read_mesh(path, use_cache=False)
+    with open(path + CACHE_SUFFIX, "wb") as file:
+        file.write(content)
+
+    assert_same_mesh(read_mesh(path), expected)
+    assert_same_mesh(read_mesh(path), expected)
+
+
+def test_truncated_sidecar_falls_back_to_parsing(path):
+    expected = read_mesh(path)
+    cache_path = path + CACHE_SUFFIX
+    with open(cache_path, "rb") as file:
+        content = file.read()
+    with open(cache_path, "wb") as file:
+        file.write(content[:len(content) // 2])
+
+    assert_same_mesh(read_mesh(path), expected)
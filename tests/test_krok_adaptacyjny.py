@@ -0,0 +1,65 @@
+import os
+import numpy as np
+import pytest
+from mes.symulacja.KrokAdaptacyjny import AdaptiveTimeStepper
+from mes.symulacja.Symulacja import Simulation
+
+DATA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+TEST1 = os.path.join(DATA, "Test1_4_4.txt")
+
+
+@pytest.fixture(scope="module")
+def exact():
+    """
+    Exact solution of [C] dT/dτ + [H] T = {P} on Test1 from the eigenvectors of L⁻¹[H]L⁻ᵀ,
+    where [C] = L Lᵀ - the reference every time stepping error is measured against.
+    """
+    simulation = Simulation.from_file(TEST1).assemble(factor=False)
+    c_matrix = np.array(simulation.c_matrix_global.to_dense())
+    h_matrix = np.array(simulation.h_matrix_global.to_dense())
+    factor = np.linalg.cholesky(c_matrix)
+    inverse = np.linalg.inv(factor)
+    eigenvalues, vectors = np.linalg.eigh(inverse @ h_matrix @ inverse.T)
+    steady = np.linalg.solve(h_matrix, simulation.p_vector_global)
+    modes = vectors.T @ (factor.T @ (float(simulation.global_data.initialTemp) - steady))
+
+    def solution(times):
+        return np.array([steady + np.linalg.solve(factor.T, vectors @ (np.exp(-eigenvalues * time) * modes))
+                         for time in times])
+    return solution
+
+
+@pytest.mark.parametrize("tolerance", [1.0, 0.1, 0.01])
+def test_adaptive_error_stays_below_tolerance(exact, tolerance):
+    simulation = Simulation.from_file(TEST1)
+    times, temperatures = simulation.run_adaptive(tolerance=tolerance)
+    np.testing.assert_allclose(times, 50.0 * np.arange(1, 11))
+    assert np.abs(temperatures - exact(times)).max() <= tolerance
+    assert simulation.adaptive_stepper.accepted_steps > 0
+
+
+def test_tighter_tolerance_is_more_accurate_than_fixed_steps(exact):
+    fixed_times, fixed = Simulation.from_file(TEST1).run()
+    fixed_error = np.abs(fixed - exact(fixed_times)).max()
+
+    errors = []
+    for tolerance in (1.0, 0.01):
+        times, temperatures = Simulation.from_file(TEST1).run_adaptive(tolerance=tolerance)
+        errors.append(np.abs(temperatures - exact(times)).max())
+    assert errors[1] < errors[0] < fixed_error / 100
+
+
+def test_samples_between_steps_are_interpolated(exact):
+    sample_times = [12.5, 100.0, 333.0, 500.0]
+    times, temperatures = Simulation.from_file(TEST1).run_adaptive(tolerance=0.1, sample_times=sample_times)
+    np.testing.assert_array_equal(times, sample_times)
+    assert np.abs(temperatures - exact(times)).max() <= 0.5
+
+
+def test_step_bounds_are_validated():
+    simulation = Simulation.from_file(TEST1).assemble(factor=False)
+    matrices = (simulation.c_matrix_global, simulation.h_matrix_global, simulation.p_vector_global)
+    with pytest.raises(ValueError, match="min_step <= initial_step <= max_step"):
+        AdaptiveTimeStepper(*matrices, initial_step=50.0, max_step=25.0)
+    with pytest.raises(ValueError, match="must be positive"):
+        AdaptiveTimeStepper(*matrices, initial_step=50.0, tolerance=0.0)
@@ -0,0 +1,53 @@
+import os
+import numpy as np
+import pytest
+from mes.symulacja.KrokJawny import ExplicitTimeStepper, eigenvalue_upper_bound, gershgorin_bound
+from mes.symulacja.Symulacja import Simulation
+
+DATA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+TEST1 = os.path.join(DATA, "Test1_4_4.txt")
+
+
+@pytest.fixture(scope="module")
+def system():
+    """Row-sum lumped [C], [H] and the exact largest eigenvalue of [C]⁻¹[H] on Test1."""
+    simulation = Simulation.from_file(TEST1).assemble(factor=False)
+    c_lumped = simulation.c_matrix_global.row_sums()
+    h_matrix = simulation.h_matrix_global
+    eigenvalues = np.linalg.eigvals(np.array(h_matrix.to_dense()) / c_lumped[:, None])
+    return simulation, c_lumped, h_matrix, float(eigenvalues.real.max())
+
+
+def test_eigenvalue_bound_is_tight_from_above(system):
+    _, c_lumped, h_matrix, eigenvalue = system
+    bound = eigenvalue_upper_bound(c_lumped, h_matrix)
+    assert eigenvalue <= bound <= gershgorin_bound(c_lumped, h_matrix)
+    assert bound <= eigenvalue * (1 + 1e-2)
+
+
+def test_step_at_the_critical_limit_is_stable(system):
+    simulation, c_lumped, h_matrix, _ = system
+    stepper = ExplicitTimeStepper(c_lumped, h_matrix, simulation.p_vector_global, 1000.0, safety=1.0)
+    assert stepper.substep_time <= stepper.critical_step
+    temperatures = np.full(len(c_lumped), 100.0)
+    for _ in range(50):
+        temperatures = stepper.step(temperatures)
+    ambient = simulation.global_data.tot
+    assert np.all((temperatures >= 100.0 - 1e-9) & (temperatures <= ambient + 1e-9))
+
+
+def test_substeps_follow_stability_unless_capped(system):
+    simulation, c_lumped, h_matrix, _ = system
+    stable = ExplicitTimeStepper(c_lumped, h_matrix, simulation.p_vector_global, 50.0)
+    capped = ExplicitTimeStepper(c_lumped, h_matrix, simulation.p_vector_global, 50.0, max_substep=5.0)
+    assert stable.critical_step > 50.0 and stable.substeps == 1
+    assert capped.substeps == 10
+    with pytest.raises(ValueError):
+        ExplicitTimeStepper(c_lumped, h_matrix, simulation.p_vector_global, 50.0, max_substep=0.0)
+
+
+def test_max_substep_improves_accuracy():
+    _, reference = Simulation.from_file(TEST1).run_explicit(max_substep=0.5)
+    _, stable = Simulation.from_file(TEST1).run_explicit()
+    _, capped = Simulation.from_file(TEST1).run_explicit(max_substep=5.0)
+    assert np.abs(capped - reference).max() < 0.1 * np.abs(stable - reference).max()
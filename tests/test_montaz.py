@@ -0,0 +1,83 @@
+import os
+import numpy as np
+import pytest
+from mes.macierz.ElementyWsadowe import affine_elements, batch_affine, batch_matrix_c, batch_matrix_h
+from mes.macierz.MacierzeLokalne import element_local_matrices
+from mes.macierz.PamiecElementow import ElementMatrixCache
+from mes.symulacja.Montaz import AssemblyPool, local_matrices_range
+from mes.symulacja.Symulacja import Simulation
+
+DATA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+TEST_FILES = ["Test1_4_4.txt", "Test2_4_4_MixGrid.txt", "Test3_31_31_kwadrat.txt"]
+
+
+def assembled(path: str, **kwargs) -> Simulation:
+    return Simulation.from_file(path, **kwargs).assemble(factor=False)
+
+
+def assert_same_system(first: Simulation, second: Simulation, rtol: float) -> None:
+    for matrix in ("h_matrix_global", "c_matrix_global"):
+        a, b = np.array(getattr(first, matrix).to_dense()), np.array(getattr(second, matrix).to_dense())
+        np.testing.assert_allclose(a, b, rtol=0, atol=rtol * np.abs(b).max())
+    np.testing.assert_allclose(first.p_vector_global, second.p_vector_global,
+                               rtol=0, atol=rtol * np.abs(second.p_vector_global).max())
+
+
+@pytest.fixture(params=TEST_FILES)
+def path(request) -> str:
+    return os.path.join(DATA, request.param)
+
+
+def test_cache_matches_direct_computation(path):
+    cache = ElementMatrixCache()
+    assert_same_system(assembled(path, element_cache=cache), assembled(path), rtol=1e-6)
+    assert cache.computed_elements <= cache.elements
+
+
+def test_affine_closed_form_matches_quadrature(path):
+    simulation = Simulation.from_file(path)
+    g = simulation.global_data
+    coords = simulation.mesh.element_coordinates()
+    coords = coords[affine_elements(coords)]
+    if not len(coords):
+        pytest.skip("No affine elements")
+
+    h_affine, c_affine = batch_affine(coords, g.conductivity, g.specificHeat, g.density)
+    h_quadrature = batch_matrix_h(coords, g.conductivity, 2)
+    c_quadrature = batch_matrix_c(coords, g.specificHeat, g.density, 2)
+    np.testing.assert_allclose(h_affine, h_quadrature, rtol=0, atol=1e-12 * np.abs(h_quadrature).max())
+    np.testing.assert_allclose(c_affine, c_quadrature, rtol=0, atol=1e-12 * np.abs(c_quadrature).max())
+
+
+@pytest.mark.filterwarnings("ignore:.*exceed the quadrature tolerance")
+def test_per_element_order_matches_fixed_order(path):
+    assert_same_system(assembled(path, quadrature_tolerance=1e-8), assembled(path, no_int_nodes=4), rtol=1e-5)
+
+
+def test_parallel_matches_serial(path):
+    simulation = Simulation.from_file(path)
+    serial = local_matrices_range(simulation.mesh, simulation.global_data, simulation.no_int_nodes)
+    with AssemblyPool(simulation.mesh, simulation.global_data, simulation.no_int_nodes, workers=2) as pool:
+        parallel = pool.local_matrices(chunk_size=4)
+    # The chunks are batched differently, so the results agree up to rounding only
+    for expected, actual in zip(serial[:3], parallel[:3]):
+        np.testing.assert_allclose(actual, expected, rtol=0, atol=1e-12 * np.abs(expected).max())
+    assert parallel[3] == serial[3]
+
+
+def test_per_element_builders_match_batched_path(path):
+    simulation = Simulation.from_file(path, no_int_nodes=4)
+    g = simulation.global_data
+    h_local, c_local, p_unit, _ = local_matrices_range(simulation.mesh, g, 4)
+    for index in range(0, simulation.mesh.elements_number, 7):
+        h, c, p = element_local_matrices(simulation.mesh.element(index), 4, g)
+        np.testing.assert_allclose(h, h_local[index], rtol=0, atol=1e-10 * np.abs(h_local[index]).max())
+        np.testing.assert_allclose(c, c_local[index], rtol=0, atol=1e-10 * np.abs(c_local[index]).max())
+        np.testing.assert_allclose(p, p_unit[index] * g.tot, rtol=0, atol=1e-10 * max(np.abs(p).max(), 1))
+
+
+def test_cache_rejects_degenerate_elements():
+    coords = np.zeros((2, 4, 2))
+    coords[1] = [[0, 0], [1, 0], [1, 1], [0, 1]]
+    with pytest.raises(ValueError, match="degenerate"):
+        ElementMatrixCache().shape_keys(coords, np.zeros((2, 4)))
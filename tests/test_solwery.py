@@ -0,0 +1,69 @@
+import os
+import numpy as np
+import pytest
+from mes.gauss.GradientySprzezone import PCGSolver
+from mes.gauss.RejestrSolwerow import SOLVERS
+from mes.symulacja.Symulacja import Simulation
+
+DATA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+
+
+@pytest.fixture(scope="module")
+def system():
+    """Matrix [C]/dτ + [H] and the free term of the first step of Test3."""
+    simulation = Simulation.from_file(os.path.join(DATA, "Test3_31_31_kwadrat.txt")).assemble(factor=False)
+    g = simulation.global_data
+    matrix = simulation.c_matrix_global.copy()
+    matrix.scale(1 / g.simStepTime)
+    matrix = matrix.add(simulation.h_matrix_global)
+    t0 = np.full(matrix.no_rows, float(g.initialTemp))
+    vector = simulation.c_matrix_global.multiply_by_vector(t0) / g.simStepTime + simulation.p_vector_global
+    return matrix, vector, np.linalg.solve(np.array(matrix.to_dense()), vector)
+
+
+@pytest.mark.parametrize("name", ["dense", "skyline", "ldl", "pcg"])
+def test_backend_matches_dense_solution(system, name):
+    matrix, vector, expected = system
+    np.testing.assert_allclose(SOLVERS[name](matrix).solve(vector), expected, rtol=1e-8)
+
+
+@pytest.mark.parametrize("preconditioner", [None, "jacobi", "ssor", "ic"])
+def test_pcg_reaches_tolerance(system, preconditioner):
+    matrix, vector, expected = system
+    solver = PCGSolver(matrix, preconditioner, tolerance=1e-12)
+    np.testing.assert_allclose(solver.solve(vector), expected, rtol=1e-9)
+    assert solver.converged and solver.residual_norm <= 1e-12
+
+
+def test_ssor_needs_fewer_iterations_than_jacobi(system):
+    matrix, vector, _ = system
+    iterations = {}
+    for preconditioner in ("jacobi", "ssor"):
+        solver = PCGSolver(matrix, preconditioner, tolerance=1e-10)
+        solver.solve(vector)
+        iterations[preconditioner] = solver.iterations
+    assert iterations["ssor"] < iterations["jacobi"]
+
+
+def test_warm_start_reuses_previous_solution(system):
+    matrix, vector, _ = system
+    solver = PCGSolver(matrix, "jacobi")
+    solver.solve(vector)
+    cold = solver.iterations
+    solver.solve(vector * (1 + 1e-6))
+    assert solver.iterations < cold
+
+    cold_solver = PCGSolver(matrix, "jacobi", warm_start=False)
+    cold_solver.solve(vector)
+    cold_solver.solve(vector * (1 + 1e-6))
+    assert cold_solver.iterations == cold
+
+
+def test_pcg_reports_missing_convergence(system):
+    matrix, vector, _ = system
+    with pytest.raises(RuntimeError, match="after 3 iterations"):
+        PCGSolver(matrix, "jacobi", max_iterations=3).solve(vector)
+    with pytest.warns(RuntimeWarning, match="did not converge"):
+        solver = PCGSolver(matrix, "jacobi", max_iterations=3, raise_on_failure=False)
+        solver.solve(vector)
+    assert not solver.converged and solver.iterations == 3
@@ -0,0 +1,73 @@
+import os
+import numpy as np
+import pytest
+from mes.symulacja.Symulacja import Simulation
+from mes.symulacja.Wyniki import (BinaryResultsSink, CsvResultsSink, NpyChunkedResultsSink, format_report,
+                                  read_binary_results, read_npy_chunks)
+
+DATA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+
+
+@pytest.fixture(scope="module")
+def results():
+    """Node IDs, times and temperatures of Test1 kept in memory."""
+    simulation = Simulation.from_file(os.path.join(DATA, "Test1_4_4.txt"))
+    times, temperatures = simulation.run()
+    return simulation.mesh.node_ids, times, temperatures
+
+
+def run_into(sink):
+    simulation = Simulation.from_file(os.path.join(DATA, "Test1_4_4.txt"))
+    return simulation.run(sink=sink, keep_results=False)
+
+
+@pytest.mark.parametrize("dtype, rtol", [(np.float64, 0), (np.float32, 1e-6)])
+def test_binary_sink_round_trip(tmp_path, results, dtype, rtol):
+    node_ids, times, temperatures = results
+    path = str(tmp_path / "results.bin")
+    sink = BinaryResultsSink(path, dtype)
+    run_into(sink)
+
+    read_ids, read_times, read_temperatures = read_binary_results(path)
+    np.testing.assert_array_equal(read_ids, node_ids)
+    np.testing.assert_array_equal(read_times, times)
+    np.testing.assert_allclose(read_temperatures, temperatures, rtol=rtol)
+    assert read_temperatures.dtype == dtype
+    assert sink.steps_written == len(times) and sink.bytes_written == os.path.getsize(path)
+
+
+def test_binary_reader_rejects_other_files(tmp_path):
+    path = tmp_path / "other.bin"
+    path.write_bytes(b"\x00" * 64)
+    with pytest.raises(ValueError, match="not a results file"):
+        read_binary_results(str(path))
+
+
+def test_csv_sink_writes_one_row_per_step(tmp_path, results):
+    node_ids, times, temperatures = results
+    path = str(tmp_path / "results.csv")
+    run_into(CsvResultsSink(path))
+
+    with open(path) as file:
+        assert file.readline().strip() == "Time," + ",".join(f"Node {node_id}" for node_id in node_ids)
+    data = np.loadtxt(path, delimiter=",", skiprows=1)
+    np.testing.assert_array_equal(data[:, 0], times)
+    np.testing.assert_allclose(data[:, 1:], temperatures, rtol=0, atol=5e-7)
+
+
+def test_npy_sink_splits_chunks(tmp_path, results):
+    _, times, temperatures = results
+    prefix = str(tmp_path / "results")
+    sink = NpyChunkedResultsSink(prefix, chunk_steps=3)
+    run_into(sink)
+
+    assert sink.chunks_written == -(-len(times) // 3)
+    read_times, read_temperatures = read_npy_chunks(prefix)
+    np.testing.assert_array_equal(read_times, times)
+    np.testing.assert_array_equal(read_temperatures, temperatures)
+
+
+def test_report_prints_whole_seconds_without_decimals():
+    report = format_report([50.0, 500, 12.5], np.ones((3, 2)), [1, 2])
+    assert "Time 50 " in report and "Time 500 " in report and "Time 12.50 " in report
+    assert "Time 50.00" not in report
@@ -0,0 +1,84 @@
+import os
+import numpy as np
+import pytest
+from mes.symulacja.Symulacja import Simulation
+from mes.symulacja.Zakonczenie import SteadyState, TerminationMonitor, ThresholdEvent
+
+DATA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+TEST1 = os.path.join(DATA, "Test1_4_4.txt")
+
+
+@pytest.fixture(scope="module")
+def reference():
+    """Times and temperatures of the full Test1 run (initial 100 °C, Tot 1200 °C, 10 steps of 50 s)."""
+    return Simulation.from_file(TEST1).run()
+
+
+def crossing_time(times, values, level):
+    """Step index of the first crossing and the linearly interpolated crossing time."""
+    index = int(np.argmax(values >= level))
+    before_time, before = (times[index - 1], values[index - 1]) if index else (0.0, 100.0)
+    return index, before_time + (level - before) / (values[index] - before) * (times[index] - before_time)
+
+
+@pytest.mark.parametrize("level", [500.0, 600.0])
+def test_any_node_threshold_stops_at_the_crossing_step(reference, level):
+    times, temperatures = reference
+    index, expected = crossing_time(times, temperatures.max(axis=1), level)
+
+    monitor = TerminationMonitor([ThresholdEvent(level)])
+    stopped_times, stopped = Simulation.from_file(TEST1).run(termination=monitor)
+    assert len(stopped_times) == index + 1 and stopped_times[-1] == times[index]
+    np.testing.assert_array_equal(stopped, temperatures[:index + 1])
+    assert monitor.triggered[f"any_above_{level:g}"] == pytest.approx(expected)
+    assert monitor.stopped_at == times[index]
+
+
+def test_all_nodes_threshold_waits_for_the_slowest_node(reference):
+    times, temperatures = reference
+    index, expected = crossing_time(times, temperatures.min(axis=1), 500.0)
+
+    event = ThresholdEvent(500.0, mode="all")
+    stopped_times, _ = Simulation.from_file(TEST1).run(termination=TerminationMonitor([event]))
+    assert stopped_times[-1] == times[index]
+    assert np.nanmax(event.node_times) == pytest.approx(expected)
+    assert not np.isnan(event.node_times).any()
+
+
+def test_threshold_reached_at_start_skips_the_loop():
+    monitor = TerminationMonitor([ThresholdEvent(50.0)])
+    times, temperatures = Simulation.from_file(TEST1).run(termination=monitor)
+    assert len(times) == 0 and temperatures.shape == (0, 16)
+    assert monitor.triggered == {"any_above_50": 0.0}
+
+
+def test_falling_threshold_on_selected_nodes():
+    event = ThresholdEvent(10.0, rising=False, nodes=[1])
+    assert event.start(0.0, np.array([50.0, 20.0])) is None
+    assert event.update(1.0, np.array([0.0, 15.0])) is None
+    assert event.update(2.0, np.array([0.0, 5.0])) == pytest.approx(1.5)
+
+
+def test_steady_state_needs_a_full_window():
+    criterion = SteadyState(tolerance=0.1, window=2)
+    criterion.start(0.0, np.array([0.0]))
+    assert criterion.update(1.0, np.array([1.0])) is None
+    assert criterion.update(2.0, np.array([1.05])) is None
+    assert criterion.update(3.0, np.array([1.5])) is None
+    assert criterion.update(4.0, np.array([1.55])) is None
+    assert criterion.update(5.0, np.array([1.6])) == 5.0
+
+
+def test_monitor_with_require_all_waits_for_every_criterion(reference):
+    times, temperatures = reference
+    early, late = ThresholdEvent(400.0), ThresholdEvent(600.0)
+    monitor = TerminationMonitor([early, late], require_all=True)
+    stopped_times, _ = Simulation.from_file(TEST1).run(termination=monitor)
+    assert set(monitor.triggered) == {early.name, late.name}
+    assert stopped_times[-1] == times[crossing_time(times, temperatures.max(axis=1), 600.0)[0]]
+
+
+@pytest.mark.parametrize("criterion", [SteadyState(), ThresholdEvent(300.0)])
+def test_update_before_start_is_rejected(criterion):
+    with pytest.raises(RuntimeError, match="before start was called"):
+        criterion.update(1.0, np.zeros(4))